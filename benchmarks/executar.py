@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+#
+# benchmarks/executar.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Mede o desempenho da emissão dos extratos de venda (normal e resumido) e de
+cancelamento, para documentos sintéticos de tamanhos variados (veja
+:mod:`benchmarks.gerador`). Execute a partir do diretório raiz do projeto:
+
+.. sourcecode:: shell
+
+    $ python -m benchmarks.executar --itens 1,10,100,1000 --salvar base.json
+    $ python -m benchmarks.executar --itens 1,10,100,1000 --comparar base.json
+
+Para cada cenário são medidos:
+
+* ``parse_s``: tempo para interpretar o XML e extrair o modelo do CF-e;
+* ``render_s``: tempo de renderização do extrato em um programa de impressão
+  serializado (veja :meth:`satextrato.programa.Programa.serializar`), após a
+  primeira renderização (com os *caches* já aquecidos);
+* ``render_frio_s``: tempo da primeira renderização do extrato;
+* ``imprimir_s``: tempo de uma impressão completa em um dispositivo simulado,
+  incluindo as pausas que a PyESCPOS faz após enviar códigos de barras e
+  QRCodes, aguardando a resposta da impressora;
+* ``bytes`` e ``escritas``: quantidade de bytes e de escritas no dispositivo;
+* ``memoria_pico``: pico de memória alocada durante a interpretação e a
+  renderização, em bytes (requer Python 3).
+
+Os tempos de interpretação e de renderização são o menor valor entre as
+repetições, medidos com o coletor de lixo desativado. A impressão completa é
+medida uma única vez, pois é dominada pelas pausas. Ao comparar com uma linha
+de base, o programa termina com código de saída ``1`` se houver regressões.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import gc
+import io
+import json
+import platform
+import sys
+
+from collections import OrderedDict
+from collections import namedtuple
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import parser
+from satextrato.cancelamento import ExtratoCFeCancelamento
+from satextrato.venda import ExtratoCFeVenda
+
+from . import gerador
+
+
+FORMATO = 2
+"""Versão do formato do arquivo da linha de base."""
+
+VENDA = 'venda'
+VENDA_RESUMIDO = 'venda-resumido'
+CANCELAMENTO = 'cancelamento'
+
+TIPOS = (VENDA, VENDA_RESUMIDO, CANCELAMENTO)
+
+METRICAS_TEMPO = ('parse_s', 'render_s', 'render_frio_s', 'imprimir_s')
+METRICAS_EXATAS = ('bytes', 'escritas')
+
+
+Cenario = namedtuple('Cenario', [
+        'nome',  # str
+        'tipo',  # str, um de TIPOS
+        'itens',  # int
+        'venda',  # bytes
+        'cancelamento',  # bytes ou None
+    ])
+
+
+class _Dispositivo(object):
+    # conta as escritas, sem um dispositivo real do outro lado
+
+    def __init__(self):
+        self.escritas = 0
+        self.bytes = 0
+
+    def write(self, data):
+        self.escritas += 1
+        self.bytes += len(data)
+
+    def read(self):
+        return None
+
+    def catch(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def cenarios(
+        itens=(1, 10, 100, 1000),
+        tipos=TIPOS,
+        tamanho_texto=40,
+        meios_pagamento=3,
+        proporcao_issqn=0.1,
+        entrega=True,
+        observacoes_fisco=2):
+    """Gera os cenários medidos, um para cada combinação de número de itens
+    e tipo de extrato. Os demais argumentos são repassados a
+    :func:`benchmarks.gerador.venda`.
+    """
+    resultado = []
+    for indice, quantidade in enumerate(itens):
+        venda = gerador.venda(
+                itens=quantidade,
+                tamanho_texto=tamanho_texto,
+                meios_pagamento=meios_pagamento,
+                itens_issqn=int(quantidade * proporcao_issqn),
+                entrega=entrega,
+                observacoes_fisco=observacoes_fisco,
+                numero=(indice + 1) * 10
+            )
+        cancelamento = gerador.cancelamento(venda)
+        for tipo in tipos:
+            resultado.append(Cenario(
+                    nome='{}/{}'.format(tipo, quantidade),
+                    tipo=tipo,
+                    itens=quantidade,
+                    venda=venda,
+                    cancelamento=cancelamento if tipo == CANCELAMENTO else None
+                ))
+    return resultado
+
+
+def medir(cenario, repeticoes=5):
+    """Mede um cenário.
+
+    :returns: Um dicionário com as métricas do cenário.
+    """
+    def carregar(impressora):
+        if cenario.tipo == CANCELAMENTO:
+            return ExtratoCFeCancelamento(
+                    io.BytesIO(cenario.venda),
+                    io.BytesIO(cenario.cancelamento),
+                    impressora
+                )
+        return ExtratoCFeVenda(
+                io.BytesIO(cenario.venda),
+                impressora,
+                resumido=(cenario.tipo == VENDA_RESUMIDO)
+            )
+
+    def renderizar(extrato):
+        return extrato.renderizar().serializar(extrato.impressora)
+
+    parse = []
+    render = []
+    for _ in range(repeticoes + 1):
+        impressora = GenericESCPOS(_Dispositivo())
+        parse.append(_cronometrar(carregar, impressora)[0])
+        render.append(_cronometrar(renderizar, carregar(impressora))[0])
+    memoria = _memoria_pico(
+            lambda: renderizar(carregar(GenericESCPOS(_Dispositivo())))
+        )
+
+    dispositivo = _Dispositivo()
+    extrato = carregar(GenericESCPOS(dispositivo))
+    imprimir = _cronometrar(extrato.imprimir)[0]
+
+    return OrderedDict([
+            ('itens', cenario.itens),
+            ('parse_s', min(parse)),
+            ('render_s', min(render[1:])),
+            ('render_frio_s', render[0]),
+            ('imprimir_s', imprimir),
+            ('bytes', dispositivo.bytes),
+            ('escritas', dispositivo.escritas),
+            ('memoria_pico', memoria),
+        ])
+
+
+def executar(cenarios, repeticoes=5, saida=sys.stdout):
+    """Mede os cenários, apresentando os resultados à medida que são obtidos.
+
+    :returns: Os resultados, no formato da linha de base.
+    :rtype: dict
+    """
+    resultados = OrderedDict()
+    print(_CABECALHO, file=saida)
+    for cenario in cenarios:
+        metricas = medir(cenario, repeticoes=repeticoes)
+        resultados[cenario.nome] = metricas
+        print(_linha(cenario.nome, metricas), file=saida)
+    return OrderedDict([
+            ('formato', FORMATO),
+            ('ambiente', _ambiente()),
+            ('resultados', resultados),
+        ])
+
+
+def comparar(base, atual, tolerancia=0.2):
+    """Compara os resultados com a linha de base. Tempos e memória são
+    considerados uma regressão quando excederem a linha de base na proporção
+    da tolerância informada; bytes e escritas, em qualquer aumento.
+
+    :returns: Lista de tuplas ``(cenario, metrica, base, atual)`` com as
+        regressões encontradas.
+    """
+    if base.get('formato') != FORMATO:
+        raise ValueError(
+                'Formato da linha de base nao suportado: {!r}'.format(
+                    base.get('formato'))
+            )
+    regressoes = []
+    for nome, metricas in atual['resultados'].items():
+        referencia = base['resultados'].get(nome)
+        if referencia is None:
+            continue
+        for metrica, valor in metricas.items():
+            anterior = referencia.get(metrica)
+            if valor is None or anterior is None or metrica == 'itens':
+                continue
+            limite = anterior if metrica in METRICAS_EXATAS else (
+                    anterior * (1 + tolerancia)
+                )
+            if valor > limite:
+                regressoes.append((nome, metrica, anterior, valor))
+    return regressoes
+
+
+def main(argv=None):
+    argumentos = _argumentos().parse_args(argv)
+
+    selecionados = cenarios(
+            itens=argumentos.itens,
+            tipos=argumentos.tipos,
+            tamanho_texto=argumentos.tamanho_texto,
+            meios_pagamento=argumentos.meios_pagamento,
+            proporcao_issqn=argumentos.proporcao_issqn,
+            entrega=not argumentos.sem_entrega,
+            observacoes_fisco=argumentos.observacoes_fisco
+        )
+    resultados = executar(selecionados, repeticoes=argumentos.repeticoes)
+
+    if argumentos.salvar:
+        with io.open(argumentos.salvar, 'w', encoding='utf-8') as fp:
+            fp.write(json.dumps(resultados, indent=2, ensure_ascii=False))
+            fp.write('\n')
+
+    if argumentos.comparar:
+        with io.open(argumentos.comparar, 'r', encoding='utf-8') as fp:
+            base = json.load(fp)
+        regressoes = comparar(
+                base,
+                resultados,
+                tolerancia=argumentos.tolerancia
+            )
+        if base.get('ambiente') != resultados['ambiente']:
+            print('\nAtencao: linha de base obtida em outro ambiente.')
+        if regressoes:
+            print('\nRegressoes:')
+            for nome, metrica, anterior, valor in regressoes:
+                print('  {:<24} {:<14} {:>14} -> {:<14} ({:+.1%})'.format(
+                        nome,
+                        metrica,
+                        _formatar(anterior),
+                        _formatar(valor),
+                        (valor - anterior) / anterior if anterior else 0
+                    ))
+            return 1
+        print('\nNenhuma regressao em relacao a linha de base.')
+
+    return 0
+
+
+_CABECALHO = '{:<24} {:>10} {:>10} {:>10} {:>12} {:>9} {:>8} {:>10}'.format(
+        'cenario',
+        'parse ms',
+        'render ms',
+        'frio ms',
+        'imprimir ms',
+        'bytes',
+        'escritas',
+        'mem KiB'
+    )
+
+
+def _linha(nome, metricas):
+    memoria = metricas['memoria_pico']
+    return (
+            '{:<24} {:>10.3f} {:>10.3f} {:>10.3f} {:>12.1f} {:>9} {:>8} {:>10}'
+        ).format(
+            nome,
+            metricas['parse_s'] * 1000,
+            metricas['render_s'] * 1000,
+            metricas['render_frio_s'] * 1000,
+            metricas['imprimir_s'] * 1000,
+            metricas['bytes'],
+            metricas['escritas'],
+            '-' if memoria is None else '{:.1f}'.format(memoria / 1024.0)
+        )
+
+
+def _formatar(valor):
+    if isinstance(valor, float):
+        return '{:.6f}'.format(valor)
+    return '{}'.format(valor)
+
+
+def _cronometrar(funcao, *args):
+    # assim como no módulo timeit, o coletor de lixo fica desativado durante
+    # a medição, para reduzir a variação entre as repetições
+    gc.collect()
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        inicio = default_timer()
+        resultado = funcao(*args)
+        return default_timer() - inicio, resultado
+    finally:
+        if ativo:
+            gc.enable()
+
+
+def _memoria_pico(funcao):
+    if tracemalloc is None:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _ambiente():
+    return OrderedDict([
+            ('python', platform.python_version()),
+            ('implementacao', platform.python_implementation()),
+            ('plataforma', platform.platform()),
+            ('parser', parser.ativa().nome),
+        ])
+
+
+def _lista_inteiros(valor):
+    return tuple(int(parte) for parte in valor.split(',') if parte.strip())
+
+
+def _lista_tipos(valor):
+    tipos = tuple(parte.strip() for parte in valor.split(',') if parte.strip())
+    for tipo in tipos:
+        if tipo not in TIPOS:
+            raise argparse.ArgumentTypeError(
+                    'tipo desconhecido: {!r}'.format(tipo)
+                )
+    return tipos
+
+
+def _argumentos():
+    argumentos = argparse.ArgumentParser(
+            prog='python -m benchmarks.executar',
+            description='Mede o desempenho da emissao dos extratos.'
+        )
+    argumentos.add_argument(
+            '--itens',
+            type=_lista_inteiros,
+            default=(1, 10, 100, 1000),
+            help='numeros de itens, separados por virgula '
+                 '(padrao: 1,10,100,1000)'
+        )
+    argumentos.add_argument(
+            '--tipos',
+            type=_lista_tipos,
+            default=TIPOS,
+            help='tipos de extrato, separados por virgula '
+                 '(padrao: {})'.format(','.join(TIPOS))
+        )
+    argumentos.add_argument('--tamanho-texto', type=int, default=40)
+    argumentos.add_argument('--meios-pagamento', type=int, default=3)
+    argumentos.add_argument('--proporcao-issqn', type=float, default=0.1)
+    argumentos.add_argument('--observacoes-fisco', type=int, default=2)
+    argumentos.add_argument('--sem-entrega', action='store_true')
+    argumentos.add_argument('--repeticoes', type=int, default=5)
+    argumentos.add_argument(
+            '--salvar',
+            metavar='ARQUIVO',
+            help='grava os resultados como linha de base (JSON)'
+        )
+    argumentos.add_argument(
+            '--comparar',
+            metavar='ARQUIVO',
+            help='compara os resultados com a linha de base (JSON)'
+        )
+    argumentos.add_argument(
+            '--tolerancia',
+            type=float,
+            default=0.2,
+            help='variacao admitida nos tempos e na memoria (padrao: 0.2)'
+        )
+    return argumentos
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+#
+# benchmarks/gerador.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Gerador de documentos CF-e-SAT sintéticos (venda e cancelamento), usados nas
+medições de desempenho:
+
+.. sourcecode:: python
+
+    from benchmarks import gerador
+
+    venda = gerador.venda(itens=100, itens_issqn=10, entrega=True)
+    cancelamento = gerador.cancelamento(venda)
+
+Os documentos são gerados de forma determinística (a partir de ``numero``) e
+possuem chaves de acesso válidas, distintas para cada ``numero``. As
+assinaturas não são válidas, mas não são verificadas na emissão do extrato.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import random
+import re
+
+from decimal import Decimal
+from xml.sax.saxutils import escape
+from xml.sax.saxutils import quoteattr
+
+from satcomum import util
+
+
+MEIOS_PAGAMENTO = ('01', '02', '03', '04', '05', '10', '11', '12', '13', '99')
+
+_PALAVRAS = (
+        'arroz', 'feijão', 'açúcar', 'café', 'leite', 'pão', 'manteiga',
+        'óleo', 'sabão', 'maçã', 'limão', 'integral', 'orgânico', 'tipo',
+        'pacote', 'garrafa', 'lata', 'caixa', 'unidade', 'promoção',
+        'ÁGUA', 'MINERAL', 'SEM', 'GÁS', 'REFRIGERANTE', 'DIET',
+    )
+
+_CNPJ_EMITENTE = '08723218000186'
+_CNPJ_SOFTWARE_HOUSE = '16716114000172'
+_NUMERO_SERIE = '900004019'
+_ASSINATURA_QRCODE = 'A' * 342 + '=='
+
+_CHAVE_VENDA = re.compile(r'Id="(CFe\d{44})"')
+_TOTAL = re.compile(r'<vCFe>([\d.]+)</vCFe>')
+
+
+def chave(numero, ano_mes='1508'):
+    """Compõe uma chave de acesso válida para o número do CF-e."""
+    campos = ''.join([
+            '35',
+            ano_mes,
+            _CNPJ_EMITENTE,
+            '59',
+            _NUMERO_SERIE,
+            '{:06d}'.format(numero % 1000000),
+            '{:06d}'.format((numero * 7919) % 1000000),
+        ])
+    return 'CFe{}{}'.format(campos, util.modulo11(campos))
+
+
+def venda(
+        itens=10,
+        tamanho_texto=40,
+        meios_pagamento=1,
+        itens_issqn=0,
+        entrega=False,
+        observacoes_fisco=1,
+        consumidor=True,
+        numero=1):
+    """Gera o XML de um CF-e-SAT de venda.
+
+    :param int itens: Número de itens vendidos.
+
+    :param int tamanho_texto: Tamanho aproximado da descrição de cada item e
+        do texto de cada observação do fisco.
+
+    :param int meios_pagamento: Número de meios de pagamento (limitado aos
+        códigos em :data:`MEIOS_PAGAMENTO`, que são usados em ciclo).
+
+    :param int itens_issqn: Quantos dos itens são tributados pelo ISSQN
+        (os últimos itens do documento).
+
+    :param bool entrega: Indica se o documento possui dados de entrega.
+
+    :param int observacoes_fisco: Número de elementos ``obsFisco``.
+
+    :param bool consumidor: Indica se o consumidor está identificado.
+
+    :param int numero: Número do CF-e, que determina a chave de acesso e os
+        textos gerados.
+
+    :rtype: bytes
+    """
+    aleatorio = random.Random(numero)
+    id_cfe = chave(numero)
+
+    detalhes = []
+    total = Decimal('0.00')
+    total_issqn = Decimal('0.00')
+    for n_item in range(1, itens + 1):
+        quantidade = Decimal(aleatorio.randint(1, 5000)) / 1000
+        unitario = Decimal(aleatorio.randint(10, 100000)) / 100
+        valor = (quantidade * unitario).quantize(Decimal('0.01'))
+        issqn = n_item > itens - itens_issqn
+        detalhes.append(_item(
+                n_item,
+                _texto(aleatorio, tamanho_texto),
+                quantidade,
+                unitario,
+                valor,
+                issqn
+            ))
+        total += valor
+        if issqn:
+            total_issqn += valor
+
+    pagamentos = []
+    parcela = (total / max(meios_pagamento, 1)).quantize(Decimal('0.01'))
+    for n in range(meios_pagamento):
+        valor = parcela if n < meios_pagamento - 1 else (
+                total - parcela * (meios_pagamento - 1)
+            )
+        pagamentos.append(
+                '<MP><cMP>{}</cMP><vMP>{}</vMP></MP>'.format(
+                    MEIOS_PAGAMENTO[n % len(MEIOS_PAGAMENTO)],
+                    valor
+                )
+            )
+
+    partes = [
+            '<?xml version="1.0"?>',
+            '<CFe><infCFe Id="{}" versao="0.06" versaoDadosEnt="0.06" '
+            'versaoSB="010000">'.format(id_cfe),
+            _ide(id_cfe, tpAmb=True),
+            _emitente(),
+            (
+                '<dest><CPF>11122233396</CPF>'
+                '<xNome>{}</xNome></dest>'.format(
+                    escape(_texto(aleatorio, 30)))
+                if consumidor else '<dest/>'
+            ),
+        ]
+
+    if entrega:
+        partes.append(
+                '<entrega><xLgr>{}</xLgr><nro>{}</nro><xCpl>{}</xCpl>'
+                '<xBairro>{}</xBairro><xMun>SAO PAULO</xMun><UF>SP</UF>'
+                '</entrega>'.format(
+                    escape(_texto(aleatorio, 40)),
+                    aleatorio.randint(1, 9999),
+                    escape(_texto(aleatorio, 20)),
+                    escape(_texto(aleatorio, 20))
+                )
+            )
+
+    partes.extend(detalhes)
+    partes.append(
+            '<total><ICMSTot><vICMS>0.00</vICMS><vProd>{total}</vProd>'
+            '<vDesc>0.00</vDesc><vPIS>0.00</vPIS><vCOFINS>0.00</vCOFINS>'
+            '<vPISST>0.00</vPISST><vCOFINSST>0.00</vCOFINSST>'
+            '<vOutro>0.00</vOutro></ICMSTot><vCFe>{total}</vCFe>'
+            '{issqn}</total>'.format(
+                total=total,
+                issqn=(
+                    '<ISSQNtot><vBC>{0}</vBC><vISS>0.00</vISS>'
+                    '<vPIS>0.00</vPIS><vCOFINS>0.00</vCOFINS>'
+                    '<vPISST>0.00</vPISST><vCOFINSST>0.00</vCOFINSST>'
+                    '</ISSQNtot>'.format(total_issqn)
+                    if itens_issqn else ''
+                )
+            )
+        )
+    partes.append('<pgto>{}<vTroco>0.00</vTroco></pgto>'.format(
+            ''.join(pagamentos)))
+    partes.append(_informacoes_adicionais(
+            aleatorio,
+            observacoes_fisco,
+            tamanho_texto
+        ))
+    partes.append('</infCFe>{}</CFe>'.format(_assinatura(id_cfe)))
+    return ''.join(partes).encode('utf-8')
+
+
+def cancelamento(xml_venda, numero=None, observacoes_fisco=1):
+    """Gera o XML do CF-e-SAT de cancelamento do CF-e de venda informado.
+
+    :param bytes xml_venda: O XML do CF-e de venda (veja :func:`venda`).
+
+    :param int numero: Opcional. Número do CF-e de cancelamento. Se não
+        informado, será o número seguinte ao do CF-e de venda.
+
+    :rtype: bytes
+    """
+    conteudo = xml_venda.decode('utf-8')
+    chave_venda = _CHAVE_VENDA.search(conteudo).group(1)
+    total = _TOTAL.search(conteudo).group(1)
+    if numero is None:
+        numero = int(chave_venda[34:40]) + 1
+    aleatorio = random.Random(numero)
+    id_cfe = chave(numero)
+    partes = [
+            '<?xml version="1.0"?>',
+            '<CFeCanc><infCFe Id="{}" chCanc="{}" versao="0.06">'.format(
+                id_cfe, chave_venda),
+            '<dEmi>20150806</dEmi><hEmi>195048</hEmi>',
+            _ide(id_cfe, tpAmb=False),
+            _emitente(),
+            '<dest/>',
+            '<total><vCFe>{}</vCFe></total>'.format(total),
+            _informacoes_adicionais(aleatorio, observacoes_fisco, 40),
+            '</infCFe>{}</CFeCanc>'.format(_assinatura(id_cfe)),
+        ]
+    return ''.join(partes).encode('utf-8')
+
+
+def _texto(aleatorio, tamanho):
+    palavras = []
+    comprimento = 0
+    while comprimento < tamanho:
+        palavra = aleatorio.choice(_PALAVRAS)
+        palavras.append(palavra)
+        comprimento += len(palavra) + 1
+    return ' '.join(palavras)[:tamanho].strip() or 'item'
+
+
+def _ide(id_cfe, tpAmb):
+    return (
+            '<ide><cUF>35</cUF><cNF>{cNF}</cNF><mod>59</mod>'
+            '<nserieSAT>{serie}</nserieSAT><nCFe>{nCFe}</nCFe>'
+            '<dEmi>20150806</dEmi><hEmi>195048</hEmi><cDV>{cDV}</cDV>'
+            '{tpAmb}<CNPJ>{cnpj}</CNPJ>'
+            '<signAC>SGR-SAT SISTEMA DE GESTAO E RETAGUARDA DO SAT</signAC>'
+            '<assinaturaQRCODE>{assinatura}</assinaturaQRCODE>'
+            '<numeroCaixa>001</numeroCaixa></ide>'
+        ).format(
+            cNF=id_cfe[37:43],
+            serie=_NUMERO_SERIE,
+            nCFe=id_cfe[31:37],
+            cDV=id_cfe[-1],
+            tpAmb='<tpAmb>2</tpAmb>' if tpAmb else '',
+            cnpj=_CNPJ_SOFTWARE_HOUSE,
+            assinatura=_ASSINATURA_QRCODE
+        )
+
+
+def _emitente():
+    return (
+            '<emit><CNPJ>{}</CNPJ><xNome>EMITENTE SINTETICO LTDA</xNome>'
+            '<xFant>SINTETICO</xFant><enderEmit>'
+            '<xLgr>RUA ENGENHEIRO JORGE OLIVA</xLgr><nro>73</nro>'
+            '<xBairro>VILA MASCOTE</xBairro><xMun>SAO PAULO</xMun>'
+            '<CEP>04362060</CEP></enderEmit><IE>149626224113</IE>'
+            '<IM>123123</IM><cRegTrib>3</cRegTrib>'
+            '<indRatISSQN>N</indRatISSQN></emit>'
+        ).format(_CNPJ_EMITENTE)
+
+
+def _item(n_item, descricao, quantidade, unitario, valor, issqn):
+    if issqn:
+        imposto = (
+                '<ISSQN><vDeducISSQN>0.00</vDeducISSQN><vBC>{0}</vBC>'
+                '<vAliq>002.00</vAliq><vISSQN>0.00</vISSQN>'
+                '<cMunFG>3550308</cMunFG><cListServ>17.21</cListServ>'
+                '<cNatOp>01</cNatOp><indIncFisc>2</indIncFisc></ISSQN>'
+            ).format(valor)
+    else:
+        imposto = (
+                '<ICMS><ICMS00><Orig>0</Orig><CST>00</CST>'
+                '<pICMS>10.00</pICMS><vICMS>0.00</vICMS></ICMS00></ICMS>'
+            )
+    return (
+            '<det nItem="{n}"><prod><cProd>{n:04d}</cProd>'
+            '<cEAN>0012345678905</cEAN><xProd>{descricao}</xProd>'
+            '<NCM>47061000</NCM><CFOP>5001</CFOP><uCom>UN</uCom>'
+            '<qCom>{quantidade:.4f}</qCom><vUnCom>{unitario:.2f}</vUnCom>'
+            '<vProd>{valor}</vProd><indRegra>A</indRegra>'
+            '<vItem>{valor}</vItem><vRatDesc>0.00</vRatDesc>'
+            '<vRatAcr>0.00</vRatAcr></prod><imposto>'
+            '<vItem12741>0.00</vItem12741>{imposto}'
+            '<PIS><PISNT><CST>08</CST></PISNT></PIS>'
+            '<COFINS><COFINSNT><CST>08</CST></COFINSNT></COFINS>'
+            '</imposto></det>'
+        ).format(
+            n=n_item,
+            descricao=escape(descricao),
+            quantidade=quantidade,
+            unitario=unitario,
+            valor=valor,
+            imposto=imposto
+        )
+
+
+def _informacoes_adicionais(aleatorio, observacoes_fisco, tamanho_texto):
+    observacoes = ''.join(
+            '<obsFisco xCampo={}><xTexto>{}</xTexto></obsFisco>'.format(
+                quoteattr('xCampo{}'.format(n)),
+                escape(_texto(aleatorio, tamanho_texto))
+            )
+            for n in range(1, observacoes_fisco + 1)
+        )
+    return '<infAdic>{}</infAdic>'.format(observacoes)
+
+
+def _assinatura(id_cfe):
+    return (
+            '<Signature xmlns="http://www.w3.org/2000/09/xmldsig#">'
+            '<SignedInfo><Reference URI="#{}"><DigestValue>'
+            'AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA=</DigestValue>'
+            '</Reference></SignedInfo><SignatureValue>AAAA</SignatureValue>'
+            '</Signature>'
+        ).format(id_cfe)
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# benchmarks/importacao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Mede o tempo de importação (partida a frio) dos módulos da biblioteca. Cada
+medição é feita em um novo interpretador, de modo que nenhum módulo esteja
+previamente carregado. Execute a partir do diretório raiz do projeto:
+
+.. sourcecode:: shell
+
+    $ python -m benchmarks.importacao
+    $ python -m benchmarks.importacao --limite satextrato=20
+
+São exibidos a mediana e o menor tempo, em milissegundos, e o número de
+módulos carregados pela importação. Se algum limite for excedido (pela
+mediana), o programa termina com código de saída ``1``.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import subprocess
+import sys
+
+
+MODULOS = (
+        'satextrato',
+        'satextrato.config',
+        'satextrato.venda',
+        'satextrato.cancelamento',
+    )
+
+_MEDIR = (
+        'from __future__ import print_function\n'
+        'import sys\n'
+        'from timeit import default_timer\n'
+        'antes = set(sys.modules)\n'
+        'inicio = default_timer()\n'
+        'import {modulo}\n'
+        'tempo = default_timer() - inicio\n'
+        'print(tempo, len(set(sys.modules) - antes))\n'
+    )
+
+
+def medir(modulo, repeticoes=10):
+    """Importa o módulo em novos interpretadores, repetidas vezes.
+
+    :returns: Uma tupla contendo a lista dos tempos, em segundos, e o número
+        de módulos carregados pela importação.
+    """
+    tempos = []
+    carregados = 0
+    for _ in range(repeticoes):
+        saida = subprocess.check_output([
+                sys.executable,
+                '-c',
+                _MEDIR.format(modulo=modulo),
+            ])
+        tempo, carregados = saida.decode('ascii').split()
+        tempos.append(float(tempo))
+    return tempos, int(carregados)
+
+
+def mediana(valores):
+    ordenados = sorted(valores)
+    meio = len(ordenados) // 2
+    if len(ordenados) % 2:
+        return ordenados[meio]
+    return (ordenados[meio - 1] + ordenados[meio]) / 2.0
+
+
+def main(argv=None):
+    argumentos = _argumentos().parse_args(argv)
+    limites = dict(argumentos.limite or ())
+
+    excedidos = []
+    print('{:<26} {:>10} {:>10} {:>8}'.format(
+            'modulo', 'mediana_ms', 'minimo_ms', 'modulos'))
+    for modulo in argumentos.modulos:
+        tempos, carregados = medir(modulo, repeticoes=argumentos.repeticoes)
+        valor = mediana(tempos) * 1000
+        print('{:<26} {:>10.1f} {:>10.1f} {:>8}'.format(
+                modulo, valor, min(tempos) * 1000, carregados))
+        if modulo in limites and valor > limites[modulo]:
+            excedidos.append((modulo, valor, limites[modulo]))
+
+    if excedidos:
+        print('\nLimites excedidos:')
+        for modulo, valor, limite in excedidos:
+            print('  {:<24} {:.1f} ms > {:.1f} ms'.format(
+                    modulo, valor, limite))
+        return 1
+    return 0
+
+
+def _limite(valor):
+    try:
+        modulo, limite = valor.split('=', 1)
+        return modulo.strip(), float(limite)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+                'limite invalido (use modulo=ms): {!r}'.format(valor))
+
+
+def _argumentos():
+    argumentos = argparse.ArgumentParser(
+            prog='python -m benchmarks.importacao',
+            description='Mede o tempo de importacao dos modulos.'
+        )
+    argumentos.add_argument(
+            'modulos',
+            nargs='*',
+            default=MODULOS,
+            help='modulos a importar (padrao: {})'.format(', '.join(MODULOS))
+        )
+    argumentos.add_argument('--repeticoes', type=int, default=10)
+    argumentos.add_argument(
+            '--limite',
+            type=_limite,
+            action='append',
+            metavar='MODULO=MS',
+            help='tempo maximo admitido para o modulo, em milissegundos '
+                 '(pode ser repetido)'
+        )
+    return argumentos
+
+
+if __name__ == '__main__':
+    sys.exit(main())
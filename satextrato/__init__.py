@@ -20,6 +20,7 @@ from __future__ import absolute_import
 from __future__ import unicode_literals
 
 import logging
+import sys
 
 
 __version__ = '0.4'
@@ -27,5 +28,33 @@ __version__ = '0.4'
 logging.getLogger('satextrato').addHandler(logging.NullHandler())
 
 
-from .venda import ExtratoCFeVenda  # noqa: E402, F401
-from .cancelamento import ExtratoCFeCancelamento  # noqa: E402, F401
+_ADIADOS = {
+        # nome: módulo onde está definido
+        'ExtratoCFeVenda': 'venda',
+        'ExtratoCFeCancelamento': 'cancelamento',
+    }
+
+# no Python 2 os nomes de __all__ devem ser str, não unicode
+__all__ = [str('ExtratoCFeVenda'), str('ExtratoCFeCancelamento')]
+
+if sys.version_info >= (3, 7):
+    # os extratos (e as bibliotecas das quais dependem) só são importados
+    # quando forem usados pela primeira vez (PEP 562)
+
+    def __getattr__(nome):
+        if nome not in _ADIADOS:
+            raise AttributeError(
+                    'module {!r} has no attribute {!r}'.format(__name__, nome)
+                )
+        import importlib
+        modulo = importlib.import_module('.' + _ADIADOS[nome], __name__)
+        valor = getattr(modulo, nome)
+        globals()[nome] = valor
+        return valor
+
+    def __dir__():
+        return sorted(set(globals()) | set(_ADIADOS))
+
+else:
+    from .venda import ExtratoCFeVenda  # noqa: F401
+    from .cancelamento import ExtratoCFeCancelamento  # noqa: F401
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/_assincrono.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Corrotinas de :mod:`satextrato.assincrono`, mantidas em um módulo à parte
+pois a sintaxe ``async``/``await`` não pode ser interpretada pelo Python 2.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import asyncio
+
+from . import lote
+from .config import padrao as config_padrao
+from .programa import construir
+from .programa import perfil
+
+
+async def renderizar(
+        documento,
+        impressora,
+        config=None,
+        resumido=False,
+        executor=None):
+    """Carrega e renderiza o extrato do documento em um *executor*, sem
+    bloquear o *loop* de eventos. Nada é enviado à impressora, que apenas
+    determina o perfil usado na renderização.
+
+    :param documento: O documento, em qualquer das formas aceitas por
+        :mod:`satextrato.lote`.
+
+    :param impressora: A classe da impressora (por exemplo,
+        :class:`escpos.impl.epson.GenericESCPOS`), um
+        :class:`~satextrato.programa.PerfilImpressora` ou uma impressora,
+        da qual é usado apenas o perfil. Veja
+        :func:`satextrato.programa.perfil`.
+
+    :param config: Opcional. Uma instância de
+        :class:`satextrato.config.Configuracoes`.
+
+    :param bool resumido: Opcional. Indica se o extrato do CF-e de venda
+        deverá ser resumido.
+
+    :param executor: Opcional. O *executor* onde o extrato será renderizado.
+        Se não informado será usado o *executor* padrão do *loop* de eventos.
+
+    :returns: Os bytes do extrato renderizado.
+    :rtype: bytes
+    """
+    loop = _loop()
+    return await loop.run_in_executor(
+            executor,
+            _serializar,
+            documento,
+            impressora,
+            config or config_padrao(),
+            resumido
+        )
+
+
+async def enviar(dados, endereco, tempo_limite=None):
+    """Envia os bytes à impressora conectada à rede.
+
+    :param bytes dados: Os bytes a serem enviados.
+
+    :param endereco: Uma instância de :class:`escpos.NetworkConnection`,
+        uma string ``host:porta`` ou uma tupla ``(host, porta)``.
+
+    :param float tempo_limite: Opcional. Tempo limite, em segundos, para
+        conectar e enviar os dados à impressora.
+
+    :raises asyncio.TimeoutError: Se o tempo limite for excedido.
+    """
+    host, porta = _endereco(endereco)
+    await asyncio.wait_for(_enviar(dados, host, porta), tempo_limite)
+
+
+async def imprimir(
+        documento,
+        endereco,
+        impressora,
+        config=None,
+        resumido=False,
+        tempo_limite=None,
+        executor=None):
+    """Renderiza e imprime o extrato do documento sem bloquear o *loop* de
+    eventos. O extrato é renderizado para o perfil da impressora (veja
+    :func:`renderizar`) e os bytes resultantes são enviados ao endereço
+    informado, em uma única conexão.
+
+    :param documento: Veja :func:`renderizar`.
+
+    :param endereco: O endereço da impressora. Veja :func:`enviar`.
+
+    :param impressora: Veja :func:`renderizar`.
+
+    :param config: Opcional. Veja :func:`renderizar`.
+
+    :param bool resumido: Opcional. Veja :func:`renderizar`.
+
+    :param float tempo_limite: Opcional. Tempo limite, em segundos, para
+        conectar e enviar os dados à impressora. O tempo de renderização
+        não é considerado.
+
+    :param executor: Opcional. Veja :func:`renderizar`.
+
+    :returns: O número de bytes enviados à impressora.
+    :rtype: int
+    """
+    dados = await renderizar(
+            documento,
+            impressora,
+            config=config,
+            resumido=resumido,
+            executor=executor
+        )
+    await enviar(dados, endereco, tempo_limite=tempo_limite)
+    return len(dados)
+
+
+async def _enviar(dados, host, porta):
+    _, writer = await asyncio.open_connection(host, porta)
+    try:
+        writer.write(dados)
+        await writer.drain()
+    finally:
+        writer.close()
+        if hasattr(writer, 'wait_closed'):  # Python 3.7+
+            await writer.wait_closed()
+
+
+def _loop():
+    # asyncio.get_running_loop() existe a partir do Python 3.7; antes disso,
+    # get_event_loop() obtém o loop em execução quando chamado de uma
+    # corrotina
+    obter = getattr(asyncio, 'get_running_loop', None)
+    if obter is None:
+        return asyncio.get_event_loop()
+    return obter()
+
+
+def _serializar(documento, impressora, config, resumido):
+    # o extrato é renderizado em uma impressora construída a partir do
+    # perfil, sem dispositivo real, de modo que nenhuma conexão é aberta; a
+    # serialização não faz as pausas da PyESCPOS (veja
+    # satextrato.programa.sem_pausas)
+    impressora = construir(perfil(impressora))
+    extrato = lote.carregar(
+            documento,
+            impressora,
+            config=config,
+            resumido=resumido
+        )
+    return extrato.renderizar().serializar(impressora)
+
+
+def _endereco(endereco):
+    if hasattr(endereco, 'host_name'):
+        return endereco.host_name, endereco.port_number
+    if isinstance(endereco, tuple):
+        return endereco
+    host, porta = endereco.rsplit(':', 1)
+    return host, int(porta)
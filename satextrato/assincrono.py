@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/assincrono.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Impressão de extratos a partir de aplicações baseadas em ``asyncio``, em
+impressoras conectadas à rede.
+
+O extrato é renderizado em um *executor* (por padrão, o *executor* do
+*loop* de eventos), em uma impressora sem dispositivo real construída a
+partir da classe ou do perfil da impressora (veja :mod:`satextrato.lote`), e
+os bytes resultantes são enviados à impressora através de uma conexão TCP
+não bloqueante, de modo que o *loop* de eventos não fica bloqueado durante a
+impressão. Nenhuma outra conexão com a impressora é aberta:
+
+.. sourcecode:: python
+
+    from escpos.impl.epson import TMT20
+
+    from satextrato import assincrono
+
+    async def imprimir_venda(caminho):
+        await assincrono.imprimir(
+                caminho,
+                '10.0.0.101:9100',
+                TMT20,
+                tempo_limite=10
+            )
+
+A impressão pode ser cancelada como qualquer outra tarefa. Se o tempo limite
+for excedido, será lançada ``asyncio.TimeoutError``.
+
+.. note::
+
+    Este módulo requer Python 3.5 ou superior. Em versões anteriores, a
+    importação do módulo lança ``ImportError``.
+
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import sys
+
+
+if sys.version_info < (3, 5):
+    raise ImportError('satextrato.assincrono requer Python 3.5 ou superior')
+
+
+from ._assincrono import enviar  # noqa: E402, F401
+from ._assincrono import imprimir  # noqa: E402, F401
+from ._assincrono import renderizar  # noqa: E402, F401
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/barras.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Codificação de códigos de barras Code128, para as saídas que não são
+impressoras ESC/POS (veja :mod:`satextrato.visualizacao`), onde as barras
+precisam ser desenhadas. Os dados são codificados no mesmo conjunto do
+comando enviado à impressora, de modo que as barras desenhadas sejam as
+mesmas impressas.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from .cache import LRU
+
+
+MARGEM = 10
+"""Zona de silêncio do Code128, em módulos, em cada lado do símbolo."""
+
+CONJUNTO_A = 'A'
+CONJUNTO_B = 'B'
+CONJUNTO_C = 'C'
+
+_INICIO = {
+        CONJUNTO_A: 103,
+        CONJUNTO_B: 104,
+        CONJUNTO_C: 105,
+    }
+
+_FIM = 106
+
+# larguras das barras e espaços (alternados, iniciando por uma barra) de
+# cada símbolo do Code128, em módulos
+_PADROES = (
+        '212222', '222122', '222221', '121223', '121322', '131222', '122213',
+        '122312', '132212', '221213', '221312', '231212', '112232', '122132',
+        '122231', '113222', '123122', '123221', '223211', '221132', '221231',
+        '213212', '223112', '312131', '311222', '321122', '321221', '312212',
+        '322112', '322211', '212123', '212321', '232121', '111323', '131123',
+        '131321', '112313', '132113', '132311', '211313', '231113', '231311',
+        '112133', '112331', '132131', '113123', '113321', '133121', '313121',
+        '211331', '231131', '213113', '213311', '213131', '311123', '311321',
+        '331121', '312113', '312311', '332111', '314111', '221411', '431111',
+        '111224', '111422', '121124', '121421', '141122', '141221', '112214',
+        '112412', '122114', '122411', '142112', '142211', '241211', '221114',
+        '413111', '241112', '134111', '111242', '121142', '121241', '114212',
+        '124112', '124211', '411212', '421112', '421211', '212141', '214121',
+        '412121', '111143', '111341', '131141', '114113', '114311', '411113',
+        '411311', '113141', '114131', '311141', '411131', '211412', '211214',
+        '211232', '2331112',
+    )
+
+_LARGURAS = LRU(tamanho=256)
+
+
+def larguras(dados, conjunto=CONJUNTO_A):
+    """Codifica os dados em Code128 no conjunto indicado, da mesma forma que
+    a impressora codifica o comando enviado pela PyESCPOS (que usa o
+    conjunto A, a menos que o argumento ``codeset`` seja informado).
+
+    :param str dados: Os dados a serem codificados.
+
+    :param conjunto: Opcional. O conjunto do Code128 (``A``, ``B`` ou
+        ``C``), como ``str`` ou como os ``bytes`` de
+        :attr:`escpos.barcode.CODE128_A` e similares.
+
+    :returns: As larguras, em módulos, das barras e dos espaços alternados,
+        iniciando por uma barra, sem as zonas de silêncio.
+
+    :raises ValueError: Se houver caracteres que não podem ser codificados
+        no conjunto.
+
+    :rtype: tuple
+    """
+    conjunto = _conjunto(conjunto)
+    resultado = _LARGURAS.obter((conjunto, dados))
+    if resultado is None:
+        resultado = tuple(
+                int(largura)
+                for simbolo in _simbolos(dados, conjunto)
+                for largura in _PADROES[simbolo]
+            )
+        _LARGURAS.armazenar((conjunto, dados), resultado)
+    return resultado
+
+
+def modulos(dados, conjunto=CONJUNTO_A):
+    """Número de módulos do Code128, incluindo as zonas de silêncio."""
+    return sum(larguras(dados, conjunto)) + 2 * MARGEM
+
+
+def _conjunto(conjunto):
+    if isinstance(conjunto, bytes):
+        conjunto = conjunto.decode('ascii')
+    if conjunto not in _INICIO:
+        raise ValueError(
+                'Conjunto Code128 desconhecido: {!r}'.format(conjunto))
+    return conjunto
+
+
+def _simbolos(dados, conjunto):
+    simbolos = [_INICIO[conjunto]]
+    if conjunto == CONJUNTO_C:
+        if not (dados.isdigit() and len(dados) % 2 == 0):
+            raise ValueError(
+                    'O conjunto C do Code128 requer uma quantidade par de '
+                    'digitos: {!r}'.format(dados)
+                )
+        simbolos.extend(
+                int(dados[i:i + 2])
+                for i in range(0, len(dados), 2)
+            )
+    else:
+        for caractere in dados:
+            simbolos.append(_valor(caractere, conjunto))
+
+    verificador = simbolos[0] + sum(
+            posicao * valor
+            for posicao, valor in enumerate(simbolos[1:], 1)
+        )
+    simbolos.append(verificador % 103)
+    simbolos.append(_FIM)
+    return simbolos
+
+
+def _valor(caractere, conjunto):
+    # no conjunto A os caracteres de controle (0 a 31) seguem os valores 0
+    # a 63 (ASCII 32 a 95); no conjunto B não há caracteres de controle e
+    # os valores 0 a 95 correspondem ao ASCII 32 a 127
+    codigo = ord(caractere)
+    if conjunto == CONJUNTO_A:
+        if 32 <= codigo <= 95:
+            return codigo - 32
+        if 0 <= codigo <= 31:
+            return codigo + 64
+    elif 32 <= codigo <= 127:
+        return codigo - 32
+    raise ValueError(
+            'Caractere invalido para o conjunto {} do Code128: {!r}'.format(
+                conjunto, caractere)
+        )
@@ -20,20 +20,34 @@ from __future__ import absolute_import
 from __future__ import print_function
 from __future__ import unicode_literals
 
-import textwrap
-import xml.etree.ElementTree as ET
+import logging
 
-from six.moves import range
-
-from unidecode import unidecode
+from contextlib import contextmanager
 
-import escpos.barcode
-import escpos.feature
+from six.moves import range
 
 from satcomum import br
-from satcomum import constantes
 
+from . import consumo
+from . import layout
+from . import modelo
+from . import parser
+from . import qr
+from . import renderizacao
+from . import transliteracao
+from .cache import LRU
 from .config import padrao as config_padrao
+from .estado import ImpressoraComEstado
+from .programa import Programa
+from .programa import construir
+from .programa import escrever
+from .programa import sem_pausas
+
+
+logger = logging.getLogger('satextrato.base')
+
+_FRAGMENTOS = LRU(tamanho=256)
+_CODE128 = LRU(tamanho=256)
 
 
 class ExtratoCFe(object):
@@ -62,24 +76,37 @@ class ExtratoCFe(object):
         """
         super(ExtratoCFe, self).__init__()
         self._config = config or config_padrao()
-        self._tree = ET.parse(fp)
-        self.root = self._tree.getroot()
+        self._carregar(fp)
         self.impressora = impressora
+        self._renderizacao = renderizacao.obter(
+                impressora,
+                self._config,
+                transliteracao.codificacao(impressora)
+            )
+        self._codificacao = self._renderizacao.codificacao
 
         self._flag_negrito = False
         self._flag_italico = False
         self._flag_expandido = False
         self._flag_condensado = False
 
+        self.contagem = consumo.Contagem()
+        """O que foi emitido pela última impressão do extrato. Veja
+        :class:`satextrato.consumo.Contagem`.
+        """
+
+    def _carregar(self, fp):
+        self._tree = parser.parse(fp)
+        self.root = self._tree.getroot()
+        self.cfe = modelo.extrair(self._tree)
+
     @property
     def _colunas(self):
         if self._flag_condensado:
-            num_colunas = self.impressora.feature.columns.condensed
+            return self._renderizacao.colunas.condensed
         elif self._flag_expandido:
-            num_colunas = self.impressora.feature.columns.expanded
-        else:
-            num_colunas = self.impressora.feature.columns.normal
-        return num_colunas
+            return self._renderizacao.colunas.expanded
+        return self._renderizacao.colunas.normal
 
     @property
     def is_ambiente_testes(self):
@@ -95,32 +122,117 @@ class ExtratoCFe(object):
             O CF-e de cancelamento não possui o elemento ``tpAmb``, conforme
             descrito na ER SAT, item 4.2.3 **Layout do CF-e de cancelamento**.
 
-        :raises ValueError: Se o documento XML não for identificado como um
-            CF-e-SAT de venda ou cancelamento.
+        Documentos que não sejam CF-e-SAT de venda ou cancelamento são
+        rejeitados já na construção do extrato, com ``ValueError`` (veja
+        :func:`satextrato.modelo.extrair_inicio`).
 
         """
-        signAC = self.root.findtext('./infCFe/ide/signAC')
+        return self.cfe.ambiente_testes
 
-        if self.root.tag == constantes.ROOT_TAG_VENDA:
-            tpAmb = self.root.findtext('./infCFe/ide/tpAmb')
-            return (tpAmb == constantes.B10_TESTES
-                    or signAC == constantes.ASSINATURA_AC_TESTE)
+    instrumentacao = None
+    """Destino das medições de cada seção do extrato ou ``None`` (o padrão)
+    para não medir. Veja :mod:`satextrato.instrumentacao`.
+    """
 
-        elif self.root.tag == constantes.ROOT_TAG_CANCELAMENTO:
-            # CF-e-SAT de cancelamento não possui `tpAmb`
-            return signAC == constantes.ASSINATURA_AC_TESTE
+    def imprimir(self):
+        self._preparar_qrcodes()
+        self.contagem = consumo.Contagem()
+        with self._instrumentando(), self._rastreando():
+            self.cabecalho()
+            self.corpo()
+            self.rodape()
+            self.fim_documento()
 
-        raise ValueError(
-                (
-                    'Documento nao parece ser um CF-e-SAT; root tag: {!r}'
-                ).format(self.root.tag)
+    def renderizar(self, otimizar=True):
+        """Renderiza o extrato em um programa de impressão, sem enviar nada
+        para a impressora. O programa resultante poderá ser executado de uma
+        só vez na impressora, reduzindo o número de escritas no dispositivo:
+
+        .. sourcecode:: python
+
+            extrato = ExtratoCFeVenda(fp, impressora)
+            extrato.renderizar().executar(impressora)
+
+        :param bool otimizar: Opcional. Indica se os passos de otimização
+            deverão ser aplicados ao programa. O padrão é ``True``.
+
+        :rtype: satextrato.programa.Programa
+        """
+        with self._gravando() as programa:
+            self.imprimir()
+        return programa.otimizar() if otimizar else programa
+
+    def estimar(self, modelo=None):
+        """Estima o comprimento de papel e a duração da impressão do extrato,
+        sem enviar nada para a impressora.
+
+        :param modelo: Opcional. Uma instância de
+            :class:`satextrato.consumo.ModeloVelocidade`. Se não informado,
+            será o modelo indicado pela impressora (veja
+            :func:`satextrato.consumo.modelo`).
+
+        :rtype: satextrato.consumo.Estimativa
+        """
+        # preserva a contagem de uma impressão anterior
+        contagem = self.contagem
+        try:
+            self.renderizar(otimizar=False)
+            estimada = self.contagem
+        finally:
+            self.contagem = contagem
+        return consumo.estimar(
+                estimada,
+                modelo or consumo.modelo(self.impressora)
             )
 
-    def imprimir(self):
-        self.cabecalho()
-        self.corpo()
-        self.rodape()
-        self.fim_documento()
+    @contextmanager
+    def _gravando(self):
+        # substitui temporariamente a impressora por um programa, que apenas
+        # registra as operações que seriam enviadas à impressora
+        impressora = self.impressora
+        programa = Programa(impressora)
+        self.impressora = programa
+        try:
+            yield programa
+        finally:
+            self.impressora = impressora
+
+    @contextmanager
+    def _instrumentando(self):
+        # mede as seções do extrato, apenas se houver um destino para as
+        # medições
+        destino = self._destino_instrumentacao()
+        if destino is None:
+            yield
+        else:
+            from .instrumentacao import instrumentar
+            with instrumentar(self, destino):
+                yield
+
+    def _destino_instrumentacao(self):
+        # obtém o destino sem vinculá-lo à instância, pois uma função
+        # atribuída à própria classe seria tratada como um método
+        if 'instrumentacao' in vars(self):
+            return vars(self)['instrumentacao']
+        for classe in type(self).__mro__:
+            if 'instrumentacao' in vars(classe):
+                destino = vars(classe)['instrumentacao']
+                if isinstance(destino, staticmethod):
+                    destino = destino.__get__(None, classe)
+                return destino
+        return None
+
+    @contextmanager
+    def _rastreando(self):
+        # intermedia a impressora para que os comandos que alteram os modos
+        # de impressão só sejam enviados quando alterarem o estado
+        impressora = self.impressora
+        self.impressora = ImpressoraComEstado(impressora)
+        try:
+            yield
+            self.impressora.descarregar()
+        finally:
+            self.impressora = impressora
 
     def centro(self):
         self.impressora.justify_center()
@@ -167,7 +279,7 @@ class ExtratoCFe(object):
             espacamento_minimo=4
             ):
         largura = colunas or self._colunas
-        texto = _bordas(
+        texto = layout.bordas(
                 texto_esquerda,
                 texto_direita,
                 largura=largura,
@@ -181,17 +293,24 @@ class ExtratoCFe(object):
         # considera hard-breaks
         linhas_fixas = texto.replace('\r', '').split('\n')
         for linha_fixa in linhas_fixas:
-            linhas = textwrap.wrap(linha_fixa, largura)
+            linhas = layout.quebrar(linha_fixa, largura)
             for linha in linhas:
                 self.texto(linha)
         return self
 
     def avanco(self, linhas=1):
         self.impressora.lf(lines=linhas)
+        self.contagem.avancos += linhas
         return self
 
     def texto(self, texto):
-        self.impressora.text(unidecode(texto))
+        self.impressora.text(
+                transliteracao.transliterar(texto, self._codificacao)
+            )
+        if self._flag_expandido:
+            self.contagem.linhas_expandidas += 1
+        else:
+            self.contagem.linhas += 1
         return self
 
     def separador(self, caracter='-', colunas=None):
@@ -241,7 +360,7 @@ class ExtratoCFe(object):
         """
         if self.is_ambiente_testes:
             return '0' * 6
-        return self.root.findtext('./infCFe/ide/nCFe')
+        return self.cfe.ide.nCFe
 
     def chave_cfe_code128(self, chave):
         """Imprime o código de barras padrão Code128 para a chave do CF-e.
@@ -253,46 +372,104 @@ class ExtratoCFe(object):
         self.texto(' '.join(chave.partes()))
         self.condensado()
 
-        if self._config.code128.ignorar:
+        conf = self._config.code128
+        if conf.ignorar:
             return
 
-        code128_params = dict(
-                barcode_height=self._config.code128.altura,
-                barcode_width=escpos.barcode.BARCODE_NORMAL_WIDTH,
-                barcode_hri=escpos.barcode.BARCODE_HRI_NONE
-            )
+        nativo = self._renderizacao.escpos
+        if nativo:
+            partes = self._comandos_code128(chave, conf)
+        else:
+            partes = _partes_code128(chave, conf)
 
-        if self._config.code128.truncar:
-            tamanho = self._config.code128.truncar_tamanho
-            digitos = ''.join(chave.partes())[:tamanho]
+        for n_parte, parte in enumerate(partes, 1):
             self.centro()
-            self.impressora.code128(digitos, **code128_params)
-
-        elif self._config.code128.quebrar:
-            partes = _quebrar_chave(chave, self._config.code128.quebrar_partes)
-            for n_parte, parte in enumerate(partes, 1):
-                self.centro()
-                self.impressora.code128(parte, **code128_params)
-                if self._config.code128.pular_linha_entre_partes:
+            if nativo:
+                escrever(self.impressora, parte)
+            else:
+                # não é uma impressora ESC/POS (veja satextrato.visualizacao)
+                self.impressora.code128(parte, **self._renderizacao.code128)
+            self.contagem.codigos_barras += 1
+            self.contagem.pontos_codigos_barras += conf.altura
+            if conf.quebrar and not conf.truncar:
+                if conf.pular_linha_entre_partes:
                     if n_parte < len(partes):
                         self.avanco()
+
+    def _comandos_code128(self, chave, conf):
+        # os comandos Code128 de cada parte da chave, codificados pela própria
+        # implementação da impressora e mantidos em cache pela chave, pela
+        # configuração do Code128 e pelo perfil da impressora
+        cache = (
+                self._renderizacao.assinatura,
+                ''.join(chave.partes()),
+                conf.altura,
+                conf.truncar,
+                conf.truncar_tamanho,
+                conf.quebrar,
+                tuple(conf.quebrar_partes),
+            )
+        comandos = _CODE128.obter(cache)
+        if comandos is None:
+            comandos = tuple(
+                    _codificar_code128(
+                            self._renderizacao.impressora,
+                            parte,
+                            self._renderizacao.code128
+                        )
+                    for parte in _partes_code128(chave, conf)
+                )
+            _CODE128.armazenar(cache, comandos)
+        return comandos
+
+    def qrcode(self, dados):
+        """Imprime o QRCode, usando o comando nativo da impressora ou uma
+        imagem, se a impressora indicar o recurso
+        :data:`satextrato.qr.QRCODE_RASTER`.
+        """
+        conf = self._config.qrcode
+        # os módulos são calculados antes de qualquer escrita, pois uma falha
+        # na estimativa não deve interromper uma impressão já iniciada
+        try:
+            modulos = consumo.modulos_qrcode(dados, conf.nivel_correcao)
+        except ValueError:
+            logger.warning(
+                    'QRCode nao contabilizado (nivel de correcao %r, '
+                    '%d caracteres)', conf.nivel_correcao, len(dados),
+                    exc_info=True
+                )
+            modulos = 0
+        if self._qrcode_raster:
+            imagem = qr.raster(dados, conf.tamanho_modulo, conf.nivel_correcao)
+            escrever(self.impressora, imagem)
         else:
-            partes = chave.partes(1)
-            self.centro()
-            self.impressora.code128(partes[0], **code128_params)
+            self.impressora.qrcode(
+                    dados,
+                    qrcode_module_size=conf.tamanho_modulo,
+                    qrcode_ecc_level=conf.nivel_correcao
+                )
+        self.contagem.qrcodes += 1
+        self.contagem.modulos_qrcodes += modulos
+        self.contagem.pontos_qrcodes += modulos * conf.tamanho_modulo
 
     def qrcode_mensagem(self):
         mensagem = self._config.qrcode.mensagem.strip()
         if not mensagem:
             return
 
-        if self._config.qrcode.mensagem_modo_condensado:
+        self._fragmento(
+                self._qrcode_mensagem,
+                (mensagem, self._config.qrcode.mensagem_modo_condensado)
+            )
+
+    def _qrcode_mensagem(self, mensagem, modo_condensado):
+        if modo_condensado:
             self.condensado()
         self.centro()
-        for linha in textwrap.wrap(mensagem, self._colunas):
+        for linha in self._renderizacao.mensagem_qrcode[self._colunas]:
             self.texto(linha)
         self.esquerda()
-        if self._config.qrcode.mensagem_modo_condensado:
+        if modo_condensado:
             self.condensado()
 
     def fim_documento(self):
@@ -300,24 +477,33 @@ class ExtratoCFe(object):
         guilhotinando o documento, conforme as configurações.
         """
         self.normal()
+        self._fragmento(
+                self._fim_documento,
+                (
+                    self._config.cupom,
+                    self._config.rodape,
+                    self._renderizacao.cortar,
+                )
+            )
+
+    def _fim_documento(self, conf_cupom, conf_rodape, cortar):
         self.avanco()
         self.separador()
 
-        conf_cupom = self._config.cupom
-        conf_rodape = self._config.rodape
-
         if conf_rodape.esquerda or conf_rodape.direita:
             self.condensado()
-            self.bordas(conf_rodape.esquerda, conf_rodape.direita)
+            self.texto(self._renderizacao.rodape[self._colunas])
             self.condensado()
 
-        if self.impressora.feature.cutter and conf_cupom.cortar_documento:
+        if cortar:
             if conf_cupom.avancar_linhas > 0:
                 self.avanco(conf_cupom.avancar_linhas)
             self.impressora.cut(
                     partial=conf_cupom.cortar_parcialmente,
                     feed=conf_cupom.cortar_avanco
                 )
+            self.contagem.cortes += 1
+            self.contagem.pontos_avanco += conf_cupom.cortar_avanco
         else:
             # impressora não possui guilhotina ou não é para cortar o documento
             if conf_cupom.avancar_linhas > 0:
@@ -326,17 +512,17 @@ class ExtratoCFe(object):
     def cabecalho(self):
 
         self.normal()
+        self._fragmento(self._emitente, (self.cfe.emitente, self.cfe.ide.cUF))
 
-        emit = self.root.find('./infCFe/emit')
-        enderEmit = emit.find('enderEmit')
+    def _emitente(self, emitente, codigo_uf):
 
-        nome_fantasia = emit.findtext('xFant')
-        razao_social = emit.findtext('xNome')
+        nome_fantasia = emitente.xFant
+        razao_social = emitente.xNome
 
-        logradouro = enderEmit.findtext('xLgr')
-        numero = enderEmit.findtext('nro')
-        complemento = enderEmit.findtext('xCpl')
-        bairro = enderEmit.findtext('xBairro')
+        logradouro = emitente.xLgr
+        numero = emitente.nro
+        complemento = emitente.xCpl
+        bairro = emitente.xBairro
 
         if numero:  # número não é obrigatório
             logradouro = u'{}, {}'.format(logradouro, numero)
@@ -351,16 +537,16 @@ class ExtratoCFe(object):
                 complemento = ''  # ignora a linha que deveria conter o xCpl
 
         cidade = u'{}/{} CEP: {}'.format(
-                enderEmit.findtext('xMun'),
-                br.uf_pelo_codigo(int(self.root.findtext('./infCFe/ide/cUF'))),
-                br.as_cep(enderEmit.findtext('CEP')))
+                emitente.xMun,
+                br.uf_pelo_codigo(int(codigo_uf)),
+                br.as_cep(emitente.CEP))
 
         partes_endereco = [logradouro, complemento, bairro, cidade]
         endereco = u'\r\n'.join([e for e in partes_endereco if e])
 
-        cnpj = 'CNPJ: {}'.format(br.as_cnpj(emit.findtext('CNPJ')))
-        im = 'IM: {}'.format(emit.findtext('IM') or '')
-        ie = 'IE: {}'.format(emit.findtext('IE'))
+        cnpj = 'CNPJ: {}'.format(br.as_cnpj(emitente.CNPJ))
+        im = 'IM: {}'.format(emitente.IM or '')
+        ie = 'IE: {}'.format(emitente.IE)
 
         self.centro()
         self.negrito()
@@ -383,6 +569,80 @@ class ExtratoCFe(object):
 
         self.separador()
 
+    @property
+    def _qrcode_raster(self):
+        return self._renderizacao.qrcode_raster
+
+    def _dados_qrcodes(self):
+        # conteúdo dos QRCodes que serão impressos no extrato
+        return [self.cfe.dados_qrcode]
+
+    def _preparar_qrcodes(self):
+        # inicia a geração das imagens dos QRCodes, que serão impressos
+        # apenas no final do extrato
+        if self._qrcode_raster:
+            conf = self._config.qrcode
+            for dados in self._dados_qrcodes():
+                if dados:
+                    qr.preparar(
+                            dados,
+                            conf.tamanho_modulo,
+                            conf.nivel_correcao
+                        )
+
+    def _fragmento(self, secao, dados):
+        # Emite uma seção a partir de um fragmento pré-renderizado, que é
+        # identificado pela classe do extrato e pela seção (subclasses podem
+        # sobrescrever a seção ou os métodos usados por ela), pelos dados dos
+        # quais a seção depende, pelo estado dos modos de impressão e pelas
+        # colunas e codificação da impressora. Se o fragmento ainda não
+        # existir, a seção é renderizada e armazenada. Os objetos do modelo
+        # são mutáveis e entram na chave pelos valores dos seus atributos.
+        chave = (
+                type(self),
+                secao.__name__,
+                self._flags(),
+                self._renderizacao.colunas,
+                self._codificacao,
+            ) + tuple(
+                dado.valores() if isinstance(dado, modelo._Modelo) else dado
+                for dado in dados
+            )
+
+        fragmento = _FRAGMENTOS.obter(chave)
+        if fragmento is None:
+            contagem = self.contagem
+            self.contagem = consumo.Contagem()
+            try:
+                with self._gravando() as programa:
+                    secao(*dados)
+                fragmento = (
+                        tuple(programa.operacoes),
+                        self._flags(),
+                        self.contagem,
+                    )
+            finally:
+                self.contagem = contagem
+            _FRAGMENTOS.armazenar(chave, fragmento)
+
+        operacoes, flags, contagem = fragmento
+        Programa(self.impressora, operacoes=operacoes).aplicar(self.impressora)
+        self.contagem.somar(contagem)
+        (
+            self._flag_negrito,
+            self._flag_italico,
+            self._flag_expandido,
+            self._flag_condensado,
+        ) = flags
+
+    def _flags(self):
+        return (
+                self._flag_negrito,
+                self._flag_italico,
+                self._flag_expandido,
+                self._flag_condensado,
+            )
+
     def rodape(self):
         raise NotImplementedError()
 
@@ -390,83 +650,6 @@ class ExtratoCFe(object):
         raise NotImplementedError()
 
 
-def _bordas(
-        esquerda,
-        direita,
-        largura=48,
-        espacamento_minimo=4,
-        favorecer_direita=True
-        ):
-    """Prepara duas strings para serem impressas alinhadas às bordas opostas da
-    mídia, os textos da esquerda (borda esquerda) e da direita (borda direita),
-    respeitando uma largura e espaçamento mínimo determinados.
-
-    .. sourcecode:: python
-
-        >>> _bordas('a', 'b')
-        'a                                              b'
-
-        >>> esquerda = 'a' * 30
-        >>> direita = 'b' * 30
-        >>> _bordas(esquerda, direita)
-        'aaaaaaaaaaaaaaaaaaaaaa    bbbbbbbbbbbbbbbbbbbbbb'
-
-        >>> esquerda = 'Gazeta publica hoje breve nota de faxina na quermesse'
-        >>> direita = 'Um pequeno jabuti xereta viu dez cegonhas felizes'
-        >>> _bordas(esquerda, direita, espacamento_minimo=1)
-        'Gazeta publica hoje bre viu dez cegonhas felizes'
-
-
-    :param str esquerda: O texto a ser exibido à esquerda. Se o texto não
-        couber (em relação à largura e ao espaçamento mínimo) será exibida
-        apenas a porção mais à esquerda desse texto, sendo cortados (não
-        impressos) os caracteres do final do texto.
-
-    :param str direita: O texto à ser exibido à direita. Se o texto da direita
-        não couber (em relação à largura e ao espaçamento mínimo) será exibida
-        apenas porção mais à direita desse texto, sendo cortados (não
-        impressos) os caracteres do início do texto.
-
-    :param int largura: Largura em caracteres a considerar ao calcular o vão
-        entre os textos da esquerda e direita. O padrão é 48, já que é a
-        largura mais comum entre as impressoras térmicas de bobina quando
-        imprimindo com a fonte normal.
-
-    :param int espacamento_minimo: Opcional. Determina o número de espaços
-        mínimo a ser deixado entre os textos da esquerda e direita. O padrão
-        são quatro espaços.
-
-    :param bool favorecer_direita: Opcional. Determina se o texto da direita
-        deverá ser favorecido com um espaço maior quando houver diferença
-        (sobra) entre os textos da esquerda e direita em relação ao espaçamento
-        mínimo determinado. O padrão é favorecer o texto da direita, já que é
-        normalmente o dado relevante, como um valor ou percentual.
-
-    :returns: Uma string contendo os textos da esquerda e direita encaixados na
-        largura determinada, respeitando um espaçamento mínimo entre eles. Se
-        necessário os textos serão truncados para respeitar a largura (o texto
-        da esquerda será truncado no final e o texto da direita será truncado
-        no início).
-
-    :rtype: str
-
-    """
-    espacamento = largura - (len(esquerda) + len(direita))
-    if espacamento < espacamento_minimo:
-        espacamento = espacamento_minimo
-        cpmax = int((largura - espacamento) // 2)
-        cpmax_esq, cpmax_dir = cpmax, cpmax
-        diferenca = largura - (espacamento + cpmax * 2)
-        if diferenca > 0:
-            if favorecer_direita:
-                cpmax_dir += diferenca
-            else:
-                cpmax_esq += diferenca
-        esquerda = esquerda[:cpmax_esq]
-        direita = direita[-cpmax_dir:]
-    return '%s%s%s' % (esquerda, ' ' * espacamento, direita)
-
-
 def _quebrar_chave(chave, quebrar_partes):
     # chave: satcomum.ersat.ChaveCFeSAT
     # quebrar_partes: list[int]
@@ -478,3 +661,22 @@ def _quebrar_chave(chave, quebrar_partes):
         partes.append(digitos[a:a+n])
         a += n
     return partes
+
+
+def _partes_code128(chave, conf):
+    # as partes da chave do CF-e, cada uma impressa em um Code128
+    if conf.truncar:
+        return [''.join(chave.partes())[:conf.truncar_tamanho]]
+    elif conf.quebrar:
+        return _quebrar_chave(chave, conf.quebrar_partes)
+    return chave.partes(1)
+
+
+def _codificar_code128(perfil, dados, parametros):
+    # obtém os bytes que a impressora enviaria ao dispositivo para imprimir o
+    # Code128, usando uma impressora equivalente que apenas captura escritas
+    # (e que, portanto, não precisa aguardar a impressão do código)
+    impressora = construir(perfil)
+    with sem_pausas(impressora):
+        impressora.code128(dados, **parametros)
+    return b''.join(impressora.device.dados)
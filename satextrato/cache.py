@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/cache.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+import logging
+import os
+import tempfile
+import threading
+import zlib
+
+from collections import OrderedDict
+
+
+logger = logging.getLogger('satextrato.cache')
+
+
+class LRU(object):
+    """Um mapeamento de tamanho limitado que, ao atingir o tamanho máximo,
+    descarta os itens usados há mais tempo. Pode ser compartilhado entre
+    *threads*.
+    """
+
+    def __init__(self, tamanho=128):
+        """Inicia uma instância de :class:`LRU`.
+
+        :param int tamanho: Opcional. Número máximo de itens mantidos.
+        """
+        super(LRU, self).__init__()
+        self.tamanho = tamanho
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    def obter(self, chave, padrao=None):
+        """Obtém o valor associado à chave ou ``padrao`` se a chave não
+        estiver presente. O item obtido passa a ser o usado mais recentemente.
+        """
+        with self._lock:
+            try:
+                valor = self._itens.pop(chave)
+            except KeyError:
+                return padrao
+            self._itens[chave] = valor
+            return valor
+
+    def armazenar(self, chave, valor):
+        """Associa o valor à chave, descartando o item usado há mais tempo se
+        o tamanho máximo for excedido.
+        """
+        with self._lock:
+            self._itens.pop(chave, None)
+            self._itens[chave] = valor
+            while len(self._itens) > self.tamanho:
+                self._itens.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+
+class CacheExtratos(object):
+    """Mantém os bytes dos extratos já renderizados, permitindo que uma
+    reimpressão (segunda via) seja feita sem processar o XML novamente.
+
+    Os extratos são mantidos em memória, em um cache de tamanho limitado, e,
+    opcionalmente, gravados em disco de forma compactada:
+
+    .. sourcecode:: python
+
+        cache = CacheExtratos(diretorio='/var/cache/satextrato')
+
+        if not cache.reimprimir(chave_cfe, impressora):
+            with open('CFe.xml', 'r') as fp:
+                cache.imprimir(ExtratoCFeVenda(fp, impressora))
+
+    As entradas do cache são identificadas pela chave do CF-e (atributo
+    ``Id`` do elemento ``infCFe``), pela indicação de extrato resumido,
+    pelas configurações e pelo perfil da impressora (modelo, recursos e
+    codificação de caracteres).
+
+    .. note::
+
+        Na reimpressão a partir do cache os bytes são enviados diretamente ao
+        dispositivo, sem as pausas que a impressora faz após imprimir códigos
+        de barras.
+
+    """
+
+    def __init__(self, tamanho=64, diretorio=None, nivel_compressao=6):
+        """Inicia uma instância de :class:`CacheExtratos`.
+
+        :param int tamanho: Opcional. Número máximo de extratos mantidos em
+            memória.
+
+        :param str diretorio: Opcional. Diretório onde os extratos serão
+            gravados de forma compactada. Se não informado, os extratos serão
+            mantidos apenas em memória.
+
+        :param int nivel_compressao: Opcional. Nível de compressão
+            (``zlib``) dos extratos gravados em disco.
+
+        """
+        super(CacheExtratos, self).__init__()
+        self._memoria = LRU(tamanho=tamanho)
+        self._diretorio = diretorio
+        self._nivel_compressao = nivel_compressao
+        if diretorio and not os.path.isdir(diretorio):
+            os.makedirs(diretorio)
+
+    def chave(self, chave_cfe, impressora, config=None, resumido=False):
+        """Calcula a chave da entrada do cache.
+
+        :param str chave_cfe: A chave do CF-e, conforme o atributo ``Id`` do
+            elemento ``infCFe`` (por exemplo, ``CFe3515080872...``).
+
+        :param impressora: A impressora onde o extrato será impresso.
+
+        :param config: Opcional. Uma instância de
+            :class:`satextrato.config.Configuracoes`. Se não informado,
+            serão consideradas as configurações padrão.
+
+        :param bool resumido: Opcional. Indica se trata-se do extrato
+            resumido do CF-e de venda.
+
+        :rtype: str
+        """
+        partes = [
+                chave_cfe,
+                'resumido' if resumido else 'completo',
+                _hash_configuracoes(config or _config_padrao()),
+                _perfil_impressora(impressora),
+            ]
+        return _sha1('|'.join(partes))
+
+    def obter(self, chave):
+        """Obtém os bytes do extrato associados à chave ou ``None``."""
+        dados = self._memoria.obter(chave)
+        if dados is None and self._diretorio:
+            dados = self._ler(chave)
+            if dados is not None:
+                self._memoria.armazenar(chave, dados)
+        return dados
+
+    def armazenar(self, chave, dados):
+        """Armazena os bytes do extrato associados à chave."""
+        self._memoria.armazenar(chave, dados)
+        if self._diretorio:
+            self._gravar(chave, dados)
+
+    def reimprimir(self, chave_cfe, impressora, config=None, resumido=False):
+        """Reimprime o extrato a partir do cache, sem processar o XML.
+
+        :returns: ``True`` se o extrato estava no cache e foi reimpresso ou
+            ``False`` caso contrário.
+
+        :rtype: bool
+        """
+        dados = self.obter(self.chave(
+                chave_cfe,
+                impressora,
+                config=config,
+                resumido=resumido
+            ))
+        if dados is None:
+            return False
+        impressora.device.write(dados)
+        return True
+
+    def imprimir(self, extrato):
+        """Imprime o extrato, renderizando-o e armazenando-o no cache se
+        ainda não estiver presente.
+
+        :param extrato: Uma instância de
+            :class:`~satextrato.venda.ExtratoCFeVenda` ou
+            :class:`~satextrato.cancelamento.ExtratoCFeCancelamento`.
+        """
+        impressora = extrato.impressora
+        chave = self.chave(
+                extrato.cfe.chave,
+                impressora,
+                config=extrato._config,
+                resumido=getattr(extrato, '_resumido', False)
+            )
+        dados = self.obter(chave)
+        if dados is None:
+            dados = extrato.renderizar().serializar(impressora)
+            self.armazenar(chave, dados)
+        impressora.device.write(dados)
+
+    def limpar(self):
+        """Descarta os extratos mantidos em memória."""
+        self._memoria.limpar()
+
+    def _arquivo(self, chave):
+        return os.path.join(self._diretorio, '{}.z'.format(chave))
+
+    def _ler(self, chave):
+        arquivo = self._arquivo(chave)
+        if not os.path.isfile(arquivo):
+            return None
+        try:
+            with io.open(arquivo, 'rb') as f:
+                return zlib.decompress(f.read())
+        except (IOError, OSError, zlib.error):
+            logger.exception('falha ao ler extrato do cache: %s', arquivo)
+            return None
+
+    def _gravar(self, chave, dados):
+        # o arquivo temporário é exclusivo, de modo que gravações
+        # simultâneas da mesma chave não se misturam
+        arquivo = self._arquivo(chave)
+        temporario = None
+        try:
+            descritor, temporario = tempfile.mkstemp(
+                    dir=self._diretorio,
+                    prefix='{}.'.format(chave),
+                    suffix='.tmp'
+                )
+            with io.open(descritor, 'wb') as f:
+                f.write(zlib.compress(dados, self._nivel_compressao))
+            _substituir(temporario, arquivo)
+        except (IOError, OSError):
+            logger.exception('falha ao gravar extrato no cache: %s', arquivo)
+            if temporario is not None:
+                _remover(temporario)
+
+
+def _substituir(origem, destino):
+    # substitui o arquivo de destino atomicamente; no Python 2 em Windows,
+    # onde os.rename falha se o destino existir, o destino é removido antes
+    substituir = getattr(os, 'replace', None)
+    if substituir is not None:
+        substituir(origem, destino)
+        return
+    try:
+        os.rename(origem, destino)
+    except OSError:
+        if not os.path.exists(destino):
+            raise
+        os.remove(destino)
+        os.rename(origem, destino)
+
+
+def _remover(arquivo):
+    try:
+        os.remove(arquivo)
+    except OSError:
+        pass
+
+
+def _hash_configuracoes(conf):
+    # as configurações são namedtuples de valores simples, cuja
+    # representação é estável entre execuções
+    return _sha1(repr(conf))
+
+
+def _sha1(texto):
+    import hashlib
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+
+def _config_padrao():
+    from .config import padrao
+    return padrao()
+
+
+def _perfil_impressora(impressora):
+    from .programa import _real
+    from .transliteracao import codificacao
+    impressora = _real(impressora)
+    features = sorted(
+            (repr(k), repr(v))
+            for k, v in impressora.hardware_features.items()
+        )
+    return repr((
+            impressora.__class__.__module__,
+            impressora.__class__.__name__,
+            impressora.encoding,
+            impressora.encoding_errors,
+            codificacao(impressora),
+            features,
+        ))
@@ -19,16 +19,15 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-import xml.etree.ElementTree as ET
-
 from datetime import datetime
-from decimal import Decimal
 
 import six
 
 from satcomum import br
 from satcomum import ersat
 
+from . import modelo
+from . import parser
 from .base import ExtratoCFe
 
 
@@ -58,8 +57,12 @@ class ExtratoCFeCancelamento(ExtratoCFe):
                 config=config
             )
         # (!) `self.root` mantém uma referência para o elemento `CFeCanc`
-        self._tree_venda = ET.parse(fp_venda)
+        self._tree_venda = parser.parse(fp_venda)
         self.root_venda = self._tree_venda.getroot()  # ref. elemento `CFe`
+        self.cfe_venda = modelo.extrair(self._tree_venda)
+
+    def _dados_qrcodes(self):
+        return [self.cfe_venda.dados_qrcode, self.cfe.dados_qrcode]
 
     def corpo(self):
         self.corpo_titulo()
@@ -85,11 +88,7 @@ class ExtratoCFeCancelamento(ExtratoCFe):
         self.negrito()
 
     def corpo_dados_consumidor(self):
-        documento = (
-                self.root.findtext('./infCFe/dest/CNPJ')
-                or self.root.findtext('./infCFe/dest/CPF')
-                or ''
-            )
+        documento = self.cfe.destinatario.documento
 
         if br.is_cnpjcpf(documento):
             self.normal()
@@ -106,20 +105,17 @@ class ExtratoCFeCancelamento(ExtratoCFe):
         self.normal()
         self.esquerda()
         self.negrito()
-        self.texto('TOTAL R$ {:n}'.format(
-                Decimal(self.root.findtext('./infCFe/total/vCFe'))))
+        self.texto('TOTAL R$ {:n}'.format(self.cfe.totais.vCFe))
         self.negrito()
 
     def corpo_dados_cfe_cancelado(self):
 
-        infCFe = self.root_venda.find('./infCFe')  # (!) infCFe da venda
-        sat_numero_serie = 'SAT no. {}'.format(
-                infCFe.findtext('ide/nserieSAT')
-            )
+        cfe = self.cfe_venda  # (!) CF-e da venda
+        sat_numero_serie = 'SAT no. {}'.format(cfe.ide.nserieSAT)
 
         datahora = datetime.strptime('{}{}'.format(
-                infCFe.findtext('ide/dEmi'),
-                infCFe.findtext('ide/hEmi')), '%Y%m%d%H%M%S')
+                cfe.ide.dEmi,
+                cfe.ide.hEmi), '%Y%m%d%H%M%S')
 
         datahora_emissao = datahora.strftime('%d/%m/%Y - %H:%M:%S')
         if six.PY2:
@@ -136,25 +132,19 @@ class ExtratoCFeCancelamento(ExtratoCFe):
         self.texto(datahora_emissao)
         self.avanco()
 
-        self.chave_cfe_code128(ersat.ChaveCFeSAT(infCFe.attrib['Id']))
+        self.chave_cfe_code128(ersat.ChaveCFeSAT(cfe.chave))
         self.avanco()
 
         self.centro()
-        self.impressora.qrcode(
-                ersat.dados_qrcode(self._tree_venda),
-                qrcode_module_size=self._config.qrcode.tamanho_modulo,
-                qrcode_ecc_level=self._config.qrcode.nivel_correcao
-            )
+        self.qrcode(cfe.dados_qrcode)
 
     def rodape(self):
-        infCFe = self.root.find('./infCFe')  # (!) infCFe do cancelamento
-        sat_numero_serie = 'SAT no. {}'.format(
-                infCFe.findtext('ide/nserieSAT')
-            )
+        cfe = self.cfe  # (!) CF-e do cancelamento
+        sat_numero_serie = 'SAT no. {}'.format(cfe.ide.nserieSAT)
 
         datahora = datetime.strptime('{}{}'.format(
-                infCFe.findtext('ide/dEmi'),
-                infCFe.findtext('ide/hEmi')), '%Y%m%d%H%M%S')
+                cfe.ide.dEmi,
+                cfe.ide.hEmi), '%Y%m%d%H%M%S')
 
         datahora_emissao = datahora.strftime('%d/%m/%Y - %H:%M:%S')
         if six.PY2:
@@ -172,14 +162,10 @@ class ExtratoCFeCancelamento(ExtratoCFe):
         self.texto(datahora_emissao)
         self.avanco()
 
-        self.chave_cfe_code128(ersat.ChaveCFeSAT(infCFe.attrib['Id']))
+        self.chave_cfe_code128(ersat.ChaveCFeSAT(cfe.chave))
         self.avanco()
 
         self.centro()
-        self.impressora.qrcode(
-                ersat.dados_qrcode(self._tree),
-                qrcode_module_size=self._config.qrcode.tamanho_modulo,
-                qrcode_ecc_level=self._config.qrcode.nivel_correcao
-            )
+        self.qrcode(cfe.dados_qrcode)
 
         self.qrcode_mensagem()
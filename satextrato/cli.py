@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/cli.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Programa de linha de comando que imprime os extratos de um ou mais CF-e:
+
+.. sourcecode:: shell
+
+    $ satextrato --conexao network:10.0.0.101:9100 CFe3515*.xml
+    $ satextrato --conexao serial:/dev/ttyS0:9600,8,1,N --modelo epson.TMT20 \\
+        2026-09/
+    $ find 2026-09 -name '*.xml' | satextrato --conexao file:/dev/usb/lp0 -
+
+Os documentos podem ser informados como caminhos de arquivos, padrões
+(*globs*) ou diretórios (cujos arquivos ``.xml`` são impressos, em ordem
+alfabética, incluindo os subdiretórios). Se o documento for ``-``, é lido da
+entrada padrão um documento XML ou, então, uma lista de documentos, um por
+linha.
+
+O tipo de cada documento é identificado pelo próprio conteúdo. O extrato de
+um CF-e de cancelamento requer o CF-e de venda, que é procurado entre os
+documentos informados ou, então, no mesmo diretório do CF-e de cancelamento,
+em um arquivo nomeado pela chave do CF-e de venda (por exemplo,
+``CFe35150808723218000186599000040190000241114257.xml``).
+
+A conexão com a impressora é aberta uma única vez e mantida durante toda a
+impressão (veja :class:`satextrato.conexoes.PoolImpressoras`). O tempo de
+impressão de cada extrato é informado na saída padrão; as falhas, na saída
+de erros. O programa termina com código de saída ``1`` se algum extrato não
+puder ser impresso.
+"""
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import argparse
+import glob
+import importlib
+import io
+import os
+import sys
+
+from collections import namedtuple
+from timeit import default_timer
+
+import six
+
+from decouple import config as getenv
+
+from . import __version__
+from . import lote
+from . import parser
+from .conexoes import PoolImpressoras
+
+
+SATEXTRATO_CONEXAO = 'SATEXTRATO_CONEXAO'
+"""
+Variável de ambiente que determina a conexão com a impressora, quando não
+informada na linha de comando (por exemplo, ``network:10.0.0.101:9100``).
+"""
+
+SATEXTRATO_MODELO = 'SATEXTRATO_MODELO'
+"""
+Variável de ambiente que determina o modelo da impressora, quando não
+informado na linha de comando. O padrão é :attr:`DEFAULT_MODELO`.
+"""
+
+DEFAULT_MODELO = 'epson.GenericESCPOS'
+
+ENTRADA_PADRAO = '-'
+
+VENDA = 'venda'
+CANCELAMENTO = 'cancelamento'
+
+_IMPRESSORA = 'satextrato'  # nome da impressora no pool
+
+
+Documento = namedtuple('Documento', [
+        'nome',  # str, o caminho do arquivo ou '<stdin>'
+        'conteudo',  # str ou bytes, veja satextrato.lote
+        'chave',  # str, atributo `Id` de `infCFe`
+        'chave_venda',  # str ou None, atributo `chCanc` de `infCFe`
+    ])
+
+
+def identificar(nome, conteudo):
+    """Identifica o CF-e, lendo apenas o início do documento.
+
+    :param str nome: Nome do documento, usado nas mensagens.
+
+    :param conteudo: O caminho para o arquivo XML ou o próprio conteúdo XML
+        (``bytes``).
+
+    :raises ValueError: Se o documento não for um CF-e.
+
+    :rtype: Documento
+    """
+    if _xml(conteudo):
+        fp = io.BytesIO(conteudo)
+    else:
+        fp = io.open(conteudo, 'rb')
+    with fp:
+        for _, elemento in parser.iterparse(fp, events=('start',)):
+            if elemento.tag.rsplit('}', 1)[-1] == 'infCFe':
+                return Documento(
+                        nome=nome,
+                        conteudo=conteudo,
+                        chave=elemento.get('Id'),
+                        chave_venda=elemento.get('chCanc')
+                    )
+    raise ValueError('Documento nao e um CF-e: {}'.format(nome))
+
+
+def documentos(entradas, stdin=None):
+    """Expande as entradas (caminhos, padrões, diretórios ou ``-``) nos
+    documentos a serem impressos.
+
+    :param stdin: Opcional. Um objeto *file-like* binário, lido quando a
+        entrada for ``-``. O padrão é a entrada padrão.
+
+    :returns: Um gerador que produz tuplas ``(nome, conteudo)``, onde o
+        conteúdo é o caminho para o arquivo ou o próprio conteúdo XML.
+    """
+    for entrada in entradas:
+        if entrada != ENTRADA_PADRAO:
+            for caminho in _expandir(entrada):
+                yield caminho, caminho
+            continue
+        fp = stdin or _stdin()
+        linha = fp.readline()
+        while linha and not linha.strip():
+            linha = fp.readline()
+        if linha.lstrip().startswith(b'<'):
+            yield '<stdin>', linha + fp.read()
+            continue
+        while linha:
+            caminho = linha.strip().decode(sys.getfilesystemencoding())
+            if caminho:
+                for expandido in _expandir(caminho):
+                    yield expandido, expandido
+            linha = fp.readline()
+
+
+def main(argv=None):
+    argumentos = _argumentos().parse_args(argv)
+    if not argumentos.conexao:
+        _argumentos().error(
+                'a conexao deve ser informada (--conexao ou variavel de '
+                'ambiente {})'.format(SATEXTRATO_CONEXAO)
+            )
+
+    fabrica = _fabrica(argumentos.conexao, argumentos.modelo)
+
+    conf = None
+    if argumentos.config:
+        from . import config
+        conf = config.carregar(arquivo=argumentos.config)
+
+    # os documentos são identificados antes da impressão para que os CF-e
+    # de venda informados possam ser encontrados pelos de cancelamento
+    identificados = []
+    for nome, conteudo in documentos(argumentos.documentos):
+        try:
+            identificados.append(identificar(nome, conteudo))
+        except Exception as erro:
+            identificados.append((nome, erro))
+
+    vendas = dict(
+            (documento.chave, documento.conteudo)
+            for documento in identificados
+            if isinstance(documento, Documento)
+            and not documento.chave_venda
+        )
+
+    pool = PoolImpressoras()
+    pool.registrar(_IMPRESSORA, fabrica)
+
+    impressos = 0
+    falhas = 0
+    decorrido = 0.0
+    try:
+        for documento in identificados:
+            if not isinstance(documento, Documento):
+                nome, erro = documento
+                tipo = '?'
+            else:
+                nome, erro = documento.nome, None
+                tipo = CANCELAMENTO if documento.chave_venda else VENDA
+                inicio = default_timer()
+                try:
+                    _imprimir(pool, documento, vendas, conf, argumentos)
+                except Exception as falha:
+                    erro = falha
+                tempo = default_timer() - inicio
+                decorrido += tempo
+
+            if erro is not None:
+                falhas += 1
+                print('falha {:<12} {}: {}'.format(tipo, nome, erro),
+                      file=sys.stderr)
+                if argumentos.parar:
+                    break
+                continue
+
+            impressos += 1
+            print('{:>9.1f} ms {:<12} {}'.format(tempo * 1000, tipo, nome))
+    finally:
+        pool.encerrar()
+
+    print('{} extrato(s) impresso(s), {} falha(s), em {:.2f} s{}'.format(
+            impressos,
+            falhas,
+            decorrido,
+            ' (media {:.1f} ms)'.format(decorrido * 1000 / impressos)
+            if impressos else ''
+        ))
+    return 1 if falhas else 0
+
+
+def _imprimir(pool, documento, vendas, conf, argumentos):
+    # os arquivos são lidos antes do empréstimo, pois uma falha de leitura
+    # (IOError) faria o pool descartar a conexão com a impressora
+    tarefa = _ler(documento.conteudo)
+    if documento.chave_venda:
+        tarefa = (_ler(_venda(documento, vendas)), tarefa)
+    with pool.emprestar(_IMPRESSORA) as impressora:
+        extrato = lote.carregar(
+                tarefa,
+                impressora,
+                config=conf,
+                resumido=argumentos.resumido
+            )
+        extrato.imprimir()
+
+
+def _ler(conteudo):
+    if _xml(conteudo):
+        return conteudo
+    with io.open(conteudo, 'rb') as fp:
+        return fp.read()
+
+
+def _venda(documento, vendas):
+    venda = vendas.get(documento.chave_venda)
+    if venda is not None:
+        return venda
+    diretorio = '' if _xml(documento.conteudo) else (
+            os.path.dirname(documento.conteudo))
+    caminho = os.path.join(diretorio, '{}.xml'.format(documento.chave_venda))
+    if os.path.isfile(caminho):
+        return caminho
+    raise ValueError(
+            'CF-e de venda nao encontrado: {}'.format(documento.chave_venda)
+        )
+
+
+def _expandir(entrada):
+    if os.path.isdir(entrada):
+        for raiz, diretorios, arquivos in os.walk(entrada):
+            diretorios.sort()
+            for nome in sorted(arquivos):
+                if nome.lower().endswith('.xml'):
+                    yield os.path.join(raiz, nome)
+    elif any(caractere in entrada for caractere in '*?['):
+        caminhos = sorted(glob.glob(entrada))
+        for caminho in caminhos:
+            yield caminho
+        if not caminhos:
+            yield entrada  # resulta em arquivo não encontrado
+    else:
+        yield entrada
+
+
+def _xml(conteudo):
+    # caminhos também são bytes no Python 2 (veja satextrato.lote._abrir)
+    return (
+            isinstance(conteudo, six.binary_type)
+            and conteudo.lstrip().startswith(b'<')
+        )
+
+
+def _stdin():
+    return getattr(sys.stdin, 'buffer', sys.stdin)
+
+
+def _fabrica(conexao, modelo):
+    from escpos.conn import CONNECTION_TYPES
+
+    tipo, _, parametros = conexao.partition(':')
+    tipos = dict(CONNECTION_TYPES)
+    if tipo not in tipos:
+        _argumentos().error('tipo de conexao desconhecido: {!r} ({})'.format(
+                tipo, ', '.join(sorted(tipos))))
+
+    nome_modulo, _, nome_classe = modelo.rpartition('.')
+    try:
+        modulo = importlib.import_module('escpos.impl.{}'.format(nome_modulo))
+        classe = getattr(modulo, nome_classe)
+    except (ImportError, AttributeError, ValueError):
+        _argumentos().error('modelo desconhecido: {!r}'.format(modelo))
+
+    def criar():
+        impressora = classe(tipos[tipo].type.create(parametros))
+        impressora.init()
+        return impressora
+
+    return criar
+
+
+def _argumentos():
+    argumentos = argparse.ArgumentParser(
+            prog='satextrato',
+            description='Imprime os extratos de documentos CF-e-SAT.'
+        )
+    argumentos.add_argument(
+            'documentos',
+            nargs='+',
+            metavar='DOCUMENTO',
+            help='arquivos XML, padroes, diretorios ou - para ler da '
+                 'entrada padrao'
+        )
+    argumentos.add_argument(
+            '-c', '--conexao',
+            default=getenv(SATEXTRATO_CONEXAO, default=''),
+            help='conexao com a impressora, como TIPO:CONFIGURACAO '
+                 '(por exemplo, network:10.0.0.101:9100, '
+                 'serial:/dev/ttyS0:9600,8,1,N ou file:/dev/usb/lp0)'
+        )
+    argumentos.add_argument(
+            '-m', '--modelo',
+            default=getenv(SATEXTRATO_MODELO, default=DEFAULT_MODELO),
+            help='modelo da impressora, como MODULO.CLASSE de escpos.impl '
+                 '(padrao: {})'.format(DEFAULT_MODELO)
+        )
+    argumentos.add_argument(
+            '--config',
+            metavar='ARQUIVO',
+            help='arquivo de configuracoes do extrato'
+        )
+    argumentos.add_argument(
+            '--resumido',
+            action='store_true',
+            help='imprime os extratos de venda resumidos'
+        )
+    argumentos.add_argument(
+            '--parar',
+            action='store_true',
+            help='interrompe a impressao na primeira falha'
+        )
+    argumentos.add_argument(
+            '--version',
+            action='version',
+            version='%(prog)s {}'.format(__version__)
+        )
+    return argumentos
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/conexoes.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Mantém as impressoras (e suas conexões) abertas entre uma impressão e outra,
+evitando o custo de conectar à impressora a cada extrato:
+
+.. sourcecode:: python
+
+    from escpos import NetworkConnection
+    from escpos.impl.epson import GenericESCPOS
+
+    from satextrato import ExtratoCFeVenda
+    from satextrato.conexoes import PoolImpressoras
+
+    def caixa_1():
+        conn = NetworkConnection.create('10.0.0.101:9100')
+        return GenericESCPOS(conn)
+
+    pool = PoolImpressoras()
+    pool.registrar('caixa-1', caixa_1)
+
+    with pool.emprestar('caixa-1') as impressora:
+        ExtratoCFeVenda(fp, impressora).imprimir()
+
+Cada impressora emprestada é de uso exclusivo de quem a obteve até que seja
+devolvida, ao final do bloco ``with``. Se ocorrer uma falha de comunicação
+com o dispositivo durante o empréstimo (``IOError``, ``OSError`` ou uma das
+exceções de conexão da PyESCPOS), a impressora é descartada (sua conexão é
+fechada) e uma nova impressora será criada no próximo empréstimo. Qualquer
+outra exceção (por exemplo, um documento XML inválido) é propagada e a
+impressora é devolvida normalmente.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import logging
+import threading
+import time
+
+from contextlib import contextmanager
+
+
+logger = logging.getLogger('satextrato.conexoes')
+
+
+class _Grupo(object):
+    # impressoras criadas por uma mesma fábrica
+
+    def __init__(self, fabrica, tamanho, tempo_ocioso):
+        self.fabrica = fabrica
+        self.tamanho = tamanho
+        self.tempo_ocioso = tempo_ocioso
+        self.livres = []  # [(impressora, devolvida_em), ...]
+        self.criadas = 0  # inclui as emprestadas
+        self.condicao = threading.Condition()
+
+
+class PoolImpressoras(object):
+    """Mantém, para cada nome registrado, um conjunto de impressoras com
+    conexões abertas que são emprestadas com exclusividade.
+    """
+
+    def __init__(self):
+        super(PoolImpressoras, self).__init__()
+        self._grupos = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, nome, fabrica, tamanho=1, tempo_ocioso=None):
+        """Registra uma fábrica de impressoras.
+
+        :param str nome: Nome que identifica a impressora no *pool*.
+
+        :param fabrica: Um *callable* sem argumentos que cria e retorna uma
+            nova impressora, já conectada ao dispositivo. As impressoras são
+            criadas apenas quando necessário.
+
+        :param int tamanho: Opcional. Número máximo de impressoras criadas
+            para este nome. Para a maioria dos dispositivos (serial, USB) faz
+            sentido apenas uma conexão por equipamento.
+
+        :param float tempo_ocioso: Opcional. Tempo, em segundos, após o qual
+            uma impressora ociosa é descartada e substituída por uma nova no
+            próximo empréstimo (útil quando a impressora ou a rede encerram
+            conexões ociosas).
+
+        :raises ValueError: Se já houver uma fábrica com o mesmo nome.
+        """
+        with self._lock:
+            if nome in self._grupos:
+                raise ValueError(
+                        'Impressora ja registrada: {!r}'.format(nome)
+                    )
+            self._grupos[nome] = _Grupo(fabrica, tamanho, tempo_ocioso)
+
+    @contextmanager
+    def emprestar(self, nome, timeout=None):
+        """Empresta uma impressora, aguardando até que uma esteja disponível.
+
+        :param str nome: Nome da impressora.
+
+        :param float timeout: Opcional. Tempo máximo, em segundos, para
+            aguardar por uma impressora disponível.
+
+        :raises RuntimeError: Se o tempo limite for atingido.
+        """
+        grupo = self._grupo(nome)
+        impressora = self._obter(grupo, nome, timeout)
+        try:
+            yield impressora
+        except _erros_dispositivo():
+            logger.warning(
+                    'impressora %r descartada apos falha durante o '
+                    'emprestimo',
+                    nome,
+                    exc_info=True
+                )
+            self._descartar(grupo, impressora)
+            raise
+        except BaseException:
+            self._devolver(grupo, impressora)
+            raise
+        else:
+            self._devolver(grupo, impressora)
+
+    def encerrar(self):
+        """Fecha as conexões das impressoras que não estejam emprestadas."""
+        with self._lock:
+            grupos = list(self._grupos.values())
+        for grupo in grupos:
+            with grupo.condicao:
+                livres = grupo.livres
+                grupo.livres = []
+                grupo.criadas -= len(livres)
+                grupo.condicao.notify_all()
+            for impressora, _ in livres:
+                _fechar(impressora)
+
+    def _grupo(self, nome):
+        try:
+            return self._grupos[nome]
+        except KeyError:
+            raise ValueError('Impressora desconhecida: {!r}'.format(nome))
+
+    def _obter(self, grupo, nome, timeout):
+        limite = None if timeout is None else time.time() + timeout
+        ociosa = None
+        with grupo.condicao:
+            while not grupo.livres and grupo.criadas >= grupo.tamanho:
+                restante = None if limite is None else limite - time.time()
+                if restante is not None and restante <= 0:
+                    raise RuntimeError(
+                            'Tempo esgotado aguardando pela impressora '
+                            '{!r}'.format(nome)
+                        )
+                grupo.condicao.wait(restante)
+            if grupo.livres:
+                impressora, devolvida_em = grupo.livres.pop()
+                if (grupo.tempo_ocioso is None
+                        or time.time() - devolvida_em <= grupo.tempo_ocioso):
+                    return impressora
+                ociosa = impressora
+            else:
+                grupo.criadas += 1  # reserva o lugar da nova impressora
+
+        if ociosa is not None:
+            _fechar(ociosa)
+
+        try:
+            return grupo.fabrica()
+        except BaseException:
+            with grupo.condicao:
+                grupo.criadas -= 1
+                grupo.condicao.notify()
+            raise
+
+    def _devolver(self, grupo, impressora):
+        with grupo.condicao:
+            grupo.livres.append((impressora, time.time()))
+            grupo.condicao.notify()
+
+    def _descartar(self, grupo, impressora):
+        with grupo.condicao:
+            grupo.criadas -= 1
+            grupo.condicao.notify()
+        _fechar(impressora)
+
+
+_ERROS_DISPOSITIVO = None
+
+
+def _erros_dispositivo():
+    # exceções que indicam falha na comunicação com o dispositivo, após as
+    # quais a conexão não deve ser reaproveitada; obtidas apenas quando
+    # necessário, para não importar a PyESCPOS junto com este módulo
+    global _ERROS_DISPOSITIVO
+    if _ERROS_DISPOSITIVO is None:
+        from escpos import exceptions
+        from escpos.conn.bt import BluetoothConnectionError
+        _ERROS_DISPOSITIVO = (
+                IOError,
+                OSError,
+                BluetoothConnectionError,
+                exceptions.NonReadableSocketError,
+                exceptions.NonWritableSocketError,
+                exceptions.TimeoutException,
+            )
+    return _ERROS_DISPOSITIVO
+
+
+def _fechar(impressora):
+    # as conexões da PyESCPOS não têm uma interface comum para encerramento
+    device = getattr(impressora, 'device', None)
+    for metodo in ('release', 'close'):
+        if hasattr(device, metodo):
+            try:
+                getattr(device, metodo)()
+            except Exception:
+                logger.debug('falha ao fechar conexao', exc_info=True)
+            break
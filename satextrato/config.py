@@ -21,24 +21,15 @@ from __future__ import unicode_literals
 
 import io
 import os
+import threading
 
 from collections import namedtuple
 from contextlib import contextmanager
 
-try:
-    # http://python-future.org/compatible_idioms.html#configparser
-    # Python 2 and 3 (after ``pip install configparser``)
-    from configparser import ConfigParser
-except ImportError:
-    # fallback to Python 2 SafeConfigParser module
-    from ConfigParser import SafeConfigParser as ConfigParser
-
 import six
 
 from decouple import config as getenv
 
-from unidecode import unidecode
-
 
 SATEXTRATO_CONFIG_DIR = 'SATEXTRATO_CONFIG_DIR'
 """
@@ -87,6 +78,26 @@ Variável de ambiente que determina o nome da seção que contém as configuraç
 do QRCode. Veja :class:`QRCode`. O padrão é :attr:`DEFAULT_SECAO_QRCODE`.
 """
 
+SATEXTRATO_PRESERVAR_ACENTOS = 'SATEXTRATO_PRESERVAR_ACENTOS'
+"""
+Variável de ambiente que determina se os caracteres acentuados deverão ser
+preservados, em vez de transliterados para ASCII, quando a codificação de
+caracteres da impressora os suportar (por exemplo, ``cp850`` ou ``cp860``).
+O padrão é ``False``. Veja :mod:`satextrato.transliteracao`.
+
+A impressora deverá estar configurada para a página de código
+correspondente à sua codificação de caracteres.
+"""
+
+SATEXTRATO_XML_PARSER = 'SATEXTRATO_XML_PARSER'
+"""
+Variável de ambiente que determina a implementação usada para interpretar os
+documentos XML dos CF-e. Pode ser ``lxml``, ``etree`` (a implementação
+``xml.etree.ElementTree`` da biblioteca padrão) ou ``auto``, que usará
+``lxml`` se estiver instalada. O padrão é :attr:`DEFAULT_XML_PARSER`.
+Veja :mod:`satextrato.parser`.
+"""
+
 DEFAULT_FILENAME = 'satextrato.ini'
 """Nome padrão do arquivo de configurações."""
 
@@ -102,6 +113,9 @@ DEFAULT_SECAO_CODE128 = 'code128'
 DEFAULT_SECAO_QRCODE = 'qrcode'
 """Nome padrão da seção de configurações do QRCode."""
 
+DEFAULT_XML_PARSER = 'auto'
+"""Implementação padrão para interpretação dos documentos XML."""
+
 
 _TAMANHO_CHAVE_CFESAT = 44
 
@@ -146,10 +160,14 @@ Configuracoes = namedtuple('Configuracoes', [
     ])
 
 
+_carregadas = {}
+_geracao = 0
+_lock = threading.Lock()
+
+
 @contextmanager
 def fopen(filename_or_file_pointer, *args, **kwargs):
-    from past.builtins import basestring
-    if isinstance(filename_or_file_pointer, basestring):
+    if isinstance(filename_or_file_pointer, six.string_types):
         if six.PY2:
             import codecs
             with codecs.open(filename_or_file_pointer, *args, **kwargs) as fp:
@@ -167,11 +185,18 @@ def carregar(
         secao_rodape=None,
         secao_code128=None,
         secao_qrcode=None,
-        encoding='utf-8'
+        encoding='utf-8',
+        verificar=True
         ):
     """
     Carrega as configurações do extrato do CF-e-SAT.
 
+    As configurações carregadas de um arquivo são mantidas em memória e a
+    mesma instância (imutável) é retornada nas próximas chamadas, com os
+    mesmos argumentos, até que o arquivo seja alterado (o que é detectado
+    pela data de modificação e pelo tamanho do arquivo) ou que as
+    configurações sejam invalidadas (veja :func:`invalidar`).
+
     :param str arquivo: Opcional. Caminho completo para o arquivo de
         onde serão carregadas as configurações. O arquivo será interpretado
         pela classe ``ConfigParser`` da biblioteca padrão.
@@ -194,33 +219,192 @@ def carregar(
         propriedades associadas ao QRCode que é impresso no extrato.
         Veja :attr:`QRCode`.
 
+    :param bool verificar: Opcional. Indica se o arquivo deverá ser
+        verificado para detectar alterações (o padrão é ``True``). Se for
+        ``False``, as configurações em memória são retornadas sem qualquer
+        acesso ao disco, até que sejam invalidadas, por exemplo, por um
+        :class:`Observador` ou por um sinal (veja
+        :func:`recarregar_com_sinal`).
+
     :rtype: satextrato.config.Configuracoes
 
     """
-    from past.builtins import basestring
+    if arquivo and not isinstance(arquivo, six.string_types):
+        # um file-like, cujo conteúdo é sempre lido
+        return _ler(
+                arquivo,
+                secao_cupom,
+                secao_rodape,
+                secao_code128,
+                secao_qrcode,
+                encoding
+            )
 
-    arquivo = arquivo or _default_config_filename()
+    # o caminho e as seções são resolvidos antes, pois podem depender das
+    # variáveis de ambiente (sem criar o diretório padrão, veja abaixo)
+    caminho = arquivo or _default_config_filename(criar=False)
+    secao_cupom, secao_rodape, secao_code128, secao_qrcode = _secoes(
+            secao_cupom,
+            secao_rodape,
+            secao_code128,
+            secao_qrcode
+        )
 
-    if isinstance(arquivo, basestring):
-        # se `arquivo` for uma string (nome de arquivo) e esse arquivo
-        # ainda não existir, cria o arquivo com as configurações padrão
-        if not os.path.isfile(arquivo):
-            conf = padrao()
-            salvar(
-                    conf,
-                    arquivo=arquivo,
-                    secao_cupom=secao_cupom,
-                    secao_rodape=secao_rodape,
-                    secao_code128=secao_code128,
-                    secao_qrcode=secao_qrcode,
-                    encoding=encoding
-                )
+    chave = (
+            caminho,
+            secao_cupom,
+            secao_rodape,
+            secao_code128,
+            secao_qrcode,
+            encoding,
+        )
+    geracao = _geracao
+    with _lock:
+        carregada = _carregadas.get(chave)
+
+    if carregada is not None and carregada[0] == geracao:
+        _, assinatura, conf = carregada
+        if not verificar or _assinatura(caminho) == assinatura:
             return conf
 
-    # neste ponto, `arquivo` existe (se for uma string contendo um nome
-    # de arquivo) ou é um file-like de onde as configurações devem ser
-    # carregadas
-    parser = ConfigParser()
+    if not os.path.isfile(caminho):
+        # o arquivo ainda não existe; cria com as configurações padrão
+        if not arquivo:
+            _config_dir()
+        conf = padrao()
+        salvar(
+                conf,
+                arquivo=caminho,
+                secao_cupom=secao_cupom,
+                secao_rodape=secao_rodape,
+                secao_code128=secao_code128,
+                secao_qrcode=secao_qrcode,
+                encoding=encoding
+            )
+    else:
+        conf = _ler(
+                caminho,
+                secao_cupom,
+                secao_rodape,
+                secao_code128,
+                secao_qrcode,
+                encoding
+            )
+
+    with _lock:
+        _carregadas[chave] = (geracao, _assinatura(caminho), conf)
+
+    return conf
+
+
+def invalidar():
+    """Invalida as configurações mantidas em memória por :func:`carregar`,
+    que serão lidas novamente dos arquivos na próxima chamada.
+
+    Pode ser invocada a partir de um tratador de sinais.
+    """
+    global _geracao
+    _geracao += 1
+
+
+def recarregar_com_sinal(sinal=None):
+    """Instala um tratador para o sinal indicado que invalida as
+    configurações mantidas em memória (veja :func:`invalidar`), de modo que
+    um processo de longa duração, como um *spooler*, possa ser instruído a
+    recarregar as configurações:
+
+    .. sourcecode:: shell
+
+        $ kill -HUP <pid>
+
+    Deve ser invocada a partir da *thread* principal.
+
+    :param int sinal: Opcional. O sinal a ser tratado. O padrão é
+        ``signal.SIGHUP`` (indisponível no Windows).
+
+    :returns: O tratador que estava instalado anteriormente.
+    """
+    import signal
+    if sinal is None:
+        sinal = signal.SIGHUP
+    return signal.signal(sinal, lambda numero, quadro: invalidar())
+
+
+class Observador(object):
+    """Observa o arquivo de configurações, em uma *thread*, invalidando as
+    configurações mantidas em memória quando o arquivo for alterado. É útil
+    quando as configurações são carregadas sem verificação do arquivo
+    (veja o argumento ``verificar`` de :func:`carregar`):
+
+    .. sourcecode:: python
+
+        observador = Observador()
+        observador.iniciar()
+        ...
+        conf = config.carregar(verificar=False)
+
+    :param str arquivo: Opcional. Caminho completo para o arquivo de
+        configurações. Se não informado, será o arquivo padrão.
+
+    :param float intervalo: Opcional. Intervalo entre as verificações do
+        arquivo, em segundos.
+    """
+
+    def __init__(self, arquivo=None, intervalo=2.0):
+        super(Observador, self).__init__()
+        self.arquivo = arquivo or _default_config_filename()
+        self.intervalo = intervalo
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        """Inicia a observação do arquivo."""
+        if self._thread is None:
+            self._parar.clear()
+            self._thread = threading.Thread(
+                    target=self._observar,
+                    args=(_assinatura(self.arquivo),),
+                    name='satextrato-config'
+                )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def parar(self):
+        """Encerra a observação do arquivo."""
+        if self._thread is not None:
+            self._parar.set()
+            self._thread.join()
+            self._thread = None
+
+    def _observar(self, assinatura):
+        while not self._parar.wait(self.intervalo):
+            atual = _assinatura(self.arquivo)
+            if atual != assinatura:
+                assinatura = atual
+                invalidar()
+
+
+def _assinatura(caminho):
+    # identifica o estado do arquivo sem lê-lo; None se não existir
+    try:
+        estado = os.stat(caminho)
+    except OSError:
+        return None
+    return (
+            getattr(estado, 'st_mtime_ns', estado.st_mtime),
+            estado.st_size,
+            estado.st_ino,
+        )
+
+
+def _ler(
+        arquivo,
+        secao_cupom,
+        secao_rodape,
+        secao_code128,
+        secao_qrcode,
+        encoding):
+    parser = _config_parser()
 
     with fopen(arquivo, 'r', encoding=encoding) as f:
         if hasattr(parser, 'read_file'):
@@ -358,7 +542,7 @@ def salvar(
         este argumento será ignorado.
 
     """
-    parser = ConfigParser()
+    parser = _config_parser()
 
     secao_cupom = secao_cupom or getenv(
             SATEXTRATO_SECAO_CUPOM,
@@ -564,7 +748,9 @@ class _SectionHelper(object):
     def _set(self, option_name, value):
         if not self._parser.has_section(self._section_name):
             self._parser.add_section(self._section_name)
-        value = unidecode(value) if self._unidecode_values else value
+        if self._unidecode_values:
+            from unidecode import unidecode
+            value = unidecode(value)
         return self._parser.set(self._section_name, option_name, value)
 
     def set(self, option_name):
@@ -582,10 +768,10 @@ class _SectionHelper(object):
         return self._parser.set(self._section_name, option_name, value)
 
 
-def _config_dir():
+def _config_dir(criar=True):
     default_path = os.path.join(os.path.expanduser('~'), '.satextrato')
     path = getenv(SATEXTRATO_CONFIG_DIR, default=default_path)
-    if not os.path.isdir(path):
+    if criar and not os.path.isdir(path):
         os.makedirs(path)
     return path
 
@@ -594,5 +780,38 @@ def _config_filename():
     return getenv(SATEXTRATO_CONFIG_FILENAME, default=DEFAULT_FILENAME)
 
 
-def _default_config_filename():
-    return os.path.join(_config_dir(), _config_filename())
+def _config_parser():
+    try:
+        # http://python-future.org/compatible_idioms.html#configparser
+        # Python 2 and 3 (after ``pip install configparser``)
+        from configparser import ConfigParser
+    except ImportError:
+        # fallback to Python 2 SafeConfigParser module
+        from ConfigParser import SafeConfigParser as ConfigParser
+    return ConfigParser()
+
+
+def _default_config_filename(criar=True):
+    return os.path.join(_config_dir(criar=criar), _config_filename())
+
+
+def _secoes(secao_cupom, secao_rodape, secao_code128, secao_qrcode):
+    # nomes efetivos das seções, considerando as variáveis de ambiente
+    return (
+            secao_cupom or getenv(
+                SATEXTRATO_SECAO_CUPOM,
+                default=DEFAULT_SECAO_CUPOM
+            ),
+            secao_rodape or getenv(
+                SATEXTRATO_SECAO_RODAPE,
+                default=DEFAULT_SECAO_RODAPE
+            ),
+            secao_code128 or getenv(
+                SATEXTRATO_SECAO_CODE128,
+                default=DEFAULT_SECAO_CODE128
+            ),
+            secao_qrcode or getenv(
+                SATEXTRATO_SECAO_QRCODE,
+                default=DEFAULT_SECAO_QRCODE
+            ),
+        )
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/consumo.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Contabilização do papel e estimativa do tempo de impressão dos extratos.
+
+Cada impressão (veja :meth:`~satextrato.base.ExtratoCFe.imprimir`) deixa no
+atributo ``contagem`` do extrato uma instância de :class:`Contagem`, com o
+número de linhas, avanços de linha, linhas de pontos dos códigos de barras e
+módulos dos QRCodes emitidos. O comprimento de papel e a duração da impressão
+podem ser estimados, antes mesmo de imprimir, a partir de um modelo de
+velocidade da impressora (:class:`ModeloVelocidade`):
+
+.. sourcecode:: python
+
+    from satextrato import consumo
+
+    impressora = GenericESCPOS(conn, features={
+            consumo.MODELO_VELOCIDADE: consumo.ModeloVelocidade(
+                velocidade=250, altura_linha=3.75),
+        })
+
+    extrato = ExtratoCFeVenda(fp, impressora)
+    estimativa = extrato.estimar()  # nada é impresso
+    print(estimativa.comprimento, estimativa.duracao)
+
+Se a impressora não indicar o recurso :data:`MODELO_VELOCIDADE`, será usado
+o modelo :data:`MODELO_PADRAO`, típico de impressoras térmicas de 203 dpi.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import bisect
+
+from collections import OrderedDict
+from collections import namedtuple
+
+import six
+
+
+MODELO_VELOCIDADE = 'satextrato-modelo-velocidade'
+"""
+Recurso da impressora (veja ``hardware_features`` da PyESCPOS) cujo valor é
+uma instância de :class:`ModeloVelocidade`, usada para estimar o consumo de
+papel e a duração da impressão.
+"""
+
+
+ModeloVelocidade = namedtuple('ModeloVelocidade', [
+        'velocidade',  # float, velocidade de impressão em mm/s
+        'altura_linha',  # float, altura de uma linha de texto em mm
+        'altura_ponto',  # float, altura de uma linha de pontos em mm
+        'tempo_corte',  # float, duração do corte do papel em segundos
+    ])
+
+
+MODELO_PADRAO = ModeloVelocidade(
+        velocidade=150.0,
+        altura_linha=3.75,  # 30 pontos (24 do caractere e 6 de espaçamento)
+        altura_ponto=0.125,  # 203 dpi
+        tempo_corte=0.5
+    )
+"""Modelo de velocidade típico de uma impressora térmica de 203 dpi."""
+
+
+Estimativa = namedtuple('Estimativa', [
+        'comprimento',  # float, comprimento de papel em mm
+        'duracao',  # float, duração da impressão em segundos
+    ])
+
+
+MARGEM_QRCODE = 4
+"""Zona de silêncio do QRCode, em módulos, em cada lado do símbolo."""
+
+# capacidade (em bytes, no modo de codificação byte) de cada versão do
+# QRCode, da versão 1 à versão 40, por nível de correção de erros
+_CAPACIDADE_QRCODE = {
+        'L': (17, 32, 53, 78, 106, 134, 154, 192, 230, 271, 321, 367, 425,
+              458, 520, 586, 644, 718, 792, 858, 929, 1003, 1091, 1171, 1273,
+              1367, 1465, 1528, 1628, 1732, 1840, 1952, 2068, 2188, 2303,
+              2431, 2563, 2699, 2809, 2953),
+        'M': (14, 26, 42, 62, 84, 106, 122, 152, 180, 213, 251, 287, 331,
+              362, 412, 450, 504, 560, 624, 666, 711, 779, 857, 911, 997,
+              1059, 1125, 1190, 1264, 1370, 1452, 1538, 1628, 1722, 1809,
+              1911, 1989, 2099, 2213, 2331),
+        'Q': (11, 20, 32, 46, 60, 74, 86, 108, 130, 151, 177, 203, 241, 258,
+              292, 322, 364, 394, 442, 482, 509, 565, 611, 661, 715, 751,
+              805, 868, 908, 982, 1030, 1112, 1168, 1228, 1283, 1351, 1423,
+              1499, 1579, 1663),
+        'H': (7, 14, 24, 34, 44, 58, 64, 84, 98, 119, 137, 155, 177, 194,
+              220, 250, 280, 310, 338, 382, 403, 439, 461, 511, 535, 593, 625,
+              658, 698, 742, 790, 842, 898, 958, 983, 1051, 1093, 1139, 1219,
+              1273),
+    }
+
+
+class Contagem(object):
+    """O que foi emitido por uma impressão do extrato."""
+
+    __slots__ = (
+            'linhas',  # linhas de texto
+            'linhas_expandidas',  # linhas de texto no modo expandido
+            'avancos',  # avanços de linha
+            'pontos_avanco',  # avanço antes do corte, em linhas de pontos
+            'codigos_barras',  # códigos de barras Code128
+            'pontos_codigos_barras',  # linhas de pontos dos Code128
+            'qrcodes',  # QRCodes
+            'modulos_qrcodes',  # módulos (linhas) dos QRCodes, com margens
+            'pontos_qrcodes',  # linhas de pontos dos QRCodes
+            'cortes',  # cortes do papel
+        )
+
+    def __init__(self, **kwargs):
+        for campo in self.__slots__:
+            setattr(self, campo, kwargs.pop(campo, 0))
+        if kwargs:
+            raise TypeError('Campos desconhecidos: {!r}'.format(
+                    sorted(kwargs)))
+
+    def __repr__(self):
+        return '{}({})'.format(
+                self.__class__.__name__,
+                ', '.join(
+                    '{}={!r}'.format(campo, valor)
+                    for campo, valor in self.como_dict().items()
+                ))
+
+    def __eq__(self, other):
+        if not isinstance(other, Contagem):
+            return NotImplemented
+        return self.como_dict() == other.como_dict()
+
+    def __ne__(self, other):
+        resultado = self.__eq__(other)
+        return resultado if resultado is NotImplemented else not resultado
+
+    __hash__ = None
+
+    def como_dict(self):
+        return OrderedDict(
+                (campo, getattr(self, campo))
+                for campo in self.__slots__
+            )
+
+    def somar(self, outra):
+        """Acumula os valores de outra contagem (por exemplo, para totalizar
+        o consumo de papel de uma loja).
+        """
+        for campo in self.__slots__:
+            setattr(self, campo, getattr(self, campo) + getattr(outra, campo))
+        return self
+
+
+def modelo(impressora):
+    """Obtém o modelo de velocidade da impressora.
+
+    :rtype: ModeloVelocidade
+    """
+    features = getattr(impressora, 'hardware_features', None) or {}
+    return features.get(MODELO_VELOCIDADE) or MODELO_PADRAO
+
+
+def estimar(contagem, modelo=MODELO_PADRAO):
+    """Estima o comprimento de papel e a duração da impressão.
+
+    :param Contagem contagem: O que foi (ou será) emitido.
+
+    :param ModeloVelocidade modelo: Opcional. O modelo de velocidade da
+        impressora.
+
+    :rtype: Estimativa
+    """
+    linhas = (
+            contagem.linhas
+            + contagem.linhas_expandidas * 2  # altura dupla
+            + contagem.avancos
+        )
+    pontos = (
+            contagem.pontos_avanco
+            + contagem.pontos_codigos_barras
+            + contagem.pontos_qrcodes
+        )
+    comprimento = linhas * modelo.altura_linha + pontos * modelo.altura_ponto
+    duracao = (
+            comprimento / float(modelo.velocidade)
+            + contagem.cortes * modelo.tempo_corte
+        )
+    return Estimativa(comprimento=comprimento, duracao=duracao)
+
+
+def modulos_qrcode(conteudo, nivel_correcao):
+    """Estima o número de módulos em cada lado do QRCode (incluindo a zona
+    de silêncio), a partir da menor versão do QRCode capaz de conter os
+    dados, codificados no modo *byte*.
+
+    :param str conteudo: O conteúdo do QRCode.
+
+    :param nivel_correcao: Nível de correção de erros (``L``, ``M``, ``Q``
+        ou ``H``).
+
+    :raises ValueError: Se o nível de correção for desconhecido ou se o
+        conteúdo exceder a capacidade do QRCode.
+
+    :rtype: int
+    """
+    if isinstance(nivel_correcao, six.binary_type):
+        nivel_correcao = nivel_correcao.decode('ascii')
+    if not isinstance(conteudo, six.binary_type):
+        conteudo = conteudo.encode('utf-8')
+    capacidades = _CAPACIDADE_QRCODE.get(nivel_correcao.upper())
+    if capacidades is None:
+        raise ValueError(
+                'Nivel de correcao desconhecido: {!r}'.format(nivel_correcao)
+            )
+    versao = bisect.bisect_left(capacidades, len(conteudo)) + 1
+    if versao > len(capacidades):
+        raise ValueError(
+                'Conteudo excede a capacidade do QRCode: {} bytes'.format(
+                    len(conteudo))
+            )
+    return 17 + 4 * versao + 2 * MARGEM_QRCODE
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/estado.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from collections import OrderedDict
+
+from .programa import _DESCONHECIDO
+from .programa import _JUSTIFICACAO
+from .programa import _MODOS
+from .programa import escrever
+
+
+class ImpressoraComEstado(object):
+    """Intermedia o acesso à impressora mantendo o estado conhecido dos modos
+    de impressão (justificação, negrito, expandido e condensado), de modo que
+    os comandos que alteram esses modos só são enviados à impressora quando
+    alterarem efetivamente o estado, imediatamente antes de algo ser impresso.
+
+    Os comandos enviados são os mesmos que resultariam dos passos de
+    otimização :func:`~satextrato.programa.dobrar_justificacao` e
+    :func:`~satextrato.programa.descartar_alternancias`.
+
+    Inicialmente o estado da impressora é desconhecido. Qualquer operação que
+    não seja conhecida (por exemplo, ``init`` ou ``set_mode``) torna o estado
+    novamente desconhecido.
+    """
+
+    def __init__(self, impressora):
+        super(ImpressoraComEstado, self).__init__()
+        self._impressora = impressora
+        self._atual = {}
+        self._justificacao = None
+        self._pendentes = OrderedDict()
+
+    def __getattr__(self, attr):
+        valor = getattr(self._impressora, attr)
+        if not callable(valor):
+            return valor
+
+        def operacao(*args, **kwargs):
+            self.descarregar()
+            try:
+                return valor(*args, **kwargs)
+            finally:
+                self._atual.clear()
+
+        return operacao
+
+    @property
+    def impressora(self):
+        """A impressora intermediada."""
+        return self._impressora
+
+    def descarregar(self):
+        """Envia à impressora os comandos que alteram efetivamente os modos de
+        impressão, que estão pendentes.
+        """
+        if self._justificacao is not None:
+            self._emitir(_JUSTIFICACAO, *self._justificacao)
+            self._justificacao = None
+        for modo, (operacao, valor) in self._pendentes.items():
+            self._emitir(modo, operacao, valor)
+        self._pendentes.clear()
+
+    def _emitir(self, modo, operacao, valor):
+        if self._atual.get(modo, _DESCONHECIDO) != valor:
+            nome, args = operacao
+            getattr(self._impressora, nome)(*args)
+            self._atual[modo] = valor
+
+    def _modo(self, nome, *args):
+        modo, extrair = _MODOS[nome]
+        operacao = ((nome, args), extrair(args))
+        if modo == _JUSTIFICACAO:
+            self._justificacao = operacao
+        else:
+            self._pendentes.pop(modo, None)
+            self._pendentes[modo] = operacao
+
+    def _saida(self, nome, *args, **kwargs):
+        self.descarregar()
+        return getattr(self._impressora, nome)(*args, **kwargs)
+
+    def justify_center(self):
+        self._modo('justify_center')
+
+    def justify_left(self):
+        self._modo('justify_left')
+
+    def justify_right(self):
+        self._modo('justify_right')
+
+    def set_emphasized(self, flag):
+        self._modo('set_emphasized', flag)
+
+    def set_expanded(self, flag):
+        self._modo('set_expanded', flag)
+
+    def set_condensed(self, flag):
+        self._modo('set_condensed', flag)
+
+    def text(self, text):
+        return self._saida('text', text)
+
+    def textout(self, text):
+        return self._saida('textout', text)
+
+    def lf(self, lines=1):
+        return self._saida('lf', lines=lines)
+
+    def code128(self, data, **kwargs):
+        return self._saida('code128', data, **kwargs)
+
+    def qrcode(self, data, **kwargs):
+        return self._saida('qrcode', data, **kwargs)
+
+    def cut(self, **kwargs):
+        return self._saida('cut', **kwargs)
+
+    def escrever(self, dados):
+        self.descarregar()
+        escrever(self._impressora, dados)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/exportacao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Exportação de extratos em lote, como documentos PDF ou imagens PNG (veja
+:mod:`satextrato.imagem`), para envio por e-mail ou arquivamento.
+
+Os documentos são informados da mesma forma que em :mod:`satextrato.lote` e
+desenhados em paralelo, em um conjunto de processos. Os resultados são
+escritos à medida que ficam prontos, na ordem em que os documentos foram
+informados, de modo que a memória utilizada não depende do número de
+documentos:
+
+.. sourcecode:: python
+
+    import glob
+
+    from satextrato import exportacao
+
+    with open('extratos-2026-09.pdf', 'wb') as saida:
+        exportacao.exportar(glob.iglob('2026-09/*.xml'), saida)
+
+Em PDF, todos os extratos são escritos em um único documento, com uma página
+para cada extrato (ou para cada corte do papel). Em PNG, é escrito um arquivo
+ZIP contendo uma imagem para cada extrato, nomeada pela chave do CF-e.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+import logging
+import zipfile
+
+from . import lote
+from .config import padrao as config_padrao
+from .imagem import DocumentoPDF
+from .imagem import FORMATOS
+from .imagem import PDF
+from .imagem import PNG
+from .imagem import VisualizacaoImagem
+
+
+logger = logging.getLogger('satextrato.exportacao')
+
+_contexto = None  # (visualizacao, config, resumido, formato) em cada processo
+
+
+def renderizar(documentos, formato=PDF, **kwargs):
+    """Desenha os extratos dos documentos em paralelo, produzindo, na ordem
+    em que os documentos foram informados, a chave de cada CF-e e o extrato
+    no formato indicado (um documento PDF ou uma imagem PNG).
+
+    :param documentos: Um iterável de documentos. Veja :mod:`satextrato.lote`.
+
+    :param str formato: Opcional. ``PDF`` (o padrão) ou ``PNG``.
+
+    Os demais argumentos nomeados são os mesmos de :func:`exportar`.
+
+    :returns: Um gerador que produz tuplas ``(chave, bytes)`` ou, para os
+        documentos que não puderem ser desenhados, uma instância de
+        :class:`satextrato.lote.Falha`.
+    """
+    for item in _executar(documentos, formato, **kwargs):
+        if isinstance(item, lote.Falha):
+            yield item
+            continue
+        chave, resultado = item
+        if formato == PDF:
+            saida = io.BytesIO()
+            documento = DocumentoPDF(saida, altura_ponto=resultado[0])
+            for pagina in resultado[1]:
+                documento.adicionar(pagina)
+            documento.fechar()
+            resultado = saida.getvalue()
+        yield chave, resultado
+
+
+def exportar(documentos, saida, formato=PDF, **kwargs):
+    """Exporta os extratos dos documentos, desenhados em paralelo, para um
+    único arquivo: um documento PDF com todos os extratos ou um arquivo ZIP
+    com uma imagem PNG para cada extrato.
+
+    :param documentos: Um iterável de documentos. Veja :mod:`satextrato.lote`.
+
+    :param saida: Um objeto *file-like* binário, onde o resultado será
+        escrito.
+
+    :param str formato: Opcional. ``PDF`` (o padrão) ou ``PNG``.
+
+    :param dict features: Opcional. Os recursos da impressora simulada, como
+        as colunas (veja :class:`satextrato.visualizacao.Visualizacao`).
+
+    :param str fonte: Opcional. Veja
+        :class:`satextrato.imagem.VisualizacaoImagem`.
+
+    :param config: Opcional. Uma instância de
+        :class:`satextrato.config.Configuracoes`.
+
+    :param bool resumido: Opcional. Indica se os extratos dos CF-e de venda
+        deverão ser resumidos.
+
+    :param int processos: Opcional. Veja :func:`satextrato.lote.renderizar`.
+
+    :param int tamanho_bloco: Opcional. Veja
+        :func:`satextrato.lote.renderizar`.
+
+    Os documentos que não puderem ser desenhados são ignorados (e
+    registrados no *log*).
+
+    :returns: O número de extratos exportados.
+    :rtype: int
+    """
+    quantidade = 0
+    if formato == PDF:
+        documento = None
+        for chave, (altura_ponto, paginas) in _resultados(
+                documentos, formato, **kwargs):
+            if documento is None:
+                documento = DocumentoPDF(saida, altura_ponto=altura_ponto)
+            for pagina in paginas:
+                documento.adicionar(pagina)
+            quantidade += 1
+        (documento or DocumentoPDF(saida)).fechar()
+    else:
+        with zipfile.ZipFile(saida, 'w') as arquivo:
+            for chave, dados in _resultados(documentos, formato, **kwargs):
+                # as imagens PNG já são comprimidas
+                arquivo.writestr(
+                        '{}.png'.format(chave),
+                        dados,
+                        zipfile.ZIP_STORED
+                    )
+                quantidade += 1
+    return quantidade
+
+
+def _resultados(documentos, formato, **kwargs):
+    for item in _executar(documentos, formato, **kwargs):
+        if isinstance(item, lote.Falha):
+            logger.error(
+                    'documento %d nao exportado: %s',
+                    item.indice,
+                    item.erro
+                )
+            continue
+        yield item
+
+
+def _executar(
+        documentos,
+        formato,
+        features=None,
+        fonte=None,
+        config=None,
+        resumido=False,
+        processos=None,
+        tamanho_bloco=1):
+    if formato not in FORMATOS:
+        raise ValueError('Formato desconhecido: {!r}'.format(formato))
+    return lote.executar(
+            _desenhar,
+            documentos,
+            _iniciar_processo,
+            (
+                features,
+                fonte,
+                config or config_padrao(),
+                resumido,
+                formato,
+            ),
+            processos=processos,
+            tamanho_bloco=tamanho_bloco
+        )
+
+
+def _iniciar_processo(features, fonte, config, resumido, formato):
+    global _contexto
+    # a visualização é reutilizada por todos os extratos do processo, assim
+    # como os caracteres já desenhados
+    visualizacao = VisualizacaoImagem(features=features, fonte=fonte)
+    _contexto = (visualizacao, config, resumido, formato)
+
+
+def _desenhar(tarefa):
+    visualizacao, config, resumido, formato = _contexto
+    visualizacao.limpar()
+    extrato = lote.carregar(
+            tarefa,
+            visualizacao,
+            config=config,
+            resumido=resumido
+        )
+    extrato.imprimir()
+    if formato == PDF:
+        resultado = (visualizacao._altura_ponto, visualizacao.paginas())
+    else:
+        resultado = visualizacao.resultado(formato=PNG)
+    visualizacao.limpar()  # libera os elementos até o próximo extrato
+    return extrato.cfe.chave, resultado
@@ -0,0 +1,441 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/imagem.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Visualização dos extratos como imagens (PNG) ou documentos PDF, desenhados
+ponto a ponto como seriam impressos em uma impressora térmica. O Code128 é
+codificado no mesmo conjunto do comando enviado à impressora (veja
+:mod:`satextrato.barras`), com dois pontos por módulo.
+
+Requer a biblioteca `Pillow <https://pypi.org/project/Pillow/>`_ (e a
+biblioteca `qrcode <https://pypi.org/project/qrcode/>`_ para desenhar o
+QRCode):
+
+.. sourcecode:: python
+
+    from satextrato.imagem import VisualizacaoImagem
+
+    visualizacao = VisualizacaoImagem(features={'cutter': True})
+    ExtratoCFeVenda(fp, visualizacao).imprimir()
+    with open('extrato.pdf', 'wb') as saida:
+        saida.write(visualizacao.resultado(formato='PDF'))
+
+Cada corte do papel encerra uma página. A largura das páginas é de doze
+pontos por coluna do modo normal (576 pontos para 48 colunas) e o espaçamento
+entre linhas é determinado pelo modelo de velocidade da impressora (veja
+:func:`satextrato.consumo.modelo`). Para exportar muitos documentos de uma
+só vez veja :mod:`satextrato.exportacao`.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+import zlib
+
+from collections import namedtuple
+
+from . import barras
+from . import consumo
+from . import qr
+from .visualizacao import CodigoBarras
+from .visualizacao import CENTRO
+from .visualizacao import Corte
+from .visualizacao import DIREITA
+from .visualizacao import Linha
+from .visualizacao import Visualizacao
+
+
+PNG = 'PNG'
+PDF = 'PDF'
+
+FORMATOS = (PNG, PDF)
+
+FONTE_PADRAO = 'DejaVuSansMono.ttf'
+"""Fonte *TrueType* usada se nenhuma outra for indicada. Se não for
+encontrada, será usada a fonte padrão da biblioteca Pillow.
+"""
+
+PONTOS_POR_COLUNA = 12
+"""Largura, em pontos, de cada coluna do modo normal."""
+
+_PONTOS_MODULO_CODE128 = 2
+
+_FONTES = {}
+
+Pagina = namedtuple('Pagina', [
+        'largura',  # int, em pontos
+        'altura',  # int, em pontos
+        'dados',  # bytes, linhas de 1 bit por ponto comprimidas (zlib)
+    ])
+
+
+class VisualizacaoImagem(Visualizacao):
+    """Visualiza os extratos como imagens, uma por página.
+
+    :param str fonte: Opcional. Caminho (ou nome) da fonte *TrueType*
+        monoespaçada usada no texto. Veja :data:`FONTE_PADRAO`.
+    """
+
+    def __init__(self, features=None, fonte=None, **kwargs):
+        self._fonte = fonte or FONTE_PADRAO
+        self._glifos = {}
+        super(VisualizacaoImagem, self).__init__(features=features, **kwargs)
+
+    @property
+    def largura(self):
+        """Largura das páginas, em pontos."""
+        return self.feature.columns.normal * PONTOS_POR_COLUNA
+
+    def imagens(self):
+        """Desenha as páginas com os elementos registrados.
+
+        :returns: Uma lista de imagens ``PIL.Image.Image`` (modo ``1``).
+        """
+        paginas = [[]]
+        for elemento in self._elementos():
+            if isinstance(elemento, Corte):
+                paginas.append([])
+            else:
+                paginas[-1].append(elemento)
+        if len(paginas) > 1 and not paginas[-1]:
+            paginas.pop()  # nada após o último corte
+        return [self._desenhar(elementos) for elementos in paginas]
+
+    def paginas(self):
+        """Desenha as páginas com os elementos registrados, na forma em que
+        são incluídas em um documento PDF.
+
+        :rtype: list[Pagina]
+        """
+        return [
+                Pagina(
+                    largura=imagem.width,
+                    altura=imagem.height,
+                    dados=zlib.compress(imagem.tobytes())
+                )
+                for imagem in self.imagens()
+            ]
+
+    def resultado(self, formato=PNG):
+        """Obtém o documento com as páginas desenhadas.
+
+        :param str formato: Opcional. ``PNG`` (o padrão), em que as páginas
+            são emendadas em uma única imagem, como na bobina de papel, ou
+            ``PDF``, com uma página para cada corte.
+
+        :rtype: bytes
+        """
+        saida = io.BytesIO()
+        if formato == PDF:
+            documento = DocumentoPDF(saida, altura_ponto=self._altura_ponto)
+            for pagina in self.paginas():
+                documento.adicionar(pagina)
+            documento.fechar()
+        elif formato == PNG:
+            _emendar(self.imagens()).save(saida, format=PNG, optimize=False)
+        else:
+            raise ValueError('Formato desconhecido: {!r}'.format(formato))
+        return saida.getvalue()
+
+    @property
+    def _altura_ponto(self):
+        return consumo.modelo(self).altura_ponto
+
+    @property
+    def _entrelinha(self):
+        modelo = consumo.modelo(self)
+        return int(round(modelo.altura_linha / modelo.altura_ponto))
+
+    def _altura(self, elemento):
+        if isinstance(elemento, Linha):
+            if elemento.expandido and not elemento.condensado:
+                return 2 * self._entrelinha
+            return self._entrelinha
+        elif isinstance(elemento, CodigoBarras):
+            return elemento.altura
+        if qr.disponivel():
+            modulos = len(qr.matriz(elemento.dados, elemento.nivel_correcao))
+        else:
+            modulos = consumo.modulos_qrcode(
+                    elemento.dados,
+                    elemento.nivel_correcao
+                )
+        return modulos * elemento.tamanho_modulo
+
+    def _desenhar(self, elementos):
+        from PIL import Image
+
+        alturas = [self._altura(elemento) for elemento in elementos]
+        imagem = Image.new('1', (self.largura, max(1, sum(alturas))), 1)
+        y = 0
+        for elemento, altura in zip(elementos, alturas):
+            if isinstance(elemento, Linha):
+                self._desenhar_linha(imagem, y, elemento)
+            elif isinstance(elemento, CodigoBarras):
+                self._desenhar_code128(imagem, y, elemento)
+            else:
+                self._desenhar_qrcode(imagem, y, elemento)
+            y += altura
+        return imagem
+
+    def _desenhar_linha(self, imagem, y, linha):
+        if not linha.texto.strip():
+            return
+        largura = self.largura // self._colunas(linha)
+        altura = 2 * largura
+        texto = linha.texto[:self._colunas(linha)]
+        x = _deslocamento(
+                self.largura,
+                len(texto) * largura,
+                linha.justificacao
+            )
+        for caractere in texto:
+            glifo = self._glifo(caractere, largura, altura)
+            if glifo is not None:
+                imagem.paste(0, (x, y), glifo)
+                if linha.negrito:
+                    # como na impressora, o negrito é uma segunda impressão
+                    # deslocada de um ponto
+                    imagem.paste(0, (x + 1, y), glifo)
+            x += largura
+
+    def _glifo(self, caractere, largura, altura):
+        # as máscaras dos caracteres são desenhadas uma única vez para cada
+        # tamanho de célula; os espaços não são desenhados
+        chave = (caractere, largura, altura)
+        if chave not in self._glifos:
+            self._glifos[chave] = (
+                    None if caractere.isspace()
+                    else _desenhar_glifo(self._fonte, caractere, largura,
+                                         altura)
+                )
+        return self._glifos[chave]
+
+    def _desenhar_code128(self, imagem, y, codigo):
+        from PIL import ImageDraw
+
+        larguras = barras.larguras(codigo.dados, codigo.conjunto)
+        x = _deslocamento(
+                self.largura,
+                barras.modulos(codigo.dados, codigo.conjunto)
+                * _PONTOS_MODULO_CODE128,
+                codigo.justificacao
+            ) + barras.MARGEM * _PONTOS_MODULO_CODE128
+        desenho = ImageDraw.Draw(imagem)
+        for n, modulos in enumerate(larguras):
+            largura = modulos * _PONTOS_MODULO_CODE128
+            if n % 2 == 0:
+                desenho.rectangle(
+                        [x, y, x + largura - 1, y + codigo.altura - 1],
+                        fill=0
+                    )
+            x += largura
+
+    def _desenhar_qrcode(self, imagem, y, codigo):
+        from PIL import Image
+
+        if not qr.disponivel():
+            return
+        matriz = qr.matriz(codigo.dados, codigo.nivel_correcao)
+        simbolo = Image.new('1', (len(matriz[0]), len(matriz)))
+        simbolo.putdata([
+                0 if escuro else 1
+                for modulos in matriz
+                for escuro in modulos
+            ])
+        simbolo = simbolo.resize(
+                (
+                    simbolo.width * codigo.tamanho_modulo,
+                    simbolo.height * codigo.tamanho_modulo
+                ),
+                Image.NEAREST
+            )
+        x = _deslocamento(self.largura, simbolo.width, codigo.justificacao)
+        imagem.paste(simbolo, (x, y))
+
+
+class DocumentoPDF(object):
+    """Escreve um documento PDF cujas páginas são imagens (veja
+    :class:`Pagina`), à medida que são adicionadas. Apenas a posição de
+    cada objeto escrito é mantida em memória, de modo que documentos com
+    qualquer número de páginas podem ser escritos diretamente em um arquivo.
+
+    :param saida: Um objeto *file-like* binário.
+
+    :param float altura_ponto: Opcional. Tamanho de cada ponto, em
+        milímetros. Veja :attr:`satextrato.consumo.ModeloVelocidade`.
+    """
+
+    def __init__(self, saida, altura_ponto=None):
+        self._saida = saida
+        self._escala = (
+                altura_ponto or consumo.MODELO_PADRAO.altura_ponto
+            ) * 72 / 25.4  # milímetros para pontos PDF
+        self._posicao = 0
+        self._posicoes = {}
+        self._proximo = 3  # 1 e 2 são o catálogo e a árvore de páginas
+        self._paginas = []
+        self._escrever(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def __len__(self):
+        return len(self._paginas)
+
+    def adicionar(self, pagina):
+        """Escreve uma página no documento.
+
+        :param Pagina pagina: A página.
+        """
+        imagem = self._objeto(
+                _bytes(
+                    '<< /Type /XObject /Subtype /Image /Width {} /Height {}'
+                    ' /ColorSpace /DeviceGray /BitsPerComponent 1'
+                    ' /Filter /FlateDecode /Length {} >>\nstream\n',
+                    pagina.largura,
+                    pagina.altura,
+                    len(pagina.dados)
+                ) + pagina.dados + b'\nendstream'
+            )
+        largura = _numero(pagina.largura * self._escala)
+        altura = _numero(pagina.altura * self._escala)
+        desenho = _bytes('q {} 0 0 {} 0 0 cm /I Do Q', largura, altura)
+        conteudo = self._objeto(
+                _bytes('<< /Length {} >>\nstream\n', len(desenho))
+                + desenho + b'\nendstream'
+            )
+        self._paginas.append(self._objeto(_bytes(
+                '<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {} {}]'
+                ' /Resources << /XObject << /I {} 0 R >> >>'
+                ' /Contents {} 0 R >>',
+                largura,
+                altura,
+                imagem,
+                conteudo
+            )))
+
+    def fechar(self):
+        """Escreve a árvore de páginas e a tabela de referências, concluindo
+        o documento. O objeto *file-like* não é fechado.
+        """
+        self._objeto(
+                _bytes(
+                    '<< /Type /Pages /Kids [{}] /Count {} >>',
+                    ' '.join('{} 0 R'.format(n) for n in self._paginas),
+                    len(self._paginas)
+                ),
+                numero=2
+            )
+        self._objeto(b'<< /Type /Catalog /Pages 2 0 R >>', numero=1)
+        inicio = self._posicao
+        total = self._proximo
+        referencias = [_bytes('xref\n0 {}\n0000000000 65535 f \n', total)]
+        for numero in range(1, total):
+            referencias.append(
+                    _bytes('{:010d} 00000 n \n', self._posicoes[numero])
+                )
+        referencias.append(_bytes(
+                'trailer\n<< /Size {} /Root 1 0 R >>\nstartxref\n{}\n%%EOF\n',
+                total,
+                inicio
+            ))
+        self._escrever(b''.join(referencias))
+
+    def _objeto(self, conteudo, numero=None):
+        if numero is None:
+            numero = self._proximo
+            self._proximo += 1
+        self._posicoes[numero] = self._posicao
+        self._escrever(
+                _bytes('{} 0 obj\n', numero) + conteudo + b'\nendobj\n'
+            )
+        return numero
+
+    def _escrever(self, dados):
+        self._saida.write(dados)
+        self._posicao += len(dados)
+
+
+def _bytes(formato, *args):
+    return formato.format(*args).encode('ascii')
+
+
+def _numero(valor):
+    return '{:.2f}'.format(valor).rstrip('0').rstrip('.')
+
+
+def _deslocamento(largura_total, largura, justificacao):
+    if justificacao == CENTRO:
+        return max(0, (largura_total - largura) // 2)
+    elif justificacao == DIREITA:
+        return max(0, largura_total - largura)
+    return 0
+
+
+def _emendar(imagens):
+    from PIL import Image
+
+    if len(imagens) == 1:
+        return imagens[0]
+    resultado = Image.new(
+            '1',
+            (imagens[0].width, sum(imagem.height for imagem in imagens)),
+            1
+        )
+    y = 0
+    for imagem in imagens:
+        resultado.paste(imagem, (0, y))
+        y += imagem.height
+    return resultado
+
+
+def _fonte(nome, tamanho):
+    chave = (nome, tamanho)
+    if chave not in _FONTES:
+        _FONTES[chave] = _carregar_fonte(nome, tamanho)
+    return _FONTES[chave]
+
+
+def _carregar_fonte(nome, tamanho):
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype(nome, tamanho)
+    except (IOError, OSError):
+        pass
+    try:
+        return ImageFont.load_default(tamanho)  # Pillow 10.1+
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def _desenhar_glifo(nome_fonte, caractere, largura, altura):
+    from PIL import Image
+    from PIL import ImageDraw
+
+    # o tamanho da fonte é ajustado para que o caractere ocupe a célula
+    fonte = _fonte(nome_fonte, altura)
+    caixa = fonte.getbbox(caractere)
+    avanco = max(1, caixa[2] - min(0, caixa[0]))
+    escala = min(1.0, float(largura) / avanco)
+    if escala < 1.0:
+        fonte = _fonte(nome_fonte, max(1, int(altura * escala)))
+        caixa = fonte.getbbox(caractere)
+
+    mascara = Image.new('L', (largura, altura), 0)
+    x = (largura - (caixa[2] - caixa[0])) // 2 - caixa[0]
+    ImageDraw.Draw(mascara).text((x, 0), caractere, fill=255, font=fonte)
+    return mascara.point(lambda valor: 255 if valor >= 128 else 0)
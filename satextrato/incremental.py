@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/incremental.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from . import consumo
+from . import modelo
+from . import parser
+from .venda import ExtratoCFeVenda
+
+
+_PROFUNDIDADE_DET = 3  # CFe/infCFe/det
+
+
+class ExtratoCFeVendaIncremental(ExtratoCFeVenda):
+    """Implementa a impressão do extrato do CF-e de venda processando o XML
+    de forma incremental, o que é indicado para documentos muito grandes,
+    com centenas de itens.
+
+    Ao contrário de :class:`~satextrato.venda.ExtratoCFeVenda`, o documento
+    não é carregado por inteiro na inicialização. O XML é lido durante a
+    impressão e o cabeçalho é enviado à impressora assim que os dados do
+    emitente e do consumidor estiverem disponíveis, antes mesmo do restante
+    do documento ser lido. Cada item (elemento ``det``) é impresso e então
+    descartado, de modo que o consumo de memória não cresce com o número
+    de itens.
+
+    .. note::
+
+        Como o XML é lido durante a impressão, o extrato só poderá ser
+        impresso (ou renderizado) uma única vez. Pela mesma razão, não é
+        possível estimar o consumo antes de imprimir (veja :meth:`estimar`).
+
+    """
+
+    def __init__(self, fp, impressora, resumido=False, config=None):
+        """Inicia uma instância de :class:`ExtratoCFeVendaIncremental`.
+        Os argumentos são os mesmos de
+        :class:`~satextrato.venda.ExtratoCFeVenda`, mas ``fp`` pode ser
+        também o caminho para o arquivo XML.
+        """
+        super(ExtratoCFeVendaIncremental, self).__init__(
+                fp,
+                impressora,
+                resumido=resumido,
+                config=config
+            )
+
+    def _carregar(self, fp):
+        # os itens não são mantidos no modelo, apenas acumulados
+        self._fp = fp
+        self._tree = None
+        self.root = None
+        self.cfe = modelo.CFe()
+
+    def imprimir(self):
+        if self._fp is None:
+            raise RuntimeError(
+                    'Extrato incremental ja foi impresso; o documento XML '
+                    'e lido durante a impressao'
+                )
+
+        self.contagem = consumo.Contagem()
+        with self._instrumentando(), self._rastreando():
+            self._imprimir()
+
+    def estimar(self, modelo=None):
+        """Não suportado: estimar exigiria ler todo o documento, que então
+        não poderia mais ser impresso. Depois da impressão, a estimativa
+        pode ser obtida a partir da contagem do que foi emitido:
+
+        .. sourcecode:: python
+
+            extrato.imprimir()
+            consumo.estimar(extrato.contagem)
+
+        :raises NotImplementedError: Sempre.
+        """
+        raise NotImplementedError(
+                'Extrato incremental nao pode ser estimado antes da '
+                'impressao; use consumo.estimar(extrato.contagem) apos '
+                'imprimir'
+            )
+
+    def _imprimir(self):
+        implementacao = parser.ativa()
+        contexto = implementacao.iterparse(
+                self._fp,
+                events=('start', 'end')
+            )
+        self._fp = None
+
+        infCFe = None
+        iniciado = False
+        profundidade = 0
+
+        for evento, elemento in contexto:
+            if evento == 'start':
+                profundidade += 1
+                if self.root is None:
+                    self.root = elemento
+                elif infCFe is None and elemento.tag == 'infCFe':
+                    infCFe = elemento
+                elif (not iniciado
+                        and elemento.tag == 'det'
+                        and profundidade == _PROFUNDIDADE_DET):
+                    # elementos que precedem `det` (ide, emit, dest e
+                    # entrega) estão completos; inicia a impressão
+                    self._iniciar()
+                    iniciado = True
+            else:
+                if (elemento.tag == 'det'
+                        and profundidade == _PROFUNDIDADE_DET):
+                    self._item(elemento)
+                    infCFe.remove(elemento)
+                profundidade -= 1
+
+        self._tree = implementacao.ElementTree(self.root)
+
+        if not iniciado:
+            self._iniciar()
+
+        modelo.extrair_fim(self.cfe, self._tree)
+
+        self.corpo_fechamento()
+        self.rodape()
+        self.fim_documento()
+
+    def _iniciar(self):
+        modelo.extrair_inicio(self.cfe, self.root)
+        self.cabecalho()
+        self.corpo_I_titulo()
+        self.corpo_II_consumidor()
+        if not self._resumido:
+            self.corpo_III_legenda()
+
+    def _item(self, det):
+        item = modelo.extrair_item(det)
+        if not self._resumido:
+            self.apresentar_item(item)
+            self.apresentar_ajustes_item(item)
+        self.cfe.acumular(item)
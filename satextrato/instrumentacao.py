@@ -0,0 +1,580 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/instrumentacao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Medição do tempo, do número de escritas e dos bytes enviados ao dispositivo
+por cada seção do extrato (``cabecalho``, ``corpo``, cada um dos grupos
+``corpo_*``, ``rodape`` e ``fim_documento``).
+
+A instrumentação é opcional e é ativada atribuindo um destino para as
+medições ao atributo ``instrumentacao`` de um extrato ou da própria classe
+(para todos os extratos). O destino é qualquer *callable* que receba uma
+instância de :class:`Medicao`:
+
+.. sourcecode:: python
+
+    from satextrato import ExtratoCFeVenda
+    from satextrato import instrumentacao
+
+    registro = instrumentacao.Registro()
+    ExtratoCFeVenda.instrumentacao = registro
+
+    ExtratoCFeVenda(fp, impressora).imprimir()
+    registro.gravar('/var/lib/node_exporter/satextrato.prom')
+
+A impressora também pode ser intermediada por uma
+:class:`ImpressoraInstrumentada`, que mede cada comando enviado à impressora
+e cada escrita no dispositivo, indicando as escritas lentas.
+
+Estão disponíveis os destinos :class:`Log`, que registra as medições no
+*logger* ``satextrato.instrumentacao``, e :class:`Registro`, que acumula
+contadores e histogramas que podem ser gravados no formato texto do
+Prometheus.
+
+As seções aninhadas (por exemplo, ``corpo`` e ``corpo_I_titulo``) são
+medidas individualmente, de modo que a medição de uma seção inclui a das
+seções que ela contém. Os comandos que alteram os modos de impressão só são
+enviados ao dispositivo antes do próximo texto impresso e por isso podem ser
+contabilizados na seção seguinte. Quando o extrato é renderizado em um
+programa de impressão (veja :meth:`~satextrato.base.ExtratoCFe.renderizar`)
+nada é escrito no dispositivo e apenas o tempo é medido.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import io
+import logging
+import os
+import threading
+
+from collections import OrderedDict
+from collections import namedtuple
+from contextlib import contextmanager
+from timeit import default_timer
+
+from .cache import _remover
+from .cache import _substituir
+
+
+logger = logging.getLogger('satextrato.instrumentacao')
+
+
+SECOES = ('cabecalho', 'corpo', 'rodape', 'fim_documento')
+"""Seções medidas em todos os extratos, além dos grupos ``corpo_*``."""
+
+LIMITES_PADRAO = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                  0.25, 0.5, 1.0, 2.5)
+"""Limites (em segundos) das faixas do histograma de duração."""
+
+
+Medicao = namedtuple('Medicao', [
+        'documento',  # str, nome da classe do extrato
+        'secao',  # str, nome do método da seção
+        'duracao',  # float, em segundos
+        'escritas',  # int ou None, se não houver dispositivo
+        'bytes',  # int ou None, se não houver dispositivo
+    ])
+
+
+MedicaoComando = namedtuple('MedicaoComando', [
+        'impressora',  # str, nome da impressora
+        'comando',  # str, nome do método da impressora
+        'duracao',  # float, em segundos
+        'escritas',  # int
+        'bytes',  # int
+    ])
+
+
+EscritaLenta = namedtuple('EscritaLenta', [
+        'impressora',  # str, nome da impressora
+        'comando',  # str ou None, se a escrita ocorreu fora de um comando
+        'duracao',  # float, em segundos
+        'bytes',  # int
+    ])
+
+
+_FAMILIAS = OrderedDict([
+        # tipo da medição: (família, rótulos, descrição)
+        (Medicao, ('secao', ('documento', 'secao'), 'secao do extrato')),
+        (MedicaoComando, (
+            'comando', ('impressora', 'comando'), 'comando da impressora')),
+    ])
+
+
+class Log(object):
+    """Destino que registra cada medição no *logger*
+    ``satextrato.instrumentacao``. As escritas lentas são registradas com o
+    nível ``WARNING``.
+    """
+
+    def __init__(self, nivel=logging.DEBUG, logger=logger):
+        super(Log, self).__init__()
+        self._nivel = nivel
+        self._logger = logger
+
+    def __call__(self, medicao):
+        if isinstance(medicao, EscritaLenta):
+            self._logger.warning(
+                    'escrita lenta na impressora %s (%s): %.6fs, %s bytes',
+                    medicao.impressora,
+                    medicao.comando,
+                    medicao.duracao,
+                    medicao.bytes
+                )
+            return
+        _, rotulos, _ = _FAMILIAS[type(medicao)]
+        self._logger.log(
+                self._nivel,
+                '%s.%s: %.6fs, %s escritas, %s bytes',
+                getattr(medicao, rotulos[0]),
+                getattr(medicao, rotulos[1]),
+                medicao.duracao,
+                medicao.escritas,
+                medicao.bytes
+            )
+
+
+class Registro(object):
+    """Destino que acumula contadores de execuções, escritas e bytes, além
+    de um histograma das durações, por documento e seção (:class:`Medicao`)
+    e por impressora e comando (:class:`MedicaoComando`). Também conta as
+    escritas lentas (:class:`EscritaLenta`) por impressora e comando. Pode
+    ser usado por várias *threads* ao mesmo tempo.
+    """
+
+    def __init__(self, limites=LIMITES_PADRAO, prefixo='satextrato'):
+        """Inicia uma instância de :class:`Registro`.
+
+        :param limites: Opcional. Limites superiores, em segundos, das
+            faixas do histograma de duração, em ordem crescente.
+
+        :param str prefixo: Opcional. Prefixo dos nomes das métricas.
+        """
+        super(Registro, self).__init__()
+        self._limites = tuple(limites)
+        self._prefixo = prefixo
+        self._series = OrderedDict()
+        self._lentas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, medicao):
+        if isinstance(medicao, EscritaLenta):
+            chave = (medicao.impressora, medicao.comando or '')
+            with self._lock:
+                self._lentas[chave] = self._lentas.get(chave, 0) + 1
+            return
+
+        familia, rotulos, _ = _FAMILIAS[type(medicao)]
+        chave = (familia,) + tuple(getattr(medicao, r) for r in rotulos)
+        with self._lock:
+            serie = self._series.get(chave)
+            if serie is None:
+                serie = _Serie(len(self._limites))
+                self._series[chave] = serie
+            serie.execucoes += 1
+            serie.soma += medicao.duracao
+            serie.escritas += medicao.escritas or 0
+            serie.bytes += medicao.bytes or 0
+            for indice, limite in enumerate(self._limites):
+                if medicao.duracao <= limite:
+                    serie.faixas[indice] += 1
+
+    def series(self, familia='secao'):
+        """Obtém os valores acumulados.
+
+        :param str familia: Opcional. ``secao`` (o padrão) ou ``comando``.
+
+        :returns: Um dicionário onde as chaves são tuplas ``(documento,
+            secao)`` ou ``(impressora, comando)`` e os valores são
+            dicionários com ``execucoes``, ``duracao``, ``escritas`` e
+            ``bytes``.
+        """
+        with self._lock:
+            return OrderedDict(
+                    (chave[1:], {
+                        'execucoes': serie.execucoes,
+                        'duracao': serie.soma,
+                        'escritas': serie.escritas,
+                        'bytes': serie.bytes,
+                    })
+                    for chave, serie in self._series.items()
+                    if chave[0] == familia
+                )
+
+    def escritas_lentas(self):
+        """Obtém o número de escritas lentas.
+
+        :returns: Um dicionário onde as chaves são tuplas ``(impressora,
+            comando)`` e os valores são o número de escritas lentas.
+        """
+        with self._lock:
+            return OrderedDict(self._lentas)
+
+    def limpar(self):
+        """Descarta os valores acumulados."""
+        with self._lock:
+            self._series.clear()
+            self._lentas.clear()
+
+    def prometheus(self):
+        """Obtém os valores acumulados no formato texto do Prometheus.
+
+        :rtype: str
+        """
+        linhas = []
+        with self._lock:
+            series = list(self._series.items())
+            lentas = list(self._lentas.items())
+
+        for familia, rotulos, descricao in _FAMILIAS.values():
+            selecionadas = [
+                    (_rotulos(rotulos, chave[1:]), serie)
+                    for chave, serie in series
+                    if chave[0] == familia
+                ]
+            if selecionadas:
+                linhas.extend(self._familia(familia, descricao, selecionadas))
+
+        if lentas:
+            nome = '{}_escritas_lentas_total'.format(self._prefixo)
+            linhas.append('# HELP {} Escritas lentas.'.format(nome))
+            linhas.append('# TYPE {} counter'.format(nome))
+            for chave, quantidade in lentas:
+                linhas.append('{}{{{}}} {}'.format(
+                        nome,
+                        _rotulos(('impressora', 'comando'), chave),
+                        quantidade
+                    ))
+
+        return '\n'.join(linhas) + '\n'
+
+    def gravar(self, caminho):
+        """Grava os valores acumulados no formato texto do Prometheus (por
+        exemplo, para o *textfile collector* do ``node_exporter``). O
+        arquivo é substituído atomicamente.
+        """
+        # o temporário é exclusivo do processo e da thread, para que
+        # gravações simultâneas do mesmo arquivo não se misturem; não é
+        # usado tempfile.mkstemp, que criaria o arquivo legível apenas pelo
+        # proprietário, enquanto o coletor geralmente é outro usuário
+        temporario = '{}.{}.{}.tmp'.format(
+                caminho,
+                os.getpid(),
+                threading.current_thread().ident
+            )
+        try:
+            with io.open(temporario, 'w', encoding='utf-8') as fp:
+                fp.write(self.prometheus())
+            _substituir(temporario, caminho)
+        except Exception:
+            _remover(temporario)
+            raise
+
+    def _familia(self, familia, descricao, series):
+        p = '{}_{}'.format(self._prefixo, familia)
+        linhas = []
+        for nome, ajuda, atributo in (
+                ('escritas_total', 'Escritas no dispositivo por', 'escritas'),
+                ('bytes_total', 'Bytes enviados ao dispositivo por', 'bytes')):
+            linhas.append('# HELP {}_{} {} {}.'.format(
+                    p, nome, ajuda, descricao))
+            linhas.append('# TYPE {}_{} counter'.format(p, nome))
+            for rotulos, serie in series:
+                linhas.append('{}_{}{{{}}} {}'.format(
+                        p, nome, rotulos, getattr(serie, atributo)))
+
+        nome = '{}_duracao_segundos'.format(p)
+        linhas.append('# HELP {} Duracao de cada {}.'.format(nome, descricao))
+        linhas.append('# TYPE {} histogram'.format(nome))
+        for rotulos, serie in series:
+            for limite, quantidade in zip(self._limites, serie.faixas):
+                linhas.append('{}_bucket{{{},le="{}"}} {}'.format(
+                        nome, rotulos, _numero(limite), quantidade))
+            linhas.append('{}_bucket{{{},le="+Inf"}} {}'.format(
+                    nome, rotulos, serie.execucoes))
+            linhas.append('{}_sum{{{}}} {}'.format(
+                    nome, rotulos, _numero(serie.soma)))
+            linhas.append('{}_count{{{}}} {}'.format(
+                    nome, rotulos, serie.execucoes))
+        return linhas
+
+
+class ImpressoraInstrumentada(object):
+    """Intermedia o acesso à impressora medindo a duração, as escritas e os
+    bytes enviados ao dispositivo por cada comando (``text``, ``qrcode``,
+    ``code128``, ``cut``, etc), além da duração de cada escrita no
+    dispositivo, de modo a distinguir impressoras lentas de extratos lentos:
+
+    .. sourcecode:: python
+
+        registro = instrumentacao.Registro()
+        with instrumentacao.ImpressoraInstrumentada(
+                GenericESCPOS(conn),
+                registro,
+                nome='caixa-1',
+                limite_escrita=0.5) as impressora:
+            ExtratoCFeVenda(fp, impressora).imprimir()
+
+    A impressora instrumentada pode ser usada em qualquer lugar onde a
+    impressora original seria usada. Enquanto instrumentada, o dispositivo
+    da impressora original é intermediado; o dispositivo original é
+    restaurado por :meth:`encerrar` (ou ao final do bloco ``with``).
+
+    Quando um programa de impressão é executado (veja
+    :meth:`satextrato.programa.Programa.executar`) as escritas são
+    acumuladas e enviadas ao final, de modo que os bytes são contabilizados
+    apenas nas escritas e não nos comandos.
+    """
+
+    def __init__(self, impressora, destino, nome=None, limite_escrita=None):
+        """Inicia uma instância de :class:`ImpressoraInstrumentada`.
+
+        :param impressora: Uma instância de
+            :class:`escpos.impl.epson.GenericESCPOS` (ou especialização).
+
+        :param destino: Um *callable* que receberá as medições
+            (:class:`MedicaoComando` e :class:`EscritaLenta`).
+
+        :param str nome: Opcional. Nome que identifica a impressora nas
+            medições. Se não informado, será o nome da classe da impressora.
+
+        :param float limite_escrita: Opcional. Duração, em segundos, a
+            partir da qual (inclusive) uma escrita no dispositivo é
+            considerada lenta. Com ``0``, todas as escritas são lentas.
+        """
+        nome = nome or impressora.__class__.__name__
+        dispositivo = _DispositivoMedido(
+                impressora.device,
+                nome,
+                destino,
+                limite_escrita
+            )
+        impressora.device = dispositivo
+        vars(self).update(
+                _impressora=impressora,
+                _nome=nome,
+                _destino=destino,
+                _dispositivo=dispositivo
+            )
+
+    @property
+    def impressora(self):
+        """A impressora intermediada."""
+        return self._impressora
+
+    def encerrar(self):
+        """Encerra a instrumentação, restaurando o dispositivo original da
+        impressora intermediada. As medições deixam de ser enviadas ao
+        destino.
+        """
+        impressora = self._impressora
+        if impressora.device is self._dispositivo:
+            impressora.device = self._dispositivo._device
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.encerrar()
+
+    def __getattr__(self, attr):
+        valor = getattr(self._impressora, attr)
+        if not callable(valor) or attr.startswith('_'):
+            return valor
+
+        def comando(*args, **kwargs):
+            return self._medir(attr, valor, args, kwargs)
+
+        return comando
+
+    def escrever(self, dados):
+        # veja satextrato.programa.escrever
+        return self._medir('escrever', self._impressora.device.write,
+                           (dados,), {})
+
+    def __setattr__(self, attr, valor):
+        # por exemplo, o dispositivo é substituído temporariamente na
+        # execução de programas de impressão
+        setattr(self._impressora, attr, valor)
+
+    def _medir(self, nome, metodo, args, kwargs):
+        dispositivo = self._dispositivo
+        anterior = dispositivo.comando
+        escritas, bytes_ = dispositivo.escritas, dispositivo.bytes
+        dispositivo.comando = nome
+        inicio = default_timer()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            duracao = default_timer() - inicio
+            dispositivo.comando = anterior
+            medicao = MedicaoComando(
+                    self._nome,
+                    nome,
+                    duracao,
+                    dispositivo.escritas - escritas,
+                    dispositivo.bytes - bytes_
+                )
+            _enviar(self._destino, medicao)
+
+
+class _Serie(object):
+    __slots__ = ('execucoes', 'soma', 'escritas', 'bytes', 'faixas')
+
+    def __init__(self, faixas):
+        self.execucoes = 0
+        self.soma = 0.0
+        self.escritas = 0
+        self.bytes = 0
+        self.faixas = [0] * faixas
+
+
+class _DispositivoMedido(object):
+    # mede a duração de cada escrita no dispositivo real
+
+    def __init__(self, device, nome, destino, limite):
+        self._device = device
+        self._nome = nome
+        self._destino = destino
+        self._limite = limite
+        self.comando = None
+        self.escritas = 0
+        self.bytes = 0
+
+    def __getattr__(self, attr):
+        return getattr(self._device, attr)
+
+    def write(self, data):
+        inicio = default_timer()
+        try:
+            return self._device.write(data)
+        finally:
+            duracao = default_timer() - inicio
+            self.escritas += 1
+            self.bytes += len(data)
+            if self._limite is not None and duracao >= self._limite:
+                medicao = EscritaLenta(
+                        self._nome,
+                        self.comando,
+                        duracao,
+                        len(data)
+                    )
+                _enviar(self._destino, medicao)
+
+
+class _Contador(object):
+    # conta as escritas destinadas ao dispositivo real
+
+    def __init__(self, device):
+        self._device = device
+        self.escritas = 0
+        self.bytes = 0
+
+    def __getattr__(self, attr):
+        return getattr(self._device, attr)
+
+    def write(self, data):
+        self.escritas += 1
+        self.bytes += len(data)
+        return self._device.write(data)
+
+
+def secoes(extrato):
+    """Obtém os nomes das seções do extrato que serão medidas."""
+    nomes = [nome for nome in SECOES if hasattr(extrato, nome)]
+    nomes.extend(sorted(
+            nome for nome in dir(extrato.__class__)
+            if nome.startswith('corpo_')
+            and callable(getattr(extrato.__class__, nome))
+        ))
+    return nomes
+
+
+@contextmanager
+def instrumentar(extrato, destino):
+    """Mede as seções do extrato executadas no contexto, enviando cada
+    medição ao destino.
+    """
+    impressora = extrato.impressora
+    device = getattr(impressora, 'device', None)
+    contador = None if device is None else _Contador(device)
+    if contador is not None:
+        impressora.device = contador
+
+    documento = extrato.__class__.__name__
+    nomes = secoes(extrato)
+    for nome in nomes:
+        medida = _medir(
+                getattr(extrato, nome),
+                documento,
+                nome,
+                contador,
+                destino
+            )
+        setattr(extrato, nome, medida)
+    try:
+        yield
+    finally:
+        for nome in nomes:
+            delattr(extrato, nome)
+        if contador is not None:
+            impressora.device = device
+
+
+def _medir(secao, documento, nome, contador, destino):
+
+    def medida(*args, **kwargs):
+        escritas = bytes_ = None
+        if contador is not None:
+            escritas, bytes_ = contador.escritas, contador.bytes
+        inicio = default_timer()
+        try:
+            return secao(*args, **kwargs)
+        finally:
+            duracao = default_timer() - inicio
+            if contador is not None:
+                escritas = contador.escritas - escritas
+                bytes_ = contador.bytes - bytes_
+            medicao = Medicao(documento, nome, duracao, escritas, bytes_)
+            _enviar(destino, medicao)
+
+    return medida
+
+
+def _enviar(destino, medicao):
+    # uma falha no destino das medições não deve interromper a impressão
+    try:
+        destino(medicao)
+    except Exception:
+        logger.exception('falha ao registrar medicao %r', medicao)
+
+
+def _rotulos(nomes, valores):
+    return ','.join(
+            '{}="{}"'.format(nome, _escapar(valor))
+            for nome, valor in zip(nomes, valores)
+        )
+
+
+def _escapar(valor):
+    return '{}'.format(valor).replace('\\', '\\\\').replace(
+            '"', '\\"').replace('\n', '\\n')
+
+
+def _numero(valor):
+    return repr(float(valor))
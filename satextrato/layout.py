@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/layout.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Disposição de textos em colunas de largura fixa, como as das impressoras
+térmicas de bobina.
+
+As quebras de linha produzidas por :func:`quebrar` são idênticas às de
+``textwrap.wrap`` (com os argumentos padrão), mas os casos mais comuns são
+resolvidos sem expressões regulares e os resultados são mantidos em um
+cache de tamanho limitado, assim como os de :func:`bordas`, já que os
+mesmos textos (rótulos, mensagens, descrições de produtos) se repetem de
+um extrato para outro.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from .cache import LRU
+
+
+_QUEBRAS = LRU(tamanho=4096)
+_BORDAS = LRU(tamanho=4096)
+
+# caracteres que fazem com que a quebra seja delegada a `textwrap`, que os
+# trata de maneira especial (hífens); os espaços em branco que não sejam o
+# espaço comum também são delegados, veja `_simples`
+_ESPECIAIS = frozenset('-')
+
+
+def quebrar(texto, largura):
+    """Quebra o texto em linhas de, no máximo, ``largura`` caracteres, da
+    mesma forma que ``textwrap.wrap(texto, largura)``.
+
+    :rtype: tuple
+    """
+    chave = (texto, largura)
+    linhas = _QUEBRAS.obter(chave)
+    if linhas is None:
+        if _simples(texto, largura):
+            linhas = tuple(_quebrar_simples(texto, largura))
+        else:
+            import textwrap
+            linhas = tuple(textwrap.wrap(texto, largura))
+        _QUEBRAS.armazenar(chave, linhas)
+    return linhas
+
+
+def bordas(
+        esquerda,
+        direita,
+        largura=48,
+        espacamento_minimo=4,
+        favorecer_direita=True
+        ):
+    """Prepara duas strings para serem impressas alinhadas às bordas opostas.
+    Veja :func:`_bordas_texto`. O resultado é mantido em cache.
+
+    .. sourcecode:: python
+
+        >>> bordas('TOTAL R$', '10,00', largura=20)
+        'TOTAL R$       10,00'
+
+    """
+    chave = (esquerda, direita, largura, espacamento_minimo, favorecer_direita)
+    texto = _BORDAS.obter(chave)
+    if texto is None:
+        texto = _bordas_texto(
+                esquerda,
+                direita,
+                largura=largura,
+                espacamento_minimo=espacamento_minimo,
+                favorecer_direita=favorecer_direita
+            )
+        _BORDAS.armazenar(chave, texto)
+    return texto
+
+
+def _simples(texto, largura):
+    # texto com palavras separadas por um único espaço, sem hífens ou outros
+    # caracteres especiais, cuja quebra pode ser feita por `_quebrar_simples`;
+    # no Python 2, `textwrap` quebra textos unicode em qualquer espaço em
+    # branco (NBSP, U+2003, etc), e não apenas em tabulações e quebras de
+    # linha, como no Python 3
+    return (largura > 0
+            and texto
+            and texto[0] != ' '
+            and texto[-1] != ' '
+            and '  ' not in texto
+            and _ESPECIAIS.isdisjoint(texto)
+            and not any(c.isspace() and c != ' ' for c in texto))
+
+
+def _quebrar_simples(texto, largura):
+    # Algoritmo de `textwrap.TextWrapper._wrap_chunks` especializado para
+    # pedaços que são palavras separadas por um único espaço (sem recuos,
+    # limite de linhas ou hífens); os pedaços ficam em ordem reversa
+    pedacos = []
+    for palavra in reversed(texto.split(' ')):
+        pedacos.append(palavra)
+        pedacos.append(' ')
+    pedacos.pop()
+
+    linhas = []
+    while pedacos:
+        linha = []
+        comprimento = 0
+
+        if linhas and not pedacos[-1].strip():
+            del pedacos[-1]
+
+        while pedacos:
+            tamanho = len(pedacos[-1])
+            if comprimento + tamanho > largura:
+                break
+            linha.append(pedacos.pop())
+            comprimento += tamanho
+
+        if pedacos and len(pedacos[-1]) > largura:
+            # palavra maior que a largura; completa a linha com o início dela
+            sobra = largura - comprimento
+            pedaco = pedacos[-1]
+            linha.append(pedaco[:sobra])
+            pedacos[-1] = pedaco[sobra:]
+
+        if linha and linha[-1].strip() == '':
+            del linha[-1]
+
+        if linha:
+            linhas.append(''.join(linha))
+
+    return linhas
+
+
+def _bordas_texto(
+        esquerda,
+        direita,
+        largura=48,
+        espacamento_minimo=4,
+        favorecer_direita=True
+        ):
+    """Prepara duas strings para serem impressas alinhadas às bordas opostas da
+    mídia, os textos da esquerda (borda esquerda) e da direita (borda direita),
+    respeitando uma largura e espaçamento mínimo determinados.
+
+    .. sourcecode:: python
+
+        >>> bordas('a', 'b')
+        'a                                              b'
+
+        >>> esquerda = 'a' * 30
+        >>> direita = 'b' * 30
+        >>> bordas(esquerda, direita)
+        'aaaaaaaaaaaaaaaaaaaaaa    bbbbbbbbbbbbbbbbbbbbbb'
+
+        >>> esquerda = 'Gazeta publica hoje breve nota de faxina na quermesse'
+        >>> direita = 'Um pequeno jabuti xereta viu dez cegonhas felizes'
+        >>> bordas(esquerda, direita, espacamento_minimo=1)
+        'Gazeta publica hoje bre viu dez cegonhas felizes'
+
+
+    :param str esquerda: O texto a ser exibido à esquerda. Se o texto não
+        couber (em relação à largura e ao espaçamento mínimo) será exibida
+        apenas a porção mais à esquerda desse texto, sendo cortados (não
+        impressos) os caracteres do final do texto.
+
+    :param str direita: O texto à ser exibido à direita. Se o texto da direita
+        não couber (em relação à largura e ao espaçamento mínimo) será exibida
+        apenas porção mais à direita desse texto, sendo cortados (não
+        impressos) os caracteres do início do texto.
+
+    :param int largura: Largura em caracteres a considerar ao calcular o vão
+        entre os textos da esquerda e direita. O padrão é 48, já que é a
+        largura mais comum entre as impressoras térmicas de bobina quando
+        imprimindo com a fonte normal.
+
+    :param int espacamento_minimo: Opcional. Determina o número de espaços
+        mínimo a ser deixado entre os textos da esquerda e direita. O padrão
+        são quatro espaços.
+
+    :param bool favorecer_direita: Opcional. Determina se o texto da direita
+        deverá ser favorecido com um espaço maior quando houver diferença
+        (sobra) entre os textos da esquerda e direita em relação ao espaçamento
+        mínimo determinado. O padrão é favorecer o texto da direita, já que é
+        normalmente o dado relevante, como um valor ou percentual.
+
+    :returns: Uma string contendo os textos da esquerda e direita encaixados na
+        largura determinada, respeitando um espaçamento mínimo entre eles. Se
+        necessário os textos serão truncados para respeitar a largura (o texto
+        da esquerda será truncado no final e o texto da direita será truncado
+        no início).
+
+    :rtype: str
+
+    """
+    espacamento = largura - (len(esquerda) + len(direita))
+    if espacamento < espacamento_minimo:
+        espacamento = espacamento_minimo
+        cpmax = int((largura - espacamento) // 2)
+        cpmax_esq, cpmax_dir = cpmax, cpmax
+        diferenca = largura - (espacamento + cpmax * 2)
+        if diferenca > 0:
+            if favorecer_direita:
+                cpmax_dir += diferenca
+            else:
+                cpmax_esq += diferenca
+        esquerda = esquerda[:cpmax_esq]
+        direita = direita[-cpmax_dir:]
+    return '%s%s%s' % (esquerda, ' ' * espacamento, direita)
@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/lote.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Impressão de extratos em lote.
+
+Os documentos são interpretados e renderizados em paralelo, em um conjunto de
+processos, enquanto os extratos já renderizados são enviados, na ordem em que
+foram informados, para uma única impressora:
+
+.. sourcecode:: python
+
+    from satextrato import lote
+
+    documentos = [
+            'CFe35150808723218000186599000040190000241114257.xml',
+            ('CFe35150808723218000186599000040190000241114257.xml',
+                'ADC35150808723218000186599000040190000253347163.xml'),
+        ]
+
+    lote.imprimir(documentos, impressora)
+
+Cada documento pode ser o caminho para o arquivo XML, um objeto *file-like*
+ou o próprio conteúdo XML (``bytes``). Um CF-e de cancelamento é informado
+como uma tupla contendo o documento do CF-e de venda e o documento do CF-e de
+cancelamento.
+
+Um documento que não possa ser renderizado não interrompe o lote: no seu
+lugar é produzida uma instância de :class:`Falha`, que indica a posição do
+documento e o erro ocorrido.
+
+.. note::
+
+    Assim como na reimpressão a partir do cache (veja
+    :class:`satextrato.cache.CacheExtratos`), os extratos renderizados são
+    enviados diretamente ao dispositivo.
+
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import collections
+import io
+import logging
+import multiprocessing
+import re
+
+import six
+
+from .cancelamento import ExtratoCFeCancelamento
+from .config import padrao as config_padrao
+from .programa import construir
+from .programa import perfil
+from .venda import ExtratoCFeVenda
+
+
+logger = logging.getLogger('satextrato.lote')
+
+_contexto = None  # (perfil, config, resumido) em cada processo
+
+_DECLARACAO_ENCODING = re.compile(
+        r'''^(\s*<\?xml[^>]*?\bencoding\s*=\s*)(["'])[^"']*\2''')
+
+
+Falha = collections.namedtuple('Falha', [
+        'indice',  # int, a posição do documento no lote (a partir de zero)
+        'erro',  # str, o tipo e a mensagem da exceção
+    ])
+
+
+def carregar(documento, impressora, config=None, resumido=False):
+    """Carrega o extrato de um documento, em qualquer das formas aceitas
+    (veja :mod:`satextrato.lote`).
+
+    :returns: Uma instância de :class:`~satextrato.venda.ExtratoCFeVenda` ou
+        de :class:`~satextrato.cancelamento.ExtratoCFeCancelamento`, se o
+        documento for uma tupla.
+    """
+    tarefa = _tarefa(documento)
+    if isinstance(tarefa, tuple):
+        with _abrir(tarefa[0]) as fp_venda, _abrir(tarefa[1]) as fp_canc:
+            return ExtratoCFeCancelamento(
+                    fp_venda,
+                    fp_canc,
+                    impressora,
+                    config=config
+                )
+    with _abrir(tarefa) as fp:
+        return ExtratoCFeVenda(
+                fp,
+                impressora,
+                resumido=resumido,
+                config=config
+            )
+
+
+def renderizar(
+        documentos,
+        impressora,
+        config=None,
+        resumido=False,
+        processos=None,
+        tamanho_bloco=1):
+    """Renderiza os documentos em paralelo, produzindo os bytes de cada
+    extrato na mesma ordem em que os documentos foram informados. Nada é
+    enviado à impressora, que apenas determina o perfil (modelo, recursos e
+    codificação de caracteres) usado na renderização.
+
+    :param documentos: Um iterável de documentos. Veja :mod:`satextrato.lote`.
+
+    :param impressora: A impressora para a qual os extratos serão
+        renderizados.
+
+    :param config: Opcional. Uma instância de
+        :class:`satextrato.config.Configuracoes`.
+
+    :param bool resumido: Opcional. Indica se os extratos dos CF-e de venda
+        deverão ser resumidos.
+
+    :param int processos: Opcional. Número de processos usados na
+        renderização. Se não informado, será o número de CPUs. Se for ``0``
+        os extratos serão renderizados no próprio processo.
+
+    :param int tamanho_bloco: Opcional. Número de documentos enviados a cada
+        processo por vez.
+
+    :returns: Um gerador que produz os bytes de cada extrato ou, para os
+        documentos que não puderem ser renderizados, uma instância de
+        :class:`Falha`.
+    """
+    return executar(
+            _renderizar,
+            documentos,
+            _iniciar_processo,
+            (perfil(impressora), config or config_padrao(), resumido),
+            processos=processos,
+            tamanho_bloco=tamanho_bloco
+        )
+
+
+def executar(
+        funcao,
+        documentos,
+        inicializador,
+        argumentos,
+        processos=None,
+        tamanho_bloco=1):
+    """Aplica a função sobre a tarefa de cada documento (veja
+    :mod:`satextrato.lote`), em um conjunto de processos, produzindo os
+    resultados na mesma ordem em que os documentos foram informados.
+
+    Os documentos são consumidos à medida que os resultados são produzidos:
+    no máximo dois blocos por processo ficam pendentes, de modo que a memória
+    utilizada não depende do número de documentos.
+
+    :param funcao: Função que recebe a tarefa de um documento.
+
+    :param inicializador: Função invocada com os ``argumentos`` no início de
+        cada processo.
+
+    :param int processos: Opcional. Veja :func:`renderizar`.
+
+    :param int tamanho_bloco: Opcional. Veja :func:`renderizar`.
+
+    :returns: Um gerador que produz o resultado de cada documento ou, se a
+        função falhar, uma instância de :class:`Falha`.
+    """
+    for indice, resultado in enumerate(_executar(
+            funcao,
+            documentos,
+            inicializador,
+            argumentos,
+            processos,
+            tamanho_bloco)):
+        if isinstance(resultado, Falha):
+            resultado = resultado._replace(indice=indice)
+        yield resultado
+
+
+def _executar(
+        funcao,
+        documentos,
+        inicializador,
+        argumentos,
+        processos,
+        tamanho_bloco):
+    tarefas = _tarefas(documentos)
+
+    if processos == 0:
+        inicializador(*argumentos)
+        for tarefa in tarefas:
+            yield _aplicar(funcao, tarefa)
+        return
+
+    processos = processos or multiprocessing.cpu_count()
+    pool = multiprocessing.Pool(
+            processes=processos,
+            initializer=inicializador,
+            initargs=argumentos
+        )
+    try:
+        pendentes = collections.deque()
+        for bloco in _blocos(tarefas, tamanho_bloco):
+            pendentes.append(pool.apply_async(_bloco, (funcao, bloco)))
+            if len(pendentes) >= 2 * processos:
+                for resultado in pendentes.popleft().get():
+                    yield resultado
+        while pendentes:
+            for resultado in pendentes.popleft().get():
+                yield resultado
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+
+
+def imprimir(documentos, impressora, **kwargs):
+    """Imprime os extratos dos documentos, renderizados em paralelo, na
+    ordem em que foram informados. Os argumentos nomeados são os mesmos de
+    :func:`renderizar`. Os documentos que não puderem ser renderizados são
+    ignorados (e registrados no *log*).
+
+    :returns: O número de extratos impressos.
+    :rtype: int
+    """
+    quantidade = 0
+    for dados in renderizar(documentos, impressora, **kwargs):
+        if isinstance(dados, Falha):
+            logger.error(
+                    'documento %d nao impresso: %s',
+                    dados.indice,
+                    dados.erro
+                )
+            continue
+        impressora.device.write(dados)
+        quantidade += 1
+    return quantidade
+
+
+def _tarefas(documentos):
+    # um documento que não possa ser lido é substituído pela sua falha, que
+    # segue na mesma posição do lote
+    for documento in documentos:
+        try:
+            yield _tarefa(documento)
+        except Exception as erro:
+            logger.debug('falha ao ler documento', exc_info=True)
+            yield _falha(erro)
+
+
+def _tarefa(documento):
+    # file objects não podem ser enviados a outro processo; o conteúdo é
+    # lido aqui, enquanto caminhos são lidos pelo processo que renderiza
+    if isinstance(documento, tuple):
+        venda, cancelamento = documento
+        return (_conteudo(venda), _conteudo(cancelamento))
+    return _conteudo(documento)
+
+
+def _blocos(tarefas, tamanho_bloco):
+    bloco = []
+    for tarefa in tarefas:
+        bloco.append(tarefa)
+        if len(bloco) >= tamanho_bloco:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def _bloco(funcao, bloco):
+    return [_aplicar(funcao, tarefa) for tarefa in bloco]
+
+
+def _aplicar(funcao, tarefa):
+    if isinstance(tarefa, Falha):
+        return tarefa
+    try:
+        return funcao(tarefa)
+    except Exception as erro:
+        logger.debug('falha ao processar documento', exc_info=True)
+        return _falha(erro)
+
+
+def _falha(erro):
+    # a exceção é descrita como texto, pois nem todas podem ser enviadas de
+    # volta ao processo principal
+    return Falha(
+            indice=None,
+            erro='{}: {}'.format(erro.__class__.__name__, erro)
+        )
+
+
+def _conteudo(documento):
+    if hasattr(documento, 'read'):
+        return documento.read()
+    return documento
+
+
+def _abrir(conteudo):
+    if isinstance(conteudo, six.binary_type):
+        if conteudo.lstrip().startswith(b'<'):
+            return io.BytesIO(conteudo)
+        return io.open(conteudo, 'rb')  # caminho (Python 2)
+    if conteudo.lstrip().startswith('<'):
+        # nem todos os parsers aceitam textos com declaração de encoding
+        # (lxml), então o conteúdo é passado como bytes, em UTF-8
+        conteudo = _DECLARACAO_ENCODING.sub(r'\1\2UTF-8\2', conteudo, 1)
+        return io.BytesIO(conteudo.encode('utf-8'))
+    return io.open(conteudo, 'rb')
+
+
+def _iniciar_processo(perfil, config, resumido):
+    global _contexto
+    _contexto = (perfil, config, resumido)
+
+
+def _renderizar(tarefa):
+    perfil, config, resumido = _contexto
+    impressora = construir(perfil)
+    extrato = carregar(tarefa, impressora, config=config, resumido=resumido)
+    return extrato.renderizar().serializar(impressora)
@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/modelo.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Modelo compacto dos dados do CF-e-SAT utilizados na impressão dos extratos.
+
+O documento XML é percorrido uma única vez e os dados relevantes para o
+extrato são extraídos para objetos leves (com ``__slots__``), cujos atributos
+recebem os mesmos nomes dos elementos do XML. Os valores monetários e as
+quantidades já são convertidos para :class:`~decimal.Decimal` e alguns fatos
+derivados (como a indicação de ambiente de testes e os totais de descontos e
+acréscimos dos itens tributados pelo ISSQN) são calculados na extração.
+
+.. sourcecode:: python
+
+    from satextrato import modelo
+    from satextrato import parser
+
+    tree = parser.parse('CFe.xml')
+    cfe = modelo.extrair(tree)
+    for item in cfe.itens:
+        print(item.nItem, item.xProd, item.vProd)
+
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from decimal import Decimal
+
+from satcomum import constantes
+
+from . import qr
+
+
+ZERO = Decimal()
+
+
+class _Modelo(object):
+
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        for nome in self.__slots__:
+            setattr(self, nome, kwargs.pop(nome, None))
+        if kwargs:
+            raise TypeError('atributos desconhecidos para {}: {!r}'.format(
+                    self.__class__.__name__, sorted(kwargs)))
+
+    def __repr__(self):
+        return '{}({})'.format(
+                self.__class__.__name__,
+                ', '.join('{}={!r}'.format(nome, getattr(self, nome))
+                          for nome in self.__slots__)
+            )
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.valores() == other.valores()
+
+    def __ne__(self, other):
+        resultado = self.__eq__(other)
+        if resultado is NotImplemented:
+            return resultado
+        return not resultado
+
+    # os objetos são mutáveis e não devem ser usados como chaves; use a
+    # tupla retornada por valores()
+    __hash__ = None
+
+    def valores(self):
+        """Retorna uma tupla com os valores dos atributos do objeto."""
+        return tuple(getattr(self, nome) for nome in self.__slots__)
+
+
+class Identificacao(_Modelo):
+    """Dados de identificação do CF-e, grupo ``ide``."""
+
+    __slots__ = (
+            'cUF',
+            'nserieSAT',
+            'nCFe',
+            'dEmi',
+            'hEmi',
+            'tpAmb',
+            'signAC',
+        )
+
+
+class Emitente(_Modelo):
+    """Dados do emitente do CF-e, grupo ``emit``, incluindo o endereço."""
+
+    __slots__ = (
+            'CNPJ',
+            'xNome',
+            'xFant',
+            'xLgr',
+            'nro',
+            'xCpl',
+            'xBairro',
+            'xMun',
+            'CEP',
+            'IE',
+            'IM',
+        )
+
+
+class Destinatario(_Modelo):
+    """Dados do destinatário do CF-e, grupo ``dest``. O atributo
+    ``documento`` contém o CNPJ ou o CPF, ou uma string vazia.
+    """
+
+    __slots__ = (
+            'documento',
+            'xNome',
+        )
+
+
+class Entrega(_Modelo):
+    """Dados do local de entrega, grupo ``entrega``."""
+
+    __slots__ = (
+            'xLgr',
+            'nro',
+            'xCpl',
+            'xBairro',
+            'xMun',
+            'UF',
+        )
+
+
+class Item(_Modelo):
+    """Um item (produto ou serviço) do CF-e, grupo ``det``. O atributo
+    ``issqn`` indica se o item é tributado pelo ISSQN.
+    """
+
+    __slots__ = (
+            'nItem',
+            'cProd',
+            'xProd',
+            'uCom',
+            'qCom',
+            'vUnCom',
+            'vProd',
+            'vDesc',
+            'vRatDesc',
+            'vOutro',
+            'vRatAcr',
+            'vItem12741',
+            'issqn',
+            'vBC',
+            'vDeducISSQN',
+        )
+
+
+class Totais(_Modelo):
+    """Valores totais do CF-e, grupo ``total``."""
+
+    __slots__ = (
+            'vCFe',
+            'vProd',
+            'vDesc',
+            'vOutro',
+            'vDescSubtot',
+            'vAcresSubtot',
+            'vCFeLei12741',
+        )
+
+
+class MeioPagamento(_Modelo):
+    """Um meio de pagamento, grupo ``pgto/MP``."""
+
+    __slots__ = (
+            'cMP',
+            'vMP',
+        )
+
+
+class ObservacaoFisco(_Modelo):
+    """Uma observação do fisco, grupo ``obsFisco``."""
+
+    __slots__ = (
+            'xCampo',
+            'xTexto',
+        )
+
+
+class CFe(_Modelo):
+    """Os dados de um CF-e-SAT de venda ou de cancelamento.
+
+    Os atributos ``issqn_total_desc`` e ``issqn_total_acres`` contêm os totais
+    de descontos (``vDesc``, I12) e acréscimos (``vOutro``, I13) apenas dos
+    itens tributados pelo ISSQN e são acumulados à medida em que os itens são
+    adicionados (veja :meth:`acumular`).
+
+    O atributo ``ambiente_testes`` é ``None`` apenas enquanto o início do
+    documento não for extraído (veja :func:`extrair_inicio`).
+    """
+
+    __slots__ = (
+            'tag',
+            'chave',
+            'ide',
+            'emitente',
+            'destinatario',
+            'entrega',
+            'itens',
+            'totais',
+            'pagamentos',
+            'vTroco',
+            'observacoes_fisco',
+            'infCpl',
+            'dados_qrcode',
+            'ambiente_testes',
+            'issqn_total_desc',
+            'issqn_total_acres',
+        )
+
+    def __init__(self, **kwargs):
+        super(CFe, self).__init__(**kwargs)
+        self.itens = self.itens or []
+        self.issqn_total_desc = self.issqn_total_desc or ZERO
+        self.issqn_total_acres = self.issqn_total_acres or ZERO
+
+    def acumular(self, item):
+        """Acumula os descontos e acréscimos do item, se ele for tributado
+        pelo ISSQN, sem adicionar o item à lista de itens.
+        """
+        if item.issqn:
+            self.issqn_total_desc += item.vDesc
+            self.issqn_total_acres += item.vOutro
+
+    def adicionar_item(self, item):
+        """Adiciona o item à lista de itens, acumulando seus valores."""
+        self.itens.append(item)
+        self.acumular(item)
+
+
+def extrair(tree):
+    """Extrai os dados de um CF-e-SAT de venda ou de cancelamento.
+
+    :param tree: Instância de :py:mod:`xml.etree.ElementTree.ElementTree`
+        com o documento do CF-e-SAT.
+
+    :raises ValueError: Se o documento XML não for identificado como um
+        CF-e-SAT de venda ou cancelamento.
+
+    :rtype: CFe
+    """
+    cfe = CFe()
+    extrair_inicio(cfe, tree.getroot())
+    for det in tree.getroot().iterfind('./infCFe/det'):
+        cfe.adicionar_item(extrair_item(det))
+    extrair_fim(cfe, tree)
+    return cfe
+
+
+def extrair_inicio(cfe, root):
+    """Extrai os dados que, no documento, precedem os itens: identificação,
+    emitente, destinatário e local de entrega.
+
+    :param cfe: A instância de :class:`CFe` a ser preenchida.
+    :param root: O elemento raiz do documento.
+
+    :raises ValueError: Se o documento XML não for identificado como um
+        CF-e-SAT de venda ou cancelamento.
+    """
+    infCFe = root.find('./infCFe')
+    if infCFe is None or root.tag not in (
+            constantes.ROOT_TAG_VENDA,
+            constantes.ROOT_TAG_CANCELAMENTO):
+        raise ValueError(
+                (
+                    'Documento nao parece ser um CF-e-SAT; root tag: {!r}'
+                ).format(root.tag)
+            )
+    ide = infCFe.find('ide')
+
+    cfe.tag = root.tag
+    cfe.chave = infCFe.get('Id')
+
+    cfe.ide = Identificacao(
+            cUF=ide.findtext('cUF'),
+            nserieSAT=ide.findtext('nserieSAT'),
+            nCFe=ide.findtext('nCFe'),
+            dEmi=ide.findtext('dEmi'),
+            hEmi=ide.findtext('hEmi'),
+            tpAmb=ide.findtext('tpAmb'),
+            signAC=ide.findtext('signAC'),
+        )
+
+    cfe.ambiente_testes = _ambiente_testes(cfe.tag, cfe.ide)
+
+    emit = infCFe.find('emit')
+    if emit is not None:
+        enderEmit = emit.find('enderEmit')
+        cfe.emitente = Emitente(
+                CNPJ=emit.findtext('CNPJ'),
+                xNome=emit.findtext('xNome'),
+                xFant=emit.findtext('xFant'),
+                xLgr=enderEmit.findtext('xLgr'),
+                nro=enderEmit.findtext('nro'),
+                xCpl=enderEmit.findtext('xCpl'),
+                xBairro=enderEmit.findtext('xBairro'),
+                xMun=enderEmit.findtext('xMun'),
+                CEP=enderEmit.findtext('CEP'),
+                IE=emit.findtext('IE'),
+                IM=emit.findtext('IM'),
+            )
+
+    cfe.destinatario = Destinatario(
+            documento=(
+                    infCFe.findtext('dest/CNPJ')
+                    or infCFe.findtext('dest/CPF')
+                    or ''
+                ),
+            xNome=infCFe.findtext('dest/xNome'),
+        )
+
+    entrega = infCFe.find('entrega')
+    if entrega is not None:
+        cfe.entrega = Entrega(
+                xLgr=entrega.findtext('xLgr'),
+                nro=entrega.findtext('nro'),
+                xCpl=entrega.findtext('xCpl'),
+                xBairro=entrega.findtext('xBairro'),
+                xMun=entrega.findtext('xMun'),
+                UF=entrega.findtext('UF'),
+            )
+
+
+def extrair_item(det):
+    """Extrai os dados de um item do CF-e.
+
+    :param det: O n-ésimo elemento ``/CFe/infCFe/det``.
+
+    :rtype: Item
+    """
+    prod = det.find('prod')
+    imposto = det.find('imposto')
+
+    # se cNatOp (U09) presente, assume item tributado pelo ISSQN
+    issqn = imposto.find('ISSQN/cNatOp') is not None
+
+    return Item(
+            nItem=int(det.attrib['nItem']),
+            cProd=prod.findtext('cProd'),
+            xProd=prod.findtext('xProd'),
+            uCom=prod.findtext('uCom'),
+            qCom=Decimal(prod.findtext('qCom')),
+            vUnCom=Decimal(prod.findtext('vUnCom')),
+            vProd=Decimal(prod.findtext('vProd')),
+            vDesc=Decimal(prod.findtext('vDesc') or 0),
+            vRatDesc=Decimal(prod.findtext('vRatDesc') or 0),
+            vOutro=Decimal(prod.findtext('vOutro') or 0),
+            vRatAcr=Decimal(prod.findtext('vRatAcr') or 0),
+            vItem12741=Decimal(imposto.findtext('vItem12741') or 0),
+            issqn=issqn,
+            vBC=Decimal(imposto.findtext('ISSQN/vBC') or 0),
+            vDeducISSQN=Decimal(imposto.findtext('ISSQN/vDeducISSQN') or 0),
+        )
+
+
+def extrair_fim(cfe, tree):
+    """Extrai os dados que, no documento, seguem os itens: totais,
+    pagamentos, informações adicionais e os dados do QRCode.
+
+    :param cfe: A instância de :class:`CFe` a ser preenchida.
+
+    :param tree: Instância de :py:mod:`xml.etree.ElementTree.ElementTree`
+        com o documento do CF-e-SAT.
+    """
+    infCFe = tree.getroot().find('./infCFe')
+
+    cfe.totais = Totais(
+            vCFe=Decimal(infCFe.findtext('total/vCFe')),
+            vProd=_decimal(infCFe.findtext('total/ICMSTot/vProd')),
+            vDesc=Decimal(infCFe.findtext('total/ICMSTot/vDesc') or 0),
+            vOutro=Decimal(infCFe.findtext('total/ICMSTot/vOutro') or 0),
+            vDescSubtot=Decimal(
+                    infCFe.findtext('total/DescAcrEntr/vDescSubtot') or 0
+                ),
+            vAcresSubtot=Decimal(
+                    infCFe.findtext('total/DescAcrEntr/vAcresSubtot') or 0
+                ),
+            vCFeLei12741=Decimal(
+                    infCFe.findtext('total/vCFeLei12741') or 0
+                ),
+        )
+
+    cfe.pagamentos = [
+            MeioPagamento(
+                    cMP=mp.findtext('cMP'),
+                    vMP=Decimal(mp.findtext('vMP'))
+                )
+            for mp in infCFe.iterfind('pgto/MP')
+        ]
+
+    cfe.vTroco = Decimal(infCFe.findtext('pgto/vTroco') or 0)
+
+    cfe.observacoes_fisco = [
+            ObservacaoFisco(
+                    xCampo=obs.attrib['xCampo'],
+                    xTexto=obs.findtext('xTexto')
+                )
+            for obs in infCFe.iterfind('infAdic/obsFisco')
+        ]
+
+    cfe.infCpl = infCFe.findtext('infAdic/infCpl')
+    cfe.dados_qrcode = qr.dados(cfe.chave, tree)
+
+
+def _decimal(valor):
+    return None if valor is None else Decimal(valor)
+
+
+def _ambiente_testes(tag, ide):
+    # Elemento B10 `tpAmb` igual a `2` (ambiente de testes) ou elemento
+    # B12 `signAC` com a assinatura de teste; o CF-e-SAT de cancelamento
+    # não possui o elemento `tpAmb`
+    if tag == constantes.ROOT_TAG_VENDA:
+        return (ide.tpAmb == constantes.B10_TESTES
+                or ide.signAC == constantes.ASSINATURA_AC_TESTE)
+
+    elif tag == constantes.ROOT_TAG_CANCELAMENTO:
+        return ide.signAC == constantes.ASSINATURA_AC_TESTE
+
+    return None
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/parser.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Implementações para interpretação dos documentos XML dos CF-e.
+
+Por padrão será usada a biblioteca `lxml <https://lxml.de/>`_, se estiver
+instalada, cujo *parser* (escrito em C) é consideravelmente mais rápido,
+ou o módulo ``xml.etree.ElementTree`` da biblioteca padrão. A implementação
+pode ser determinada pela variável de ambiente ``SATEXTRATO_XML_PARSER``
+(veja :attr:`satextrato.config.SATEXTRATO_XML_PARSER`) ou através da função
+:func:`selecionar`:
+
+.. sourcecode:: python
+
+    from satextrato import parser
+    parser.selecionar('etree')
+
+Ambas as implementações produzem árvores com a mesma interface
+(``find``, ``findall``, ``findtext``, ``attrib``, etc), de modo que o
+restante da biblioteca não depende da implementação escolhida.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import threading
+
+from collections import namedtuple
+
+from decouple import config as getenv
+
+from .config import DEFAULT_XML_PARSER
+from .config import SATEXTRATO_XML_PARSER
+
+
+LXML = 'lxml'
+ETREE = 'etree'
+AUTO = 'auto'
+
+
+Implementacao = namedtuple('Implementacao', [
+        'nome',  # str
+        'parse',  # callable(fp) -> ElementTree
+        'iterparse',  # callable(fp, events) -> iterator
+        'ElementTree',  # callable(root) -> ElementTree
+    ])
+
+
+_lock = threading.Lock()
+_ativa = None
+
+
+def _etree():
+    import xml.etree.ElementTree as ET
+    return Implementacao(
+            nome=ETREE,
+            parse=ET.parse,
+            iterparse=ET.iterparse,
+            ElementTree=ET.ElementTree
+        )
+
+
+def _lxml():
+    from lxml import etree
+
+    # não resolve entidades nem acessa a rede, e mantém os limites de
+    # tamanho e profundidade da libxml2; os CF-e são documentos pequenos
+    def parse(fp):
+        return etree.parse(fp, etree.XMLParser(
+                resolve_entities=False,
+                no_network=True
+            ))
+
+    def iterparse(fp, events=('end',)):
+        return etree.iterparse(
+                fp,
+                events=events,
+                resolve_entities=False,
+                no_network=True
+            )
+
+    return Implementacao(
+            nome=LXML,
+            parse=parse,
+            iterparse=iterparse,
+            ElementTree=etree.ElementTree
+        )
+
+
+_IMPLEMENTACOES = {
+        ETREE: _etree,
+        LXML: _lxml,
+    }
+
+
+def selecionar(nome=AUTO):
+    """Seleciona a implementação usada para interpretar os documentos XML.
+
+    :param str nome: Opcional. ``lxml``, ``etree`` ou ``auto`` (padrão), que
+        usará ``lxml`` se estiver instalada ou, caso contrário, ``etree``.
+
+    :raises ValueError: Se o nome da implementação não for conhecido.
+
+    :raises ImportError: Se ``lxml`` for explicitamente selecionada, mas
+        não estiver instalada.
+
+    :returns: A implementação selecionada.
+    :rtype: Implementacao
+    """
+    global _ativa
+    nome = (nome or AUTO).strip().lower()
+    if nome == AUTO:
+        try:
+            implementacao = _lxml()
+        except ImportError:
+            implementacao = _etree()
+    elif nome in _IMPLEMENTACOES:
+        implementacao = _IMPLEMENTACOES[nome]()
+    else:
+        raise ValueError(
+                'Implementacao de parser XML desconhecida: {!r} (esperado '
+                'um de: {})'.format(nome, ', '.join((AUTO, LXML, ETREE)))
+            )
+    with _lock:
+        _ativa = implementacao
+    return implementacao
+
+
+def ativa():
+    """Obtém a implementação ativa, selecionando-a conforme a variável de
+    ambiente ``SATEXTRATO_XML_PARSER`` se nenhuma tiver sido selecionada.
+
+    :rtype: Implementacao
+    """
+    implementacao = _ativa
+    if implementacao is None:
+        implementacao = selecionar(getenv(
+                SATEXTRATO_XML_PARSER,
+                default=DEFAULT_XML_PARSER
+            ))
+    return implementacao
+
+
+def parse(fp):
+    """Interpreta o documento XML usando a implementação ativa.
+
+    :param fp: Um objeto *file-like* ou o caminho para o arquivo XML.
+    """
+    return ativa().parse(fp)
+
+
+def iterparse(fp, events=('end',)):
+    """Interpreta incrementalmente o documento XML usando a implementação
+    ativa. Veja ``xml.etree.ElementTree.iterparse``.
+    """
+    return ativa().iterparse(fp, events=events)
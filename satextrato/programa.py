@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/programa.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import sys
+import threading
+import time
+
+from collections import OrderedDict
+from collections import namedtuple
+from contextlib import contextmanager
+
+
+_DESCONHECIDO = object()
+
+_JUSTIFICACAO = 'justificacao'
+_NEGRITO = 'negrito'
+_EXPANDIDO = 'expandido'
+_CONDENSADO = 'condensado'
+
+_MODOS = {
+        # nome da operação: (modo, função que extrai o valor do modo)
+        'justify_center': (_JUSTIFICACAO, lambda args: 'center'),
+        'justify_left': (_JUSTIFICACAO, lambda args: 'left'),
+        'justify_right': (_JUSTIFICACAO, lambda args: 'right'),
+        'set_emphasized': (_NEGRITO, lambda args: bool(args[0])),
+        'set_expanded': (_EXPANDIDO, lambda args: bool(args[0])),
+        'set_condensed': (_CONDENSADO, lambda args: bool(args[0])),
+    }
+
+
+class Programa(object):
+    """Um programa de impressão, isto é, uma lista de operações ESC/POS que
+    ainda não foram enviadas à impressora.
+
+    Um programa implementa a mesma interface utilizada pelos extratos para
+    acessar a impressora (:class:`escpos.impl.epson.GenericESCPOS`), mas
+    apenas registra as operações, que poderão ser otimizadas (veja
+    :meth:`otimizar`) e depois executadas de uma só vez em uma impressora
+    real (veja :meth:`executar`):
+
+    .. sourcecode:: python
+
+        extrato = ExtratoCFeVenda(fp, impressora)
+        programa = extrato.renderizar()
+        programa.executar(impressora)
+
+    Cada operação é uma tupla ``(nome, args, kwargs)``, onde ``nome`` é o
+    nome do método da impressora que deverá ser invocado.
+    """
+
+    def __init__(self, impressora, operacoes=None):
+        """Inicia uma instância de :class:`Programa`.
+
+        :param impressora: A impressora para a qual o programa está sendo
+            gerado. É utilizada apenas para consultar os recursos do
+            equipamento (colunas, guilhotina, etc).
+
+        :param operacoes: Opcional. Uma sequência de operações, cada uma
+            delas uma tupla ``(nome, args, kwargs)``.
+
+        """
+        super(Programa, self).__init__()
+        self._impressora = impressora
+        self.operacoes = list(operacoes or [])
+
+    def __len__(self):
+        return len(self.operacoes)
+
+    def __iter__(self):
+        return iter(self.operacoes)
+
+    @property
+    def feature(self):
+        return self._impressora.feature
+
+    @property
+    def hardware_features(self):
+        return self._impressora.hardware_features
+
+    def _registrar(self, nome, *args, **kwargs):
+        self.operacoes.append((nome, args, kwargs))
+
+    def text(self, text):
+        self._registrar('text', text)
+
+    def textout(self, text):
+        self._registrar('textout', text)
+
+    def lf(self, lines=1):
+        self._registrar('lf', lines=lines)
+
+    def justify_center(self):
+        self._registrar('justify_center')
+
+    def justify_left(self):
+        self._registrar('justify_left')
+
+    def justify_right(self):
+        self._registrar('justify_right')
+
+    def set_emphasized(self, flag):
+        self._registrar('set_emphasized', flag)
+
+    def set_expanded(self, flag):
+        self._registrar('set_expanded', flag)
+
+    def set_condensed(self, flag):
+        self._registrar('set_condensed', flag)
+
+    def code128(self, data, **kwargs):
+        self._registrar('code128', data, **kwargs)
+
+    def qrcode(self, data, **kwargs):
+        self._registrar('qrcode', data, **kwargs)
+
+    def cut(self, **kwargs):
+        self._registrar('cut', **kwargs)
+
+    def escrever(self, dados):
+        self._registrar('escrever', dados)
+
+    def otimizar(self, passos=None):
+        """Retorna um novo programa resultante da aplicação dos passos de
+        otimização sobre as operações deste programa.
+
+        :param passos: Opcional. Uma sequência de funções que recebem uma
+            lista de operações e retornam uma nova lista de operações. Se
+            não informado, serão aplicados os passos em :data:`PASSOS`.
+
+        :rtype: Programa
+        """
+        operacoes = self.operacoes
+        for passo in (PASSOS if passos is None else passos):
+            operacoes = passo(operacoes)
+        return Programa(self._impressora, operacoes=operacoes)
+
+    def aplicar(self, alvo):
+        """Invoca as operações deste programa, na ordem em que foram
+        registradas, sobre o objeto ``alvo``, que poderá ser uma impressora
+        ou mesmo outro programa.
+        """
+        for nome, args, kwargs in self.operacoes:
+            if nome == 'escrever':
+                escrever(alvo, *args)
+            else:
+                getattr(alvo, nome)(*args, **kwargs)
+
+    def executar(self, impressora):
+        """Executa o programa na impressora informada. Os comandos gerados
+        pela impressora são acumulados e enviados ao dispositivo em uma única
+        escrita, exceto quando a impressora precisar ler do dispositivo (por
+        exemplo, após imprimir códigos de barras), situação em que os dados
+        acumulados até então são enviados antes da leitura.
+
+        :param impressora: Uma instância de
+            :class:`escpos.impl.epson.GenericESCPOS` (ou especialização).
+        """
+        device = impressora.device
+        buffer = _DispositivoBuffer(device)
+        impressora.device = buffer
+        try:
+            self.aplicar(impressora)
+            buffer.flush()
+        finally:
+            impressora.device = device
+
+    def serializar(self, impressora):
+        """Obtém os bytes que seriam enviados ao dispositivo caso o programa
+        fosse executado na impressora informada, sem enviar nada ao
+        dispositivo.
+
+        :rtype: bytes
+        """
+        device = impressora.device
+        captura = _DispositivoCaptura()
+        impressora.device = captura
+        try:
+            with sem_pausas(impressora):
+                self.aplicar(impressora)
+        finally:
+            impressora.device = device
+        return b''.join(captura.dados)
+
+
+@contextmanager
+def sem_pausas(impressora):
+    """Suprime, na *thread* corrente, as pausas que as implementações da
+    PyESCPOS fazem após enviar códigos de barras e QRCodes (aguardando a
+    impressão para então ler a resposta do dispositivo). Deve ser usado
+    apenas quando as escritas forem capturadas, sem um dispositivo real do
+    outro lado:
+
+    .. sourcecode:: python
+
+        impressora = construir(perfil(impressora))
+        with sem_pausas(impressora):
+            impressora.code128(dados)
+
+    As pausas das impressoras usadas em outras *threads* não são afetadas.
+    Os módulos da PyESCPOS são alterados apenas enquanto houver algum
+    contexto :func:`sem_pausas` ativo, sendo restaurados ao final.
+    """
+    modulos = _modulos_com_pausas(_real(impressora).__class__)
+    _instalar_relogio(modulos)
+    anterior = getattr(_local, 'sem_pausas', False)
+    _local.sem_pausas = True
+    try:
+        yield
+    finally:
+        _local.sem_pausas = anterior
+        _remover_relogio(modulos)
+
+
+def escrever(alvo, dados):
+    """Envia os bytes, sem qualquer transformação, para a impressora (através
+    do seu dispositivo) ou para o programa ``alvo``.
+    """
+    metodo = getattr(alvo, 'escrever', None)
+    if metodo is None:
+        alvo.device.write(dados)
+    else:
+        metodo(dados)
+
+
+PerfilImpressora = namedtuple('PerfilImpressora', [
+        'classe',  # subclasse de GenericESCPOS
+        'features',  # dict
+        'encoding',  # str
+        'encoding_errors',  # str
+    ])
+
+
+def perfil(impressora):
+    """Obtém o perfil da impressora, a partir do qual uma impressora
+    equivalente pode ser construída (inclusive em outro processo).
+
+    :param impressora: Uma impressora, uma classe de impressora (com os
+        recursos e a codificação padrões; nenhuma conexão é feita) ou um
+        :class:`PerfilImpressora`, que é retornado sem alterações.
+
+    :rtype: PerfilImpressora
+    """
+    if isinstance(impressora, PerfilImpressora):
+        return impressora
+    if isinstance(impressora, type):
+        impressora = impressora(_DispositivoCaptura())
+    impressora = _real(impressora)
+    return PerfilImpressora(
+            classe=impressora.__class__,
+            features=dict(impressora.hardware_features),
+            encoding=impressora.encoding,
+            encoding_errors=impressora.encoding_errors
+        )
+
+
+def construir(perfil, dispositivo=None):
+    """Constrói uma impressora a partir do perfil. Se o dispositivo não for
+    informado, as escritas serão apenas acumuladas (a impressora não estará
+    conectada a um dispositivo real; veja :func:`sem_pausas`).
+    """
+    return perfil.classe(
+            dispositivo or _DispositivoCaptura(),
+            features=perfil.features,
+            encoding=perfil.encoding,
+            encoding_errors=perfil.encoding_errors
+        )
+
+
+def _real(impressora):
+    # a impressora real, se estiver intermediada (por exemplo, por uma
+    # satextrato.instrumentacao.ImpressoraInstrumentada)
+    while hasattr(impressora.__class__, 'impressora'):
+        impressora = impressora.impressora
+    return impressora
+
+
+class _Relogio(object):
+    # substitui o módulo time nas implementações da PyESCPOS; as pausas são
+    # suprimidas apenas na thread que estiver em sem_pausas()
+
+    def __getattr__(self, attr):
+        return getattr(time, attr)
+
+    def sleep(self, segundos):
+        if not getattr(_local, 'sem_pausas', False):
+            time.sleep(segundos)
+
+
+_local = threading.local()
+_RELOGIO = _Relogio()
+_lock = threading.Lock()
+_instalados = {}  # módulo -> número de contextos sem_pausas() ativos
+
+
+def _modulos_com_pausas(classe):
+    # as pausas são feitas através do módulo time importado por cada módulo
+    # de implementação (epson, bematech, daruma, etc)
+    modulos = []
+    for base in classe.__mro__:
+        modulo = sys.modules.get(base.__module__)
+        if (modulo not in modulos
+                and getattr(modulo, 'time', None) in (time, _RELOGIO)):
+            modulos.append(modulo)
+    return modulos
+
+
+def _instalar_relogio(modulos):
+    with _lock:
+        for modulo in modulos:
+            ativos = _instalados.get(modulo, 0)
+            if not ativos:
+                modulo.time = _RELOGIO
+            _instalados[modulo] = ativos + 1
+
+
+def _remover_relogio(modulos):
+    with _lock:
+        for modulo in modulos:
+            ativos = _instalados.pop(modulo) - 1
+            if ativos:
+                _instalados[modulo] = ativos
+            else:
+                modulo.time = time
+
+
+class _DispositivoCaptura(object):
+    # captura as escritas, sem um dispositivo real do outro lado
+
+    def __init__(self):
+        self.dados = []
+
+    def write(self, data):
+        self.dados.append(data)
+
+    def read(self):
+        return None
+
+    def catch(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _DispositivoBuffer(object):
+    # acumula as escritas destinadas ao dispositivo real; os dados são
+    # efetivamente escritos em flush() ou antes de uma leitura
+
+    def __init__(self, device):
+        self._device = device
+        self._buffer = []
+
+    def __getattr__(self, attr):
+        return getattr(self._device, attr)
+
+    def write(self, data):
+        self._buffer.append(data)
+
+    def read(self):
+        self.flush()
+        return self._device.read()
+
+    def flush(self):
+        if self._buffer:
+            dados = b''.join(self._buffer)
+            self._buffer = []
+            self._device.write(dados)
+
+
+def _modo(operacao):
+    nome, args, kwargs = operacao
+    if nome in _MODOS:
+        modo, valor = _MODOS[nome]
+        return modo, valor(args)
+    return None, None
+
+
+def _consolidar(operacoes, modos):
+    # Mantém pendentes as operações que alteram os modos informados até que
+    # surja uma operação que produza saída; então, emite apenas a última
+    # operação de cada modo e somente se ela alterar o estado conhecido.
+    resultado = []
+    atual = {}
+    pendentes = OrderedDict()
+
+    def descarregar():
+        for modo, (operacao, valor) in pendentes.items():
+            if atual.get(modo, _DESCONHECIDO) != valor:
+                resultado.append(operacao)
+                atual[modo] = valor
+        pendentes.clear()
+
+    for operacao in operacoes:
+        modo, valor = _modo(operacao)
+        if modo in modos:
+            pendentes.pop(modo, None)
+            pendentes[modo] = (operacao, valor)
+        elif modo is not None:
+            # altera um modo que não é tratado neste passo
+            resultado.append(operacao)
+        else:
+            descarregar()
+            resultado.append(operacao)
+
+    descarregar()
+    return resultado
+
+
+def dobrar_justificacao(operacoes):
+    """Passo de otimização que descarta as mudanças de justificação que não
+    têm efeito, seja porque são imediatamente substituídas por outra, antes
+    que qualquer coisa seja impressa, seja porque a impressora já está com
+    a justificação solicitada.
+    """
+    return _consolidar(operacoes, (_JUSTIFICACAO,))
+
+
+def descartar_alternancias(operacoes):
+    """Passo de otimização que descarta as alternâncias de negrito, expandido
+    e condensado que se anulam (por exemplo, ligar e desligar o negrito sem
+    imprimir nada entre uma coisa e outra) ou que são redundantes.
+
+    .. note::
+
+        Assume que os modos negrito, expandido e condensado são independentes
+        entre si, da mesma forma que :class:`~satextrato.base.ExtratoCFe`.
+
+    """
+    return _consolidar(operacoes, (_NEGRITO, _EXPANDIDO, _CONDENSADO))
+
+
+def juntar_linhas(operacoes):
+    """Passo de otimização que junta as operações ``text`` e ``lf``
+    adjacentes em uma única operação ``textout``, cujo texto contém as
+    linhas e os avanços separados por ``\\n``, produzindo exatamente os
+    mesmos bytes quando a codificação da impressora for compatível com ASCII.
+    """
+    resultado = []
+    bloco = []
+
+    def fechar_bloco():
+        if len(bloco) == 1:
+            resultado.append(bloco[0])
+        elif bloco:
+            partes = []
+            for nome, args, kwargs in bloco:
+                if nome == 'text':
+                    partes.append(args[0])
+                    partes.append('\n')
+                else:
+                    linhas = kwargs.get('lines', args[0] if args else 1)
+                    partes.append('\n' * linhas)
+            resultado.append(('textout', (''.join(partes),), {}))
+        bloco[:] = []
+
+    for operacao in operacoes:
+        if operacao[0] in ('text', 'lf'):
+            bloco.append(operacao)
+        else:
+            fechar_bloco()
+            resultado.append(operacao)
+
+    fechar_bloco()
+    return resultado
+
+
+PASSOS = (
+        dobrar_justificacao,
+        descartar_alternancias,
+        juntar_linhas,
+    )
+"""Passos de otimização aplicados por padrão em :meth:`Programa.otimizar`."""
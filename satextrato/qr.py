@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/qr.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Conteúdo e imagens dos QRCodes impressos nos extratos.
+
+O conteúdo do QRCode de cada CF-e é mantido em cache, pela chave do CF-e, de
+modo que as reimpressões não precisem calculá-lo novamente.
+
+Impressoras sem suporte nativo a QRCode podem imprimi-lo como uma imagem
+(*raster*), gerada pela biblioteca `qrcode <https://pypi.org/project/qrcode/>`_
+(que precisa estar instalada). Para isso a impressora deverá indicar o
+recurso :data:`QRCODE_RASTER`:
+
+.. sourcecode:: python
+
+    from satextrato import qr
+
+    impressora = GenericESCPOS(conn, features={qr.QRCODE_RASTER: True})
+
+As imagens são geradas em uma *thread* enquanto o corpo do extrato é
+impresso (veja :func:`preparar`) e mantidas em um cache de tamanho limitado.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import logging
+import struct
+import threading
+
+import six
+
+from satcomum import ersat
+
+from .cache import LRU
+
+
+logger = logging.getLogger('satextrato.qr')
+
+
+QRCODE_RASTER = 'qrcode-raster'
+"""
+Recurso da impressora (veja ``hardware_features`` da PyESCPOS) que indica que
+o QRCode deverá ser impresso como uma imagem, gerada por esta biblioteca, em
+vez de usar o comando nativo de impressão de QRCodes. Se a biblioteca
+``qrcode`` não estiver instalada, o recurso é ignorado e o comando nativo é
+usado.
+"""
+
+_MARGEM = 4  # módulos; zona de silêncio exigida pela especificação
+
+_DADOS = LRU(tamanho=1024)
+_RASTERS = LRU(tamanho=128)
+_MATRIZES = LRU(tamanho=128)
+_pendentes = {}
+_lock = threading.Lock()
+
+
+def dados(chave_cfe, tree):
+    """Obtém o conteúdo do QRCode do CF-e, a partir do cache se o CF-e com a
+    chave informada já tiver sido processado.
+
+    :param str chave_cfe: A chave do CF-e (atributo ``Id`` de ``infCFe``).
+    :param tree: A árvore do documento XML do CF-e.
+    :rtype: str
+    """
+    conteudo = _DADOS.obter(chave_cfe) if chave_cfe else None
+    if conteudo is None:
+        conteudo = ersat.dados_qrcode(tree)
+        if chave_cfe:
+            _DADOS.armazenar(chave_cfe, conteudo)
+    return conteudo
+
+
+def disponivel():
+    """Indica se a biblioteca ``qrcode``, necessária para gerar as imagens,
+    está instalada.
+    """
+    try:
+        import qrcode  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def preparar(conteudo, tamanho_modulo, nivel_correcao):
+    """Inicia, em uma *thread*, a geração da imagem do QRCode, se ainda não
+    estiver no cache ou em andamento. Não faz nada se a biblioteca ``qrcode``
+    não estiver instalada.
+    """
+    if not disponivel():
+        return
+    chave = _chave(conteudo, tamanho_modulo, nivel_correcao)
+    with _lock:
+        if chave in _RASTERS or chave in _pendentes:
+            return
+        evento = threading.Event()
+        _pendentes[chave] = evento
+    thread = threading.Thread(
+            target=_gerar_em_segundo_plano,
+            args=(chave, evento),
+            name='satextrato-qr'
+        )
+    thread.daemon = True
+    thread.start()
+
+
+def raster(conteudo, tamanho_modulo, nivel_correcao):
+    """Obtém o comando ESC/POS (``GS v 0``) que imprime o QRCode como uma
+    imagem. Se a imagem estiver sendo gerada em segundo plano, aguarda até
+    que esteja pronta.
+
+    :param str conteudo: O conteúdo do QRCode.
+
+    :param int tamanho_modulo: Tamanho de cada módulo, em pontos. Veja
+        :attr:`satextrato.config.QRCode.tamanho_modulo`.
+
+    :param nivel_correcao: Nível de correção de erros (``L``, ``M``, ``Q``
+        ou ``H``). Veja :attr:`satextrato.config.QRCode.nivel_correcao`.
+
+    :raises ImportError: Se a biblioteca ``qrcode`` não estiver instalada.
+
+    :rtype: bytes
+    """
+    chave = _chave(conteudo, tamanho_modulo, nivel_correcao)
+    comando = _RASTERS.obter(chave)
+    if comando is None:
+        with _lock:
+            evento = _pendentes.get(chave)
+        if evento is not None:
+            evento.wait()
+            comando = _RASTERS.obter(chave)
+        if comando is None:
+            comando = _gerar(*chave)
+            _RASTERS.armazenar(chave, comando)
+    return comando
+
+
+def _chave(conteudo, tamanho_modulo, nivel_correcao):
+    if isinstance(nivel_correcao, six.binary_type):
+        nivel_correcao = nivel_correcao.decode('ascii')
+    return (conteudo, int(tamanho_modulo), nivel_correcao.upper())
+
+
+def _gerar_em_segundo_plano(chave, evento):
+    try:
+        _RASTERS.armazenar(chave, _gerar(*chave))
+    except Exception:
+        logger.exception('falha ao gerar imagem do QRCode')
+    finally:
+        with _lock:
+            _pendentes.pop(chave, None)
+        evento.set()
+
+
+def matriz(conteudo, nivel_correcao):
+    """Obtém a matriz de módulos do QRCode, incluindo a zona de silêncio.
+
+    :param str conteudo: O conteúdo do QRCode.
+
+    :param nivel_correcao: Nível de correção de erros (``L``, ``M``, ``Q``
+        ou ``H``).
+
+    :raises ImportError: Se a biblioteca ``qrcode`` não estiver instalada.
+
+    :returns: Uma tupla de linhas, cada uma delas uma tupla de valores
+        booleanos que indicam se o módulo é escuro.
+    """
+    chave = _chave(conteudo, 1, nivel_correcao)
+    resultado = _MATRIZES.obter(chave)
+    if resultado is None:
+        resultado = tuple(
+                tuple(linha) for linha in _matriz(conteudo, chave[2])
+            )
+        _MATRIZES.armazenar(chave, resultado)
+    return resultado
+
+
+def _matriz(conteudo, nivel_correcao):
+    import qrcode
+
+    niveis = {
+            'L': qrcode.constants.ERROR_CORRECT_L,
+            'M': qrcode.constants.ERROR_CORRECT_M,
+            'Q': qrcode.constants.ERROR_CORRECT_Q,
+            'H': qrcode.constants.ERROR_CORRECT_H,
+        }
+
+    simbolo = qrcode.QRCode(
+            error_correction=niveis[nivel_correcao],
+            box_size=1,
+            border=_MARGEM
+        )
+    simbolo.add_data(conteudo)
+    simbolo.make(fit=True)
+    return simbolo.get_matrix()
+
+
+def _gerar(conteudo, tamanho_modulo, nivel_correcao):
+    matriz = _matriz(conteudo, nivel_correcao)
+
+    largura = len(matriz[0]) * tamanho_modulo
+    bytes_linha = (largura + 7) // 8
+
+    linhas = []
+    for modulos in matriz:
+        pontos = 0
+        for escuro in modulos:
+            pontos <<= tamanho_modulo
+            if escuro:
+                pontos |= (1 << tamanho_modulo) - 1
+        pontos <<= bytes_linha * 8 - largura  # completa o último byte
+        linha = _int_para_bytes(pontos, bytes_linha)
+        linhas.append(linha * tamanho_modulo)
+
+    altura = len(matriz) * tamanho_modulo
+    return (
+            b'\x1d\x76\x30\x00'  # GS v 0, modo normal
+            + struct.pack('<HH', bytes_linha, altura)
+            + b''.join(linhas)
+        )
+
+
+def _int_para_bytes(valor, tamanho):
+    return bytes(bytearray(
+            (valor >> (8 * i)) & 0xff
+            for i in reversed(range(tamanho))
+        ))
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/renderizacao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Perfil de renderização dos extratos: os valores que dependem apenas da
+impressora e das configurações, calculados uma única vez e compartilhados
+por todos os extratos emitidos para a mesma impressora com as mesmas
+configurações.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from collections import namedtuple
+
+from . import layout
+from . import qr
+from .cache import LRU
+from .cache import _perfil_impressora
+from .programa import perfil
+
+
+PerfilRenderizacao = namedtuple('PerfilRenderizacao', [
+        'assinatura',  # str, veja satextrato.cache._perfil_impressora
+        'impressora',  # satextrato.programa.PerfilImpressora
+        'escpos',  # bool, se a impressora é uma implementação ESC/POS
+        'codificacao',  # str ou None, veja satextrato.transliteracao
+        'colunas',  # escpos.feature.Columns
+        'qrcode_raster',  # bool, veja satextrato.qr.QRCODE_RASTER
+        'code128',  # dict, argumentos para o método code128 da impressora
+        'cortar',  # bool, se o documento deve ser guilhotinado
+        'mensagem_qrcode',  # dict, linhas da mensagem por largura
+        'rodape',  # dict, linha do rodapé por largura (vazio se não houver)
+    ])
+
+_PERFIS = LRU(tamanho=64)
+
+
+def obter(impressora, config, codificacao):
+    """Obtém o perfil de renderização para a impressora e as configurações,
+    a partir do cache se já tiver sido construído.
+
+    :param impressora: A impressora (ou qualquer objeto que a intermedie).
+
+    :param config: Uma instância de :class:`satextrato.config.Configuracoes`.
+
+    :param codificacao: A codificação dos textos. Veja
+        :func:`satextrato.transliteracao.codificacao`.
+
+    :rtype: PerfilRenderizacao
+    """
+    assinatura = _perfil_impressora(impressora)
+    chave = (assinatura, codificacao, config)
+    try:
+        resultado = _PERFIS.obter(chave)
+    except TypeError:
+        # configurações com valores mutáveis (por exemplo, uma lista em
+        # `quebrar_partes`) não podem ser usadas como chave
+        return construir(impressora, config, codificacao, assinatura)
+    if resultado is None:
+        resultado = construir(impressora, config, codificacao, assinatura)
+        _PERFIS.armazenar(chave, resultado)
+    return resultado
+
+
+def construir(impressora, config, codificacao, assinatura=None):
+    """Constrói o perfil de renderização, sem consultar o cache.
+
+    :rtype: PerfilRenderizacao
+    """
+    from escpos import barcode
+    from escpos.impl.epson import GenericESCPOS
+
+    perfil_impressora = perfil(impressora)
+    features = perfil_impressora.features
+    colunas = impressora.feature.columns
+    larguras = sorted(set(colunas))
+
+    mensagem = config.qrcode.mensagem.strip()
+    rodape = config.rodape
+
+    return PerfilRenderizacao(
+            assinatura=assinatura or _perfil_impressora(impressora),
+            impressora=perfil_impressora,
+            escpos=issubclass(perfil_impressora.classe, GenericESCPOS),
+            codificacao=codificacao,
+            colunas=colunas,
+            # sem a biblioteca qrcode, o QRCode é impresso com o comando
+            # nativo, em vez de falhar ao final do extrato
+            qrcode_raster=(
+                    bool(features.get(qr.QRCODE_RASTER, False))
+                    and qr.disponivel()
+                ),
+            code128=dict(
+                    barcode_height=config.code128.altura,
+                    barcode_width=barcode.BARCODE_NORMAL_WIDTH,
+                    barcode_hri=barcode.BARCODE_HRI_NONE
+                ),
+            cortar=bool(
+                    impressora.feature.cutter
+                    and config.cupom.cortar_documento
+                ),
+            mensagem_qrcode=dict(
+                    (largura, layout.quebrar(mensagem, largura))
+                    for largura in larguras
+                ) if mensagem else {},
+            rodape=dict(
+                    (
+                        largura,
+                        layout.bordas(
+                                rodape.esquerda,
+                                rodape.direita,
+                                largura=largura,
+                                espacamento_minimo=4
+                            )
+                    )
+                    for largura in larguras
+                ) if rodape.esquerda or rodape.direita else {}
+        )
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/spooler.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+*Spooler* de impressão, para processos que atendem a vários terminais.
+
+Os trabalhos de impressão são enfileirados por impressora e cada impressora
+é atendida por uma única *thread*, de modo que quem solicita a impressão não
+precisa aguardar pela impressora:
+
+.. sourcecode:: python
+
+    from satextrato.spooler import Spooler
+    from satextrato.spooler import PRIORIDADE_REIMPRESSAO
+
+    spooler = Spooler()
+    spooler.registrar('caixa-1', impressora)
+
+    trabalho = spooler.enviar('caixa-1', xml_venda, resumido=True)
+    spooler.enviar('caixa-1', xml_venda, prioridade=PRIORIDADE_REIMPRESSAO)
+
+    trabalho.aguardar(timeout=30)
+
+Os documentos são informados em qualquer das formas aceitas por
+:mod:`satextrato.lote`. Trabalhos com menor valor de prioridade são impressos
+primeiro e, entre trabalhos de mesma prioridade, na ordem em que foram
+enviados.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import itertools
+import logging
+import threading
+import time
+
+from six.moves import queue
+
+from . import lote
+from .cache import LRU
+
+
+logger = logging.getLogger('satextrato.spooler')
+
+
+PRIORIDADE_CUPOM = 0
+"""Prioridade dos extratos impressos para o consumidor no ato da venda."""
+
+PRIORIDADE_REIMPRESSAO = 10
+"""Prioridade das reimpressões (segundas vias)."""
+
+AGUARDANDO = 'aguardando'
+IMPRIMINDO = 'imprimindo'
+CONCLUIDO = 'concluido'
+FALHOU = 'falhou'
+CANCELADO = 'cancelado'
+
+_ENCERRAR = object()
+
+
+class Trabalho(object):
+    """Um trabalho de impressão. O estado do trabalho (atributo ``estado``)
+    será um de ``aguardando``, ``imprimindo``, ``concluido``, ``falhou`` ou
+    ``cancelado``. Se a impressão falhar, a exceção estará em ``erro``.
+    """
+
+    def __init__(
+            self,
+            id,
+            impressora,
+            documento,
+            resumido=False,
+            config=None,
+            prioridade=PRIORIDADE_CUPOM):
+        super(Trabalho, self).__init__()
+        self.id = id
+        self.impressora = impressora
+        self.documento = documento
+        self.resumido = resumido
+        self.config = config
+        self.prioridade = prioridade
+        self.estado = AGUARDANDO
+        self.erro = None
+        self.enviado_em = time.time()
+        self.iniciado_em = None
+        self.concluido_em = None
+        self._finalizado = threading.Event()
+
+    def __repr__(self):
+        return '<{} id={!r} impressora={!r} estado={!r}>'.format(
+                self.__class__.__name__,
+                self.id,
+                self.impressora,
+                self.estado
+            )
+
+    @property
+    def finalizado(self):
+        return self._finalizado.is_set()
+
+    def aguardar(self, timeout=None):
+        """Aguarda até que o trabalho seja finalizado (concluído, falhado ou
+        cancelado).
+
+        :returns: ``True`` se o trabalho foi finalizado ou ``False`` se o
+            tempo limite foi atingido.
+        :rtype: bool
+        """
+        return self._finalizado.wait(timeout)
+
+    def _finalizar(self, estado, erro=None):
+        self.estado = estado
+        self.erro = erro
+        self.concluido_em = time.time()
+        self._finalizado.set()
+
+
+class _Fila(object):
+    # a fila e a thread que atende uma impressora
+
+    def __init__(self, nome, impressora, spooler):
+        self.nome = nome
+        self.impressora = impressora
+        self.fila = queue.PriorityQueue()
+        self.liberada = threading.Event()
+        self.liberada.set()
+        self.thread = threading.Thread(
+                target=spooler._atender,
+                args=(self,),
+                name='satextrato-spooler-{}'.format(nome)
+            )
+        self.thread.daemon = True
+
+
+class Spooler(object):
+    """Mantém uma fila de trabalhos de impressão para cada impressora
+    registrada, atendida por uma *thread* exclusiva.
+    """
+
+    def __init__(self, historico=1000):
+        """Inicia uma instância de :class:`Spooler`.
+
+        :param int historico: Opcional. Número máximo de trabalhos
+            finalizados mantidos para consulta. Os trabalhos aguardando ou em
+            impressão são sempre mantidos, até que sejam finalizados.
+        """
+        super(Spooler, self).__init__()
+        self._filas = {}
+        self._pendentes = {}  # trabalhos aguardando ou imprimindo, pelo id
+        self._trabalhos = LRU(tamanho=historico)  # trabalhos finalizados
+        self._sequencia = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def registrar(self, nome, impressora):
+        """Registra uma impressora, iniciando a *thread* que a atende.
+
+        :param str nome: Nome que identifica a impressora no *spooler*.
+
+        :param impressora: Uma instância de
+            :class:`escpos.impl.epson.GenericESCPOS` (ou especialização).
+
+        :raises ValueError: Se já houver uma impressora com o mesmo nome.
+        """
+        with self._lock:
+            if nome in self._filas:
+                raise ValueError(
+                        'Impressora ja registrada: {!r}'.format(nome)
+                    )
+            fila = _Fila(nome, impressora, self)
+            self._filas[nome] = fila
+        fila.thread.start()
+
+    def enviar(
+            self,
+            nome,
+            documento,
+            resumido=False,
+            config=None,
+            prioridade=PRIORIDADE_CUPOM):
+        """Enfileira um trabalho de impressão.
+
+        :param str nome: Nome da impressora.
+
+        :param documento: O documento a ser impresso. Veja
+            :mod:`satextrato.lote`. *File objects* são lidos imediatamente.
+
+        :param bool resumido: Opcional. Indica se o extrato do CF-e de venda
+            deverá ser resumido.
+
+        :param config: Opcional. Uma instância de
+            :class:`satextrato.config.Configuracoes`.
+
+        :param int prioridade: Opcional. Trabalhos com menor valor são
+            impressos primeiro. O padrão é :data:`PRIORIDADE_CUPOM`.
+
+        :rtype: Trabalho
+        """
+        fila = self._fila(nome)
+        sequencia = next(self._sequencia)
+        trabalho = Trabalho(
+                sequencia,
+                nome,
+                lote._tarefa(documento),
+                resumido=resumido,
+                config=config,
+                prioridade=prioridade
+            )
+        with self._lock:
+            self._pendentes[trabalho.id] = trabalho
+        fila.fila.put((prioridade, sequencia, trabalho))
+        return trabalho
+
+    def trabalho(self, id):
+        """Obtém o trabalho pelo seu ``id`` ou ``None``."""
+        with self._lock:
+            trabalho = self._pendentes.get(id)
+        if trabalho is None:
+            trabalho = self._trabalhos.obter(id)
+        return trabalho
+
+    def cancelar(self, id):
+        """Cancela um trabalho que ainda esteja aguardando.
+
+        :returns: ``True`` se o trabalho foi cancelado.
+        :rtype: bool
+        """
+        with self._lock:
+            trabalho = self._pendentes.get(id)
+            if trabalho is None or trabalho.estado != AGUARDANDO:
+                return False
+            self._finalizar(trabalho, CANCELADO)
+        return True
+
+    def profundidade(self, nome):
+        """Número aproximado de trabalhos enfileirados para a impressora,
+        incluindo trabalhos cancelados ainda não descartados.
+        """
+        return self._fila(nome).fila.qsize()
+
+    def pausar(self, nome):
+        """Suspende a impressão na impressora após o trabalho corrente. Os
+        trabalhos continuam sendo enfileirados.
+        """
+        self._fila(nome).liberada.clear()
+
+    def retomar(self, nome):
+        """Retoma a impressão na impressora."""
+        self._fila(nome).liberada.set()
+
+    def encerrar(self, timeout=None):
+        """Encerra as *threads* após a impressão dos trabalhos enfileirados.
+        """
+        with self._lock:
+            filas = list(self._filas.values())
+            self._filas.clear()
+        for fila in filas:
+            fila.fila.put((float('inf'), 0, _ENCERRAR))
+            fila.liberada.set()
+        for fila in filas:
+            fila.thread.join(timeout)
+
+    def _fila(self, nome):
+        try:
+            return self._filas[nome]
+        except KeyError:
+            raise ValueError('Impressora desconhecida: {!r}'.format(nome))
+
+    def _atender(self, fila):
+        while True:
+            fila.liberada.wait()
+            item = fila.fila.get()
+            _, _, trabalho = item
+            if trabalho is _ENCERRAR:
+                break
+            if not fila.liberada.is_set():
+                # pausada enquanto aguardava; devolve o trabalho à fila
+                fila.fila.put(item)
+                continue
+            with self._lock:
+                if trabalho.estado != AGUARDANDO:
+                    continue  # cancelado
+                trabalho.estado = IMPRIMINDO
+            trabalho.iniciado_em = time.time()
+            try:
+                extrato = lote.carregar(
+                        trabalho.documento,
+                        fila.impressora,
+                        config=trabalho.config,
+                        resumido=trabalho.resumido
+                    )
+                extrato.renderizar().executar(fila.impressora)
+            except Exception as erro:
+                logger.exception(
+                        'falha ao imprimir trabalho %s na impressora %r',
+                        trabalho.id,
+                        fila.nome
+                    )
+                with self._lock:
+                    self._finalizar(trabalho, FALHOU, erro)
+            else:
+                with self._lock:
+                    self._finalizar(trabalho, CONCLUIDO)
+
+    def _finalizar(self, trabalho, estado, erro=None):
+        # move o trabalho para o histórico antes de sinalizar quem aguarda,
+        # de modo que continue disponível para consulta (deve ser invocado
+        # com o lock obtido)
+        self._pendentes.pop(trabalho.id, None)
+        self._trabalhos.armazenar(trabalho.id, trabalho)
+        trabalho._finalizar(estado, erro)
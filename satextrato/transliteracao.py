@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/transliteracao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Transliteração dos textos enviados à impressora.
+
+Por padrão os textos são transliterados para ASCII (via `Unidecode
+<https://pypi.org/project/Unidecode/>`_). Textos que já são ASCII, a grande
+maioria das linhas de um extrato, são devolvidos sem transformação e os
+demais são mantidos em um cache de tamanho limitado, já que se repetem de um
+extrato para outro (nomes de produtos, do emitente, rótulos fixos).
+
+Se a variável de ambiente ``SATEXTRATO_PRESERVAR_ACENTOS`` for verdadeira e a
+codificação de caracteres da impressora for uma das
+:data:`CODIFICACOES_ACENTUADAS`, serão transliterados apenas os caracteres
+que não puderem ser representados nessa codificação.
+
+.. warning::
+
+    Nenhum comando de seleção da página de código (``ESC t n``) é enviado à
+    impressora. Antes de preservar os acentos, configure a página de código
+    padrão da impressora (ou envie o comando na inicialização) para a mesma
+    codificação indicada em ``impressora.encoding``; caso contrário, os
+    caracteres acentuados serão impressos incorretamente.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import codecs
+
+from decouple import config as getenv
+
+from .cache import LRU
+from .config import SATEXTRATO_PRESERVAR_ACENTOS
+
+
+CODIFICACOES_ACENTUADAS = frozenset([
+        'cp850',
+        'cp858',
+        'cp860',
+        'cp1252',
+        'iso8859_1',
+        'iso8859_15',
+    ])
+"""
+Codificações de caracteres (nomes normalizados pelo módulo ``codecs``)
+capazes de representar os caracteres acentuados da língua portuguesa.
+"""
+
+_MEMO = LRU(tamanho=4096)
+
+
+def transliterar(texto, codificacao=None):
+    """Translitera o texto para ASCII ou, se ``codificacao`` for informada,
+    apenas os caracteres que não puderem ser representados nela.
+
+    .. sourcecode:: python
+
+        >>> transliterar('AÇÃO')
+        'ACAO'
+        >>> transliterar('AÇÃO € 1,00', codificacao='cp850')
+        'AÇÃO EUR 1,00'
+
+    """
+    if _ascii(texto):
+        return texto
+    chave = (texto, codificacao)
+    resultado = _MEMO.obter(chave)
+    if resultado is None:
+        if codificacao is None:
+            from unidecode import unidecode
+            resultado = unidecode(texto)
+        else:
+            resultado = ''.join(
+                    _caracter(c, codificacao) for c in texto
+                )
+        _MEMO.armazenar(chave, resultado)
+    return resultado
+
+
+def codificacao(impressora):
+    """Determina a codificação na qual os textos poderão ser mantidos para
+    a impressora ou ``None`` se os textos deverão ser transliterados para
+    ASCII.
+    """
+    if not getenv(SATEXTRATO_PRESERVAR_ACENTOS, cast=bool, default=False):
+        return None
+    encoding = getattr(impressora, 'encoding', None)
+    try:
+        nome = codecs.lookup(encoding).name.replace('-', '_')
+    except (LookupError, TypeError):
+        return None
+    return nome if nome in CODIFICACOES_ACENTUADAS else None
+
+
+def _ascii(texto):
+    try:
+        return texto.isascii()  # Python 3.7+
+    except AttributeError:
+        pass
+    try:
+        texto.encode('ascii')
+    except UnicodeError:
+        return False
+    return True
+
+
+def _caracter(c, codificacao):
+    try:
+        c.encode(codificacao)
+    except UnicodeError:
+        from unidecode import unidecode
+        return unidecode(c)
+    return c
@@ -19,10 +19,7 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 
-import textwrap
-
 from datetime import datetime
-from decimal import Decimal
 
 import six
 
@@ -30,13 +27,10 @@ from satcomum import br
 from satcomum import ersat
 from satcomum import util
 
-from .base import _bordas
+from . import layout
 from .base import ExtratoCFe
 
 
-ZERO = Decimal()
-
-
 class ExtratoCFeVenda(ExtratoCFe):
     """Implementa impressão do extrato do CF-e de venda, normal e resumido."""
 
@@ -62,7 +56,7 @@ class ExtratoCFeVenda(ExtratoCFe):
         self.anotacoes_antes_obs_contribuinte = []
         self.anotacoes_corpo = []
 
-    def apresentar_item(self, det):
+    def apresentar_item(self, item):
         """Apresenta um item (produto/serviço) do CF-e.
 
         Nesta abordagem, os detalhes do item utilizam uma linha exclusiva,
@@ -97,29 +91,35 @@ class ExtratoCFeVenda(ExtratoCFe):
         descrição, desde que caiba. Isso pode ser mais comum, se estiver
         configurado para apresentar os itens em modo condensado (padrão).
 
-        :param det: O n-ésimo elemento ``/CFe/infCFe/det`` (produto ou
+        :param item: Uma instância de :class:`satextrato.modelo.Item` que
+            representa o n-ésimo elemento ``/CFe/infCFe/det`` (produto ou
             serviço) existente no corpo do CF-e de venda.
 
+        .. note::
+
+            Em versões anteriores este método recebia o elemento ``det``.
+            Especializações que sobrescrevam este método devem usar os
+            atributos do item (``item.xProd``, ``item.vProd``, etc) em vez de
+            ``det.find(...)``. O XML continua disponível em :attr:`root`
+            (sem os itens, no extrato incremental).
+
         """
-        nItem = int(det.attrib['nItem'])
-        prod = det.find('prod')
-
-        cProd = prod.findtext('cProd')
-        xProd = prod.findtext('xProd')
-        uCom = prod.findtext('uCom')
-        qCom = Decimal(prod.findtext('qCom'))
-        vUnCom = Decimal(prod.findtext('vUnCom'))
-        vProd = Decimal(prod.findtext('vProd'))
-        vItem12741 = Decimal(det.findtext('imposto/vItem12741') or 0)
-
-        if vItem12741.is_zero():
+        if item.vItem12741.is_zero():
             detalhe = u'{:s} {:s} x {:n} {:n}'.format(
-                    util.texto_decimal(qCom), uCom, vUnCom, vProd)
+                    util.texto_decimal(item.qCom),
+                    item.uCom,
+                    item.vUnCom,
+                    item.vProd)
         else:
             detalhe = u'{:s} {:s} x {:n} ({:n}) {:n}'.format(
-                    util.texto_decimal(qCom), uCom, vUnCom, vItem12741, vProd)
+                    util.texto_decimal(item.qCom),
+                    item.uCom,
+                    item.vUnCom,
+                    item.vItem12741,
+                    item.vProd)
 
-        texto_item = u'{0:03d} {1:s} {2:s}'.format(nItem, cProd, xProd)
+        texto_item = u'{0:03d} {1:s} {2:s}'.format(
+                item.nItem, item.cProd, item.xProd)
 
         self.normal()
         self.esquerda()
@@ -128,13 +128,13 @@ class ExtratoCFeVenda(ExtratoCFe):
             self.condensado()
 
         largura = self._colunas
-        linhas = textwrap.wrap(texto_item, largura)
+        linhas = list(layout.quebrar(texto_item, largura))
 
         ultima_linha = linhas[-1]
 
         if (len(ultima_linha) + len(detalhe) + 1) > largura:
             # não cabe, o detalhe será apresentado em uma linha exclusiva
-            linhas.append(_bordas(
+            linhas.append(layout.bordas(
                     '',
                     detalhe,
                     largura=largura,
@@ -142,7 +142,7 @@ class ExtratoCFeVenda(ExtratoCFe):
                 ))
         else:
             # cabe; o detalhe será apresentado junto com a última linha
-            linhas[-1] = _bordas(
+            linhas[-1] = layout.bordas(
                     ultima_linha,
                     detalhe,
                     largura=largura,
@@ -163,6 +163,12 @@ class ExtratoCFeVenda(ExtratoCFe):
         if not self._resumido:
             self.corpo_III_legenda()
             self.corpo_IV_itens()
+        self.corpo_fechamento()
+
+    def corpo_fechamento(self):
+        """Imprime os grupos do corpo do extrato que seguem a lista de itens
+        (grupos V a IX), incluindo as anotações.
+        """
         self.corpo_V_total_cupom()
         self.corpo_VI_meio_pagamento()
         self.corpo_VII_observacoes_fisco()
@@ -206,11 +212,7 @@ class ExtratoCFeVenda(ExtratoCFe):
         #     Como havia implementado originalmente com o nome, apenas
         #     deixei configurável a apresentação do nome do consumidor.
         #
-        documento = (
-                self.root.findtext('./infCFe/dest/CNPJ')
-                or self.root.findtext('./infCFe/dest/CPF')
-                or ''
-            )
+        documento = self.cfe.destinatario.documento
 
         if br.is_cnpjcpf(documento):
             self.normal()
@@ -219,7 +221,7 @@ class ExtratoCFeVenda(ExtratoCFe):
                     br.as_cnpjcpf(documento)
                 ))
 
-            nome = self.root.findtext('./infCFe/dest/xNome')
+            nome = self.cfe.destinatario.xNome
             if nome and self._config.cupom.exibir_nome_consumidor:
                 self.quebrar(nome)
 
@@ -242,90 +244,69 @@ class ExtratoCFeVenda(ExtratoCFe):
             )
 
     def corpo_IV_itens(self):
+        for item in self.cfe.itens:
+            self.apresentar_item(item)
+            self.apresentar_ajustes_item(item)
 
-        for det in self.root.findall('./infCFe/det'):
-            self.apresentar_item(det)
+    def apresentar_ajustes_item(self, item):
+        """Apresenta os descontos, acréscimos e, se for o caso, a base de
+        cálculo do ISSQN de um item do CF-e, logo abaixo do item.
 
-            prod = det.find('prod')
-            imposto = det.find('imposto')
+        :param item: Uma instância de :class:`satextrato.modelo.Item`.
 
-            vProd = Decimal(prod.findtext('vProd'))  # noqa: keep for reference
-            vDesc = Decimal(prod.findtext('vDesc') or 0)
-            vRatDesc = Decimal(prod.findtext('vRatDesc') or 0)
-            vOutro = Decimal(prod.findtext('vOutro') or 0)
-            vRatAcr = Decimal(prod.findtext('vRatAcr') or 0)
+        """
+        vDesc = item.vDesc
+        vRatDesc = item.vRatDesc
+        vOutro = item.vOutro
+        vRatAcr = item.vRatAcr
+
+        # (!) Do modo como está implementado, descontos e acréscimos
+        # serão ambos tratados como se pudessem coexistir, embora o
+        # Manual de Orientação seja claro quando diz que "valores de
+        # descontos e acréscimos são mutuamente exclusivos".
+        forcar_exibir = False
 
-            # (!) Do modo como está implementado, descontos e acréscimos
-            # serão ambos tratados como se pudessem coexistir, embora o
-            # Manual de Orientação seja claro quando diz que "valores de
-            # descontos e acréscimos são mutuamente exclusivos".
-            forcar_exibir = False
+        if not vDesc.is_zero() or forcar_exibir:
+            self.bordas('desconto sobre item', '- {:n}'.format(vDesc))
 
-            if not vDesc.is_zero() or forcar_exibir:
-                self.bordas('desconto sobre item', '- {:n}'.format(vDesc))
+        if not vRatDesc.is_zero() or forcar_exibir:
+            self.bordas(
+                    'rateio de desconto sobre subtotal',
+                    '- {:n}'.format(vRatDesc)
+                )
 
-            if not vRatDesc.is_zero() or forcar_exibir:
-                self.bordas(
-                        'rateio de desconto sobre subtotal',
-                        '- {:n}'.format(vRatDesc)
-                    )
+        if not vOutro.is_zero() or forcar_exibir:
+            self.bordas(u'acréscimo sobre item', '+ {:n}'.format(vOutro))
 
-            if not vOutro.is_zero() or forcar_exibir:
-                self.bordas(u'acréscimo sobre item', '+ {:n}'.format(vOutro))
+        if not vRatAcr.is_zero() or forcar_exibir:
+            self.bordas(
+                    u'rateio de acréscimo sobre subtotal',
+                    '+ {:n}'.format(vRatAcr)
+                )
 
-            if not vRatAcr.is_zero() or forcar_exibir:
+        if item.issqn:
+            if not item.vDeducISSQN.is_zero():
                 self.bordas(
-                        u'rateio de acréscimo sobre subtotal',
-                        '+ {:n}'.format(vRatAcr)
+                        u'dedução para ISSQN',
+                        '- {:n}'.format(item.vDeducISSQN)
                     )
 
-            if imposto.find('ISSQN/cNatOp') is not None:
-                # se cNatOp (U09) presente, assume item tributado pelo ISSQN
-                vBC = Decimal(imposto.findtext('ISSQN/vBC') or 0)
-                vDeducISSQN = Decimal(
-                        imposto.findtext('ISSQN/vDeducISSQN')
-                        or 0
-                    )
-
-                if not vDeducISSQN.is_zero():
-                    self.bordas(
-                            u'dedução para ISSQN',
-                            '- {:n}'.format(vDeducISSQN)
-                        )
-
-                self.bordas(u'base de cálculo ISSQN', '{:n}'.format(vBC))
+            self.bordas(u'base de cálculo ISSQN', '{:n}'.format(item.vBC))
 
     def corpo_V_total_cupom(self):
 
-        total = self.root.find('./infCFe/total')
-
-        # calcula o total de descontos apenas dos itens tributados por ISSQN,
-        # usando os campos vDesc (I12) e vOutro (I13);
-        issqn_total_desc = ZERO
-        issqn_total_acres = ZERO
-
-        for det in self.root.findall('./infCFe/det'):
-            if det.find('imposto/ISSQN/cNatOp') is not None:
-                # se cNatOp (U09) presente, assume item tributado pelo ISSQN
-                issqn_total_desc += Decimal(det.findtext('prod/vDesc') or 0)
-                issqn_total_acres += Decimal(det.findtext('prod/vOutro') or 0)
+        totais = self.cfe.totais
+        issqn_total_desc, issqn_total_acres = self.totais_issqn()
 
         # total de descontos sobre itens (vDesc, W05);
         # total de outras despesas acessórias sobre itens (vOutro W10);
-        total_desc = (
-                issqn_total_desc
-                + Decimal(total.findtext('ICMSTot/vDesc') or 0)
-            )
-
-        total_acres = (
-                issqn_total_acres
-                + Decimal(total.findtext('ICMSTot/vOutro') or 0)
-            )
+        total_desc = issqn_total_desc + totais.vDesc
+        total_acres = issqn_total_acres + totais.vOutro
 
         # vProd (W04)
-        vProd = Decimal(total.findtext('ICMSTot/vProd'))
-        vDescSubtot = Decimal(total.findtext('DescAcrEntr/vDescSubtot') or 0)
-        vAcresSubtot = Decimal(total.findtext('DescAcrEntr/vAcresSubtot') or 0)
+        vProd = totais.vProd
+        vDescSubtot = totais.vDescSubtot
+        vAcresSubtot = totais.vAcresSubtot
 
         self.normal()
         self.avanco()
@@ -373,20 +354,32 @@ class ExtratoCFeVenda(ExtratoCFe):
                 )
 
         self.negrito()
-        self.bordas('TOTAL R$', '{:n}'.format(Decimal(total.findtext('vCFe'))))
+        self.bordas('TOTAL R$', '{:n}'.format(totais.vCFe))
         self.negrito()
 
+    def totais_issqn(self):
+        """Calcula o total de descontos e o total de acréscimos apenas dos
+        itens tributados pelo ISSQN, usando os campos ``vDesc`` (I12) e
+        ``vOutro`` (I13).
+
+        :returns: Uma tupla contendo o total de descontos e o total de
+            acréscimos, nesta ordem.
+
+        :rtype: tuple(decimal.Decimal, decimal.Decimal)
+        """
+        return self.cfe.issqn_total_desc, self.cfe.issqn_total_acres
+
     def corpo_VI_meio_pagamento(self):
         self.normal()
         self.avanco()
 
-        for mp in self.root.findall('./infCFe/pgto/MP'):
+        for mp in self.cfe.pagamentos:
             self.bordas(
-                    ersat.meio_pagamento(mp.findtext('cMP')),
-                    '{:n}'.format(Decimal(mp.findtext('vMP')))
+                    ersat.meio_pagamento(mp.cMP),
+                    '{:n}'.format(mp.vMP)
                 )
 
-        valor_troco = Decimal(self.root.findtext('./infCFe/pgto/vTroco') or 0)
+        valor_troco = self.cfe.vTroco
         if not valor_troco.is_zero():
             self.bordas('Troco R$', '{:n}'.format(valor_troco))
 
@@ -429,7 +422,7 @@ class ExtratoCFeVenda(ExtratoCFe):
         """
         iniciado = False
 
-        for obs in self.root.findall('./infCFe/infAdic/obsFisco'):
+        for obs in self.cfe.observacoes_fisco:
             if not iniciado:
                 self.normal()
                 self.esquerda()
@@ -437,23 +430,21 @@ class ExtratoCFeVenda(ExtratoCFe):
                 self.condensado()
                 iniciado = True
 
-            self.quebrar(u'{}: {}'.format(
-                    obs.attrib['xCampo'],
-                    obs.findtext('xTexto')))
+            self.quebrar(u'{}: {}'.format(obs.xCampo, obs.xTexto))
 
         if iniciado:
             self.condensado()
 
     def corpo_VIII_dados_entrega(self):
 
-        entrega = self.root.find('./infCFe/entrega')
+        entrega = self.cfe.entrega
         if entrega is None:
             return
 
-        logradouro = entrega.findtext('xLgr')
-        numero = entrega.findtext('nro')
-        complemento = entrega.findtext('xCpl')
-        bairro = entrega.findtext('xBairro')
+        logradouro = entrega.xLgr
+        numero = entrega.nro
+        complemento = entrega.xCpl
+        bairro = entrega.xBairro
 
         if numero:  # número não é obrigatório
             # mas existe, então o coloca próximo ao logradouro
@@ -468,10 +459,7 @@ class ExtratoCFeVenda(ExtratoCFe):
                 logradouro = u'{}, {}'.format(logradouro, complemento)
                 complemento = ''  # ignora a linha que deveria conter o xCpl
 
-        cidade = u'{}/{}'.format(
-                entrega.findtext('xMun'),
-                entrega.findtext('UF')
-            )
+        cidade = u'{}/{}'.format(entrega.xMun, entrega.UF)
 
         partes_endereco = [logradouro, complemento, bairro, cidade]
         endereco = '\r\n'.join([e for e in partes_endereco if e])
@@ -484,16 +472,13 @@ class ExtratoCFeVenda(ExtratoCFe):
         self.negrito()
         self.quebrar(u'Endereço: {}'.format(endereco))
 
-        nome_destinatario = self.root.findtext('./infCFe/dest/xNome')
+        nome_destinatario = self.cfe.destinatario.xNome
         if nome_destinatario:
             self.quebrar(u'Destinatário: {}'.format(nome_destinatario))
 
     def corpo_IX_observacoes_contribuinte(self):
-        infCpl = self.root.findtext('./infCFe/infAdic/infCpl')
-        vCFeLei12741 = Decimal(
-                self.root.findtext('./infCFe/total/vCFeLei12741')
-                or 0
-            )
+        infCpl = self.cfe.infCpl
+        vCFeLei12741 = self.cfe.totais.vCFeLei12741
 
         if infCpl or not vCFeLei12741.is_zero():
             self.normal()
@@ -518,14 +503,12 @@ class ExtratoCFeVenda(ExtratoCFe):
                 self.condensado()
 
     def rodape(self):
-        infCFe = self.root.find('./infCFe')
-        sat_numero_serie = 'SAT no. {}'.format(
-                infCFe.findtext('ide/nserieSAT')
-            )
+        ide = self.cfe.ide
+        sat_numero_serie = 'SAT no. {}'.format(ide.nserieSAT)
 
         datahora = datetime.strptime('{}{}'.format(
-                infCFe.findtext('ide/dEmi'),
-                infCFe.findtext('ide/hEmi')), '%Y%m%d%H%M%S')
+                ide.dEmi,
+                ide.hEmi), '%Y%m%d%H%M%S')
 
         datahora_emissao = datahora.strftime('%d/%m/%Y - %H:%M:%S')
         if six.PY2:
@@ -542,14 +525,10 @@ class ExtratoCFeVenda(ExtratoCFe):
         self.texto(datahora_emissao)
         self.avanco()
 
-        self.chave_cfe_code128(ersat.ChaveCFeSAT(infCFe.attrib['Id']))
+        self.chave_cfe_code128(ersat.ChaveCFeSAT(self.cfe.chave))
         self.avanco()
 
         self.centro()
-        self.impressora.qrcode(
-                ersat.dados_qrcode(self._tree),
-                qrcode_module_size=self._config.qrcode.tamanho_modulo,
-                qrcode_ecc_level=self._config.qrcode.nivel_correcao
-            )
+        self.qrcode(self.cfe.dados_qrcode)
 
         self.qrcode_mensagem()
@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+#
+# satextrato/visualizacao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""
+Visualização dos extratos sem uma impressora, como texto simples ou HTML.
+
+As visualizações implementam as mesmas operações da impressora utilizadas
+pelos extratos (justificação, negrito, expandido, condensado, Code128, QRCode
+e corte), mas apenas registram o leiaute resultante, respeitando as colunas
+de cada modo de impressão:
+
+.. sourcecode:: python
+
+    from satextrato import ExtratoCFeVenda
+    from satextrato.visualizacao import VisualizacaoHTML
+
+    visualizacao = VisualizacaoHTML()
+    ExtratoCFeVenda(fp, visualizacao).imprimir()
+    html = visualizacao.resultado()
+
+Uma mesma visualização pode ser reutilizada para vários extratos, desde que
+seja limpa entre um e outro (veja :meth:`Visualizacao.limpar`).
+
+A visualização HTML desenha os códigos de barras como SVG. O QRCode só é
+desenhado se a biblioteca `qrcode <https://pypi.org/project/qrcode/>`_
+estiver instalada; caso contrário, é indicado apenas o seu lugar.
+"""
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+from collections import namedtuple
+
+from escpos import barcode
+from escpos import constants
+from escpos import feature
+
+from . import barras
+from . import qr
+
+
+ESQUERDA = 'left'
+CENTRO = 'center'
+DIREITA = 'right'
+
+Linha = namedtuple('Linha', [
+        'texto',  # str
+        'justificacao',  # str (ESQUERDA, CENTRO ou DIREITA)
+        'negrito',  # bool
+        'expandido',  # bool
+        'condensado',  # bool
+    ])
+
+CodigoBarras = namedtuple('CodigoBarras', [
+        'dados',  # str
+        'altura',  # int, em pontos
+        'justificacao',  # str
+        'conjunto',  # str, conjunto do Code128 (veja satextrato.barras)
+    ])
+
+QRCode = namedtuple('QRCode', [
+        'dados',  # str
+        'tamanho_modulo',  # int, em pontos
+        'nivel_correcao',  # str
+        'justificacao',  # str
+    ])
+
+Corte = namedtuple('Corte', [
+        'parcial',  # bool
+    ])
+
+
+class Visualizacao(object):
+    """Registra os elementos de um ou mais extratos (veja :class:`Linha`,
+    :class:`CodigoBarras`, :class:`QRCode` e :class:`Corte`) no lugar de uma
+    impressora. As especializações produzem o resultado em algum formato
+    (veja :meth:`resultado`).
+
+    Os recursos (``features``) e a codificação têm o mesmo significado que
+    em :class:`escpos.impl.epson.GenericESCPOS`. As colunas de cada modo de
+    impressão, por exemplo, são obtidas de ``feature.columns``.
+    """
+
+    def __init__(
+            self,
+            features=None,
+            encoding=constants.DEFAULT_ENCODING,
+            encoding_errors=constants.DEFAULT_ENCODING_ERRORS):
+        super(Visualizacao, self).__init__()
+        self._feature_attrs = feature.FeatureAttributes(self)
+        self.hardware_features = feature._SET.copy()
+        self.hardware_features.update(features or {})
+        # não há imagens para enviar a um dispositivo
+        self.hardware_features[qr.QRCODE_RASTER] = False
+        self.encoding = encoding
+        self.encoding_errors = encoding_errors
+        self.limpar()
+
+    @property
+    def feature(self):
+        return self._feature_attrs
+
+    def limpar(self):
+        """Descarta os elementos registrados e retorna os modos de impressão
+        ao estado inicial.
+        """
+        self.elementos = []
+        self._pendente = None
+        self.init()
+
+    def init(self):
+        self._justificacao = ESQUERDA
+        self._negrito = False
+        self._expandido = False
+        self._condensado = False
+
+    def justify_left(self):
+        self._justificacao = ESQUERDA
+
+    def justify_center(self):
+        self._justificacao = CENTRO
+
+    def justify_right(self):
+        self._justificacao = DIREITA
+
+    def set_emphasized(self, flag):
+        self._negrito = bool(flag)
+
+    def set_expanded(self, flag):
+        self._expandido = bool(flag)
+
+    def set_condensed(self, flag):
+        self._condensado = bool(flag)
+
+    def textout(self, text):
+        # os modos de impressão de uma linha são aqueles em vigor quando o
+        # primeiro texto da linha foi recebido
+        linhas = text.split('\n')
+        for n, texto in enumerate(linhas):
+            if n > 0:
+                self._encerrar_linha()
+            if texto:
+                if self._pendente is None:
+                    self._pendente = self._linha('')
+                self._pendente = self._pendente._replace(
+                        texto=self._pendente.texto + texto
+                    )
+
+    def text(self, text):
+        self.textout(text)
+        self.lf()
+
+    def lf(self, lines=1):
+        for i in range(lines):
+            self._encerrar_linha()
+
+    def code128(self, data, **kwargs):
+        self._encerrar_texto()
+        self.elementos.append(CodigoBarras(
+                dados=data,
+                altura=kwargs.get('barcode_height', 162),
+                justificacao=self._justificacao,
+                conjunto=barras._conjunto(
+                        kwargs.get('codeset', barcode.CODE128_A))
+            ))
+
+    def qrcode(self, data, **kwargs):
+        nivel = kwargs.get('qrcode_ecc_level', 'L')
+        if not isinstance(nivel, type('')):
+            nivel = nivel.decode('ascii')
+        self._encerrar_texto()
+        self.elementos.append(QRCode(
+                dados=data,
+                tamanho_modulo=int(kwargs.get('qrcode_module_size', 4)),
+                nivel_correcao=nivel.upper(),
+                justificacao=self._justificacao
+            ))
+
+    def cut(self, partial=True, feed=0):
+        self._encerrar_texto()
+        self.elementos.append(Corte(parcial=partial))
+
+    def resultado(self):
+        """Obtém o resultado da visualização dos elementos registrados.
+
+        :rtype: str
+        """
+        raise NotImplementedError()
+
+    def _linha(self, texto):
+        return Linha(
+                texto=texto,
+                justificacao=self._justificacao,
+                negrito=self._negrito,
+                expandido=self._expandido,
+                condensado=self._condensado
+            )
+
+    def _encerrar_linha(self):
+        self.elementos.append(self._pendente or self._linha(''))
+        self._pendente = None
+
+    def _encerrar_texto(self):
+        # texto sem avanço de linha antes de um código de barras é impresso
+        # pela impressora como uma linha própria
+        if self._pendente is not None:
+            self._encerrar_linha()
+
+    def _elementos(self):
+        self._encerrar_texto()
+        return self.elementos
+
+    def _colunas(self, linha):
+        colunas = self.feature.columns
+        if linha.condensado:
+            return colunas.condensed
+        elif linha.expandido:
+            return colunas.expanded
+        return colunas.normal
+
+
+class VisualizacaoTexto(Visualizacao):
+    """Visualiza os extratos como texto simples. Cada linha é justificada
+    nas colunas do seu modo de impressão. O texto expandido é espaçado
+    (cada caractere ocupa duas colunas) e os códigos de barras são indicados
+    pelo seu conteúdo, como em ``[Code128: 3519...]``.
+    """
+
+    def resultado(self):
+        linhas = []
+        for elemento in self._elementos():
+            linhas.append(self._texto(elemento))
+        return ''.join(linha + '\n' for linha in linhas)
+
+    def _texto(self, elemento):
+        normal = self.feature.columns.normal
+        if isinstance(elemento, Linha):
+            texto = _justificar(
+                    elemento.texto,
+                    self._colunas(elemento),
+                    elemento.justificacao
+                )
+            if elemento.expandido and not elemento.condensado:
+                texto = ' '.join(texto)
+            return texto.rstrip()
+        elif isinstance(elemento, CodigoBarras):
+            texto = '[Code128: {}]'.format(elemento.dados)
+            return _justificar(texto, normal, elemento.justificacao).rstrip()
+        elif isinstance(elemento, QRCode):
+            texto = '[QRCode]'
+            return _justificar(texto, normal, elemento.justificacao).rstrip()
+        return ('8<' + ' -' * normal)[:normal]
+
+
+class VisualizacaoHTML(Visualizacao):
+    """Visualiza os extratos como um fragmento HTML. As linhas são blocos de
+    texto pré-formatado com a largura das colunas da impressora, os códigos
+    de barras e o QRCode são desenhados como SVG e os cortes são indicados
+    por uma linha horizontal.
+
+    :param bool estilo: Opcional. Indica se o fragmento deverá incluir as
+        regras CSS para as classes utilizadas. O padrão é ``True``.
+    """
+
+    def __init__(self, features=None, estilo=True, **kwargs):
+        self._estilo = estilo
+        super(VisualizacaoHTML, self).__init__(features=features, **kwargs)
+
+    def resultado(self):
+        partes = []
+        if self._estilo:
+            partes.append(_ESTILO.format(
+                    colunas=self.feature.columns.normal,
+                    condensado=_porcento(
+                            self.feature.columns.normal,
+                            self.feature.columns.condensed
+                        ),
+                    expandido=_porcento(
+                            self.feature.columns.normal,
+                            self.feature.columns.expanded
+                        )
+                ))
+        partes.append('<div class="satextrato">')
+        for elemento in self._elementos():
+            partes.append(self._html(elemento))
+        partes.append('</div>')
+        return '\n'.join(partes) + '\n'
+
+    def _html(self, elemento):
+        if isinstance(elemento, Linha):
+            classes = [_CLASSES[elemento.justificacao]]
+            if elemento.negrito:
+                classes.append('n')
+            if elemento.condensado:
+                classes.append('k')
+            elif elemento.expandido:
+                classes.append('x')
+            return '<div class="{}">{}</div>'.format(
+                    ' '.join(classes),
+                    _escapar(elemento.texto)
+                )
+        elif isinstance(elemento, CodigoBarras):
+            return '<div class="{}">{}</div>'.format(
+                    _CLASSES[elemento.justificacao],
+                    _svg_code128(elemento)
+                )
+        elif isinstance(elemento, QRCode):
+            return '<div class="{}">{}</div>'.format(
+                    _CLASSES[elemento.justificacao],
+                    _svg_qrcode(elemento)
+                )
+        return '<hr class="corte">'
+
+
+_CLASSES = {
+        ESQUERDA: 'e',
+        CENTRO: 'c',
+        DIREITA: 'd',
+    }
+
+_ESTILO = (
+        '<style>\n'
+        '.satextrato {{font-family: monospace; width: {colunas}ch;}}\n'
+        '.satextrato div {{white-space: pre; min-height: 1.2em;'
+        ' line-height: 1.2em;}}\n'
+        '.satextrato .e {{text-align: left;}}\n'
+        '.satextrato .c {{text-align: center;}}\n'
+        '.satextrato .d {{text-align: right;}}\n'
+        '.satextrato .n {{font-weight: bold;}}\n'
+        '.satextrato .k {{font-size: {condensado}%;}}\n'
+        '.satextrato .x {{font-size: {expandido}%;'
+        ' line-height: 2.4em;}}\n'
+        '.satextrato svg {{max-width: 100%;}}\n'
+        '.satextrato .corte {{border: 0; border-top: 1px dashed;}}\n'
+        '</style>'
+    )
+
+
+def _escapar(texto):
+    return (
+            texto
+            .replace('&', '&amp;')
+            .replace('<', '&lt;')
+            .replace('>', '&gt;')
+            .replace('"', '&quot;')
+        )
+
+
+def _porcento(normal, colunas):
+    return '{:g}'.format(round(100.0 * normal / colunas, 2))
+
+
+def _justificar(texto, largura, justificacao):
+    if justificacao == CENTRO:
+        return texto.center(largura)
+    elif justificacao == DIREITA:
+        return texto.rjust(largura)
+    return texto
+
+
+def _svg_code128(elemento):
+    # cada módulo ocupa uma unidade de largura; a altura é convertida de
+    # pontos para módulos (o Code128 é impresso com dois pontos por módulo)
+    larguras = barras.larguras(elemento.dados, elemento.conjunto)
+    altura = max(1, elemento.altura // 2)
+    caminho = []
+    x = barras.MARGEM
+    for n, largura in enumerate(larguras):
+        if n % 2 == 0:
+            caminho.append('M{} 0h{}v{}h-{}z'.format(
+                    x, largura, altura, largura))
+        x += largura
+    largura_total = x + barras.MARGEM
+    return _svg(
+            largura_total,
+            altura,
+            ''.join(caminho),
+            'data-code128="{}"'.format(_escapar(elemento.dados))
+        )
+
+
+def _svg_qrcode(elemento):
+    if not qr.disponivel():
+        return '<span class="qrcode">[QRCode]</span>'
+    matriz = qr.matriz(elemento.dados, elemento.nivel_correcao)
+    caminho = []
+    for y, modulos in enumerate(matriz):
+        x = 0
+        while x < len(modulos):
+            if modulos[x]:
+                inicio = x
+                while x < len(modulos) and modulos[x]:
+                    x += 1
+                caminho.append('M{} {}h{}v1h-{}z'.format(
+                        inicio, y, x - inicio, x - inicio))
+            else:
+                x += 1
+    return _svg(
+            len(matriz[0]),
+            len(matriz),
+            ''.join(caminho),
+            'width="{}"'.format(len(matriz[0]) * elemento.tamanho_modulo)
+        )
+
+
+def _svg(largura, altura, caminho, atributos):
+    return (
+            '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {} {}" {} '
+            'shape-rendering="crispEdges">'
+            '<rect width="100%" height="100%" fill="#fff"/>'
+            '<path d="{}" fill="#000"/></svg>'
+        ).format(largura, altura, atributos, caminho)
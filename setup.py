@@ -61,6 +61,16 @@ setup(
                 'satcomum>=2.2',
                 'unidecode',
             ],
+        extras_require={
+                'imagem': ['Pillow', 'qrcode'],
+                'lxml': ['lxml'],
+                'qrcode': ['qrcode'],
+            },
+        entry_points={
+                'console_scripts': [
+                    'satextrato = satextrato.cli:main',
+                ],
+            },
         include_package_data=True,
         license='Apache Software License',
         platforms='any',
@@ -76,6 +86,7 @@ setup(
                 'Natural Language :: Portuguese (Brazilian)',
                 'Operating System :: OS Independent',
                 'Programming Language :: Python',
+                # satextrato.assincrono requer Python 3.5 ou superior
                 'Programming Language :: Python :: 2.7',
                 'Programming Language :: Python :: 3.6',
                 'Programming Language :: Python :: 3.7',
@@ -23,6 +23,7 @@ from __future__ import unicode_literals
 import importlib
 import os
 import shutil
+import sys
 
 from builtins import str as text
 
@@ -32,6 +33,10 @@ from escpos import constants as escpos_const
 from escpos.conn import CONNECTION_TYPES
 
 
+if sys.version_info < (3, 5):
+    collect_ignore = ['test_assincrono.py']
+
+
 def pytest_addoption(parser):
 
     parser.addoption(
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_assincrono.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import asyncio
+import io
+
+from builtins import str as text
+
+from escpos import DummyConnection
+from escpos import NetworkConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import _assincrono
+from satextrato import assincrono
+from satextrato import programa
+from satextrato.venda import ExtratoCFeVenda
+
+
+def test_imprimir_em_impressora_de_rede(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    recebido = []
+
+    async def receber(reader, writer):
+        recebido.append(await reader.read())
+        writer.close()
+
+    async def executar():
+        servidor = await asyncio.start_server(receber, '127.0.0.1', 0)
+        porta = servidor.sockets[0].getsockname()[1]
+        enviados = await assincrono.imprimir(
+                cfe_venda,
+                NetworkConnection('127.0.0.1', porta),
+                GenericESCPOS,
+                tempo_limite=5
+            )
+        while not recebido:
+            await asyncio.sleep(0.01)
+        servidor.close()
+        await servidor.wait_closed()
+        return enviados
+
+    loop = asyncio.new_event_loop()
+    try:
+        enviados = loop.run_until_complete(executar())
+    finally:
+        loop.close()
+
+    esperado = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as fp:
+        programa = ExtratoCFeVenda(fp, esperado).renderizar()
+
+    programa.executar(esperado)
+
+    assert len(recebido) == 1  # uma única conexão com a impressora
+    assert enviados == len(recebido[0])
+    assert recebido[0] == esperado.device.output
+
+
+def test_renderizar_a_partir_do_perfil(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    impressora = GenericESCPOS(DummyConnection(), encoding='cp850')
+
+    loop = asyncio.new_event_loop()
+    try:
+        dados = loop.run_until_complete(assincrono.renderizar(
+                cfe_venda, programa.perfil(impressora)))
+    finally:
+        loop.close()
+
+    assert impressora.device.output == b''
+    with io.open(cfe_venda, 'r') as fp:
+        ExtratoCFeVenda(fp, impressora).renderizar().executar(impressora)
+    assert dados == impressora.device.output
+
+
+def test_loop_em_execucao():
+    async def obter():
+        return _assincrono._loop()
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(obter()) is loop
+    finally:
+        loop.close()
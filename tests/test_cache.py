@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_cache.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import threading
+
+from builtins import str as text
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato.cache import CacheExtratos
+from satextrato.cache import LRU
+from satextrato.cache import _substituir
+from satextrato.venda import ExtratoCFeVenda
+
+
+CHAVE_CFE = 'CFe35150808723218000186599000040190000241114257'
+
+
+def test_lru_descarta_usados_ha_mais_tempo():
+    lru = LRU(tamanho=2)
+    lru.armazenar('a', 1)
+    lru.armazenar('b', 2)
+    assert lru.obter('a') == 1  # 'b' passa a ser o usado há mais tempo
+    lru.armazenar('c', 3)
+    assert 'b' not in lru
+    assert lru.obter('a') == 1
+    assert lru.obter('c') == 3
+    assert len(lru) == 2
+
+
+def test_cache_extratos_reimpressao(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    diretorio = text(datadir.join('cache'))
+
+    cache = CacheExtratos(diretorio=diretorio)
+    impressora = GenericESCPOS(DummyConnection())
+
+    assert not cache.reimprimir(CHAVE_CFE, impressora)
+
+    with io.open(cfe_venda, 'r') as stream:
+        cache.imprimir(ExtratoCFeVenda(stream, impressora))
+
+    impresso = impressora.device.output
+    assert impresso
+
+    # a versão resumida é outra entrada no cache
+    assert not cache.reimprimir(CHAVE_CFE, impressora, resumido=True)
+
+    outra = GenericESCPOS(DummyConnection())
+    assert cache.reimprimir(CHAVE_CFE, outra)
+    assert outra.device.output == impresso
+
+    # uma nova instância encontra o extrato gravado em disco
+    cache = CacheExtratos(diretorio=diretorio)
+    outra = GenericESCPOS(DummyConnection())
+    assert cache.reimprimir(CHAVE_CFE, outra)
+    assert outra.device.output == impresso
+
+
+def test_substituir_arquivo_existente(tmp_path):
+    origem = tmp_path / 'novo.tmp'
+    destino = tmp_path / 'arquivo'
+    origem.write_bytes(b'novo')
+    destino.write_bytes(b'antigo')
+    _substituir(str(origem), str(destino))
+    assert destino.read_bytes() == b'novo'
+    assert not origem.exists()
+
+
+def test_gravacoes_simultaneas_da_mesma_chave(tmp_path):
+    diretorio = str(tmp_path)
+    dados = [bytes(bytearray([n])) * 200000 for n in range(8)]
+
+    def gravar(valor):
+        CacheExtratos(diretorio=diretorio).armazenar('chave', valor)
+
+    tarefas = [threading.Thread(target=gravar, args=(d,)) for d in dados]
+    for tarefa in tarefas:
+        tarefa.start()
+    for tarefa in tarefas:
+        tarefa.join()
+
+    assert [p.name for p in tmp_path.iterdir()] == ['chave.z']
+    assert CacheExtratos(diretorio=diretorio).obter('chave') in dados
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_cli.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import os
+
+from builtins import str as text
+
+import escpos.impl.epson
+import pytest
+
+from satextrato import cli
+
+
+CHAVE_VENDA = 'CFe35150808723218000186599000040190000241114257'
+
+
+@pytest.fixture
+def sem_pausas(monkeypatch):
+    # a PyESCPOS faz pausas após imprimir códigos de barras e QRCodes
+    monkeypatch.setattr(escpos.impl.epson.time, 'sleep', lambda _: None)
+
+
+def test_identificar(datadir):
+    venda = text(datadir.join('data', 'cfe_venda.xml'))
+    cancelamento = text(datadir.join('data', 'cfe_cancelamento.xml'))
+
+    documento = cli.identificar('venda', venda)
+    assert documento.chave == CHAVE_VENDA
+    assert documento.chave_venda is None
+
+    with io.open(cancelamento, 'rb') as fp:
+        documento = cli.identificar('<stdin>', fp.read())
+    assert documento.chave_venda == CHAVE_VENDA
+
+    with pytest.raises(ValueError):
+        cli.identificar('outro', b'<?xml version="1.0"?><NFe/>')
+
+
+def test_documentos(datadir):
+    diretorio = text(datadir.join('data'))
+    esperados = [
+            os.path.join(diretorio, 'cfe_cancelamento.xml'),
+            os.path.join(diretorio, 'cfe_venda.xml'),
+        ]
+    assert [c for _, c in cli.documentos([diretorio])] == esperados
+    assert [c for _, c in cli.documentos(
+            [os.path.join(diretorio, '*.xml')])] == esperados
+
+    lista = io.BytesIO('\n'.join(esperados).encode('utf-8') + b'\n\n')
+    assert [c for _, c in cli.documentos(['-'], stdin=lista)] == esperados
+
+    xml = b'\n<?xml version="1.0"?>\n<CFe/>\n'
+    assert list(cli.documentos(['-'], stdin=io.BytesIO(xml))) == [
+            ('<stdin>', xml.lstrip()),
+        ]
+
+
+def test_imprimir_venda_e_cancelamento(datadir, sem_pausas, capsys):
+    diretorio = text(datadir.join('data'))
+    saida = text(datadir.join('saida.bin'))
+
+    # o CF-e de venda é encontrado pela chave, no mesmo diretório
+    os.rename(
+            os.path.join(diretorio, 'cfe_venda.xml'),
+            os.path.join(diretorio, '{}.xml'.format(CHAVE_VENDA))
+        )
+    cancelamento = os.path.join(diretorio, 'cfe_cancelamento.xml')
+
+    assert cli.main(['--conexao', 'file:' + saida, cancelamento]) == 0
+    relatorio = capsys.readouterr().out
+    assert 'cancelamento' in relatorio
+    assert '1 extrato(s) impresso(s), 0 falha(s)' in relatorio
+    assert os.path.getsize(saida) > 0
+
+
+def test_falhas(datadir, sem_pausas, capsys):
+    cancelamento = text(datadir.join('data', 'cfe_cancelamento.xml'))
+    inexistente = text(datadir.join('data', 'inexistente.xml'))
+
+    resultado = cli.main([
+            '--conexao', 'dummy',
+            inexistente,
+            cancelamento,
+        ])
+    assert resultado == 1
+
+    capturado = capsys.readouterr()
+    assert 'inexistente.xml' in capturado.err
+    assert 'CF-e de venda nao encontrado: {}'.format(
+            CHAVE_VENDA) in capturado.err
+    assert '0 extrato(s) impresso(s), 2 falha(s)' in capturado.out
+
+
+def test_falha_no_documento_nao_reconecta(datadir, sem_pausas, monkeypatch):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    invalido = text(datadir.join('data', 'invalido.xml'))
+    with io.open(invalido, 'wb') as fp:
+        fp.write(b'<?xml version="1.0"?><CFe><infCFe Id="CFe1"></CFe>')
+
+    conexoes = []
+    criar = cli._fabrica
+
+    def _fabrica(conexao, modelo):
+        fabrica = criar(conexao, modelo)
+
+        def contar():
+            conexoes.append(conexao)
+            return fabrica()
+
+        return contar
+
+    monkeypatch.setattr(cli, '_fabrica', _fabrica)
+    resultado = cli.main(['--conexao', 'dummy', invalido, cfe_venda])
+    assert resultado == 1
+    assert len(conexoes) == 1
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_code128.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+from timeit import default_timer
+
+from builtins import str as text
+
+import escpos.barcode
+import pytest
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+from satcomum import ersat
+
+from satextrato import base
+from satextrato import config
+from satextrato import programa
+from satextrato.venda import ExtratoCFeVenda
+
+
+def _extrato(datadir, **code128):
+    padrao = config.padrao()
+    conf = padrao._replace(code128=padrao.code128._replace(**code128))
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    with io.open(cfe_venda, 'r', encoding='utf-8') as fp:
+        return ExtratoCFeVenda(
+                fp,
+                GenericESCPOS(DummyConnection()),
+                config=conf
+            )
+
+
+@pytest.mark.parametrize('code128, partes, pular_linha', [
+        (dict(quebrar=False), [44], False),
+        (dict(truncar=True, truncar_tamanho=22), [22], False),
+        (dict(quebrar=True, quebrar_partes=[22, 22]), [22, 22], False),
+        (
+            dict(
+                quebrar=True,
+                quebrar_partes=[12, 12, 12, 8],
+                pular_linha_entre_partes=True
+            ),
+            [12, 12, 12, 8],
+            True
+        ),
+    ])
+def test_code128_equivale_aos_comandos_da_impressora(
+        datadir, code128, partes, pular_linha):
+    extrato = _extrato(datadir, **code128)
+    chave = ersat.ChaveCFeSAT(extrato.cfe.chave)
+    extrato.chave_cfe_code128(chave)
+
+    impressora = GenericESCPOS(DummyConnection())
+    impressora.justify_center()
+    impressora.set_condensed(True)
+    impressora.text(' '.join(chave.partes()))
+    impressora.set_condensed(False)
+    digitos = ''.join(chave.partes())
+    inicio = 0
+    for n_parte, tamanho in enumerate(partes, 1):
+        impressora.justify_center()
+        impressora.code128(
+                digitos[inicio:inicio + tamanho],
+                barcode_height=extrato._config.code128.altura,
+                barcode_width=escpos.barcode.BARCODE_NORMAL_WIDTH,
+                barcode_hri=escpos.barcode.BARCODE_HRI_NONE
+            )
+        inicio += tamanho
+        if pular_linha and n_parte < len(partes):
+            impressora.lf()
+
+    assert extrato.impressora.device.output == impressora.device.output
+
+
+def test_code128_reutiliza_comandos_codificados(datadir, monkeypatch):
+    extrato = _extrato(datadir, quebrar=True, quebrar_partes=[22, 22])
+    extrato.chave_cfe_code128(ersat.ChaveCFeSAT(extrato.cfe.chave))
+    esperado = extrato.impressora.device.output
+
+    def _codificar_code128(*args):
+        raise AssertionError('comandos Code128 deveriam estar em cache')
+
+    monkeypatch.setattr(base, '_codificar_code128', _codificar_code128)
+
+    reimpressao = _extrato(datadir, quebrar=True, quebrar_partes=[22, 22])
+    reimpressao.chave_cfe_code128(ersat.ChaveCFeSAT(reimpressao.cfe.chave))
+    assert reimpressao.impressora.device.output == esperado
+
+
+def test_codificar_code128_sem_pausas():
+    impressora = GenericESCPOS(DummyConnection())
+    perfil = programa.perfil(impressora)
+    parametros = dict(barcode_height=48)
+
+    inicio = default_timer()
+    for parte in ('3515080872321800018659', '9000040190000241114257'):
+        comandos = base._codificar_code128(perfil, parte, parametros)
+        impressora.code128(parte, **parametros)
+        assert impressora.device.output.endswith(comandos)
+    # apenas as impressões na impressora real aguardam 0,25s cada
+    assert default_timer() - inicio < 0.75
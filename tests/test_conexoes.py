@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_conexoes.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import pytest
+
+from escpos import DummyConnection
+from escpos.exceptions import NonWritableSocketError
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato.conexoes import PoolImpressoras
+
+
+def test_pool_reaproveita_e_descarta_impressoras():
+    criadas = []
+
+    def fabrica():
+        impressora = GenericESCPOS(DummyConnection())
+        criadas.append(impressora)
+        return impressora
+
+    pool = PoolImpressoras()
+    pool.registrar('caixa', fabrica)
+
+    with pool.emprestar('caixa') as impressora:
+        primeira = impressora
+        # empréstimo exclusivo: não há outra impressora disponível
+        with pytest.raises(RuntimeError):
+            with pool.emprestar('caixa', timeout=0.1):
+                pass
+
+    with pool.emprestar('caixa') as impressora:
+        assert impressora is primeira
+
+    with pytest.raises(IOError):
+        with pool.emprestar('caixa') as impressora:
+            raise IOError('impressora desconectada')
+
+    with pool.emprestar('caixa') as impressora:
+        assert impressora is not primeira
+
+    assert len(criadas) == 2
+    pool.encerrar()
+
+
+def test_pool_devolve_impressora_apos_erro_no_documento():
+    criadas = []
+
+    def fabrica():
+        impressora = GenericESCPOS(DummyConnection())
+        criadas.append(impressora)
+        return impressora
+
+    pool = PoolImpressoras()
+    pool.registrar('caixa', fabrica)
+
+    for erro in (ValueError, KeyboardInterrupt):
+        with pytest.raises(erro):
+            with pool.emprestar('caixa'):
+                raise erro('documento invalido')
+
+    with pool.emprestar('caixa', timeout=0.1) as impressora:
+        assert impressora is criadas[0]
+
+    with pytest.raises(NonWritableSocketError):
+        with pool.emprestar('caixa'):
+            raise NonWritableSocketError()
+
+    assert len(criadas) == 1
+    with pool.emprestar('caixa', timeout=0.1) as impressora:
+        assert impressora is not criadas[0]
+    pool.encerrar()
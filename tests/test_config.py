@@ -21,9 +21,13 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import io
+import os
+import signal
+import time
 
 import pytest
 
+from satextrato import config
 from satextrato.config import code128_quebrar_partes
 from satextrato.config import fopen
 
@@ -87,3 +91,94 @@ def test_fopen(tmp_path):
     filename = str(tmp_path / 'test.txt')
     with fopen(filename, 'w', encoding='utf-8') as f:
         assert f != filename
+
+
+def _alterar_rodape(arquivo, esquerda):
+    conf = config.carregar(arquivo=arquivo)
+    conf = conf._replace(rodape=conf.rodape._replace(esquerda=esquerda))
+    config.salvar(conf, arquivo=arquivo)
+
+
+def test_carregar_mantem_configuracoes_ate_o_arquivo_mudar(tmp_path):
+    arquivo = str(tmp_path / 'satextrato.ini')
+    criada = config.carregar(arquivo=arquivo)  # cria o arquivo
+    assert os.path.isfile(arquivo)
+    assert criada == config.padrao()
+
+    conf = config.carregar(arquivo=arquivo)
+    assert config.carregar(arquivo=arquivo) is conf
+
+    _alterar_rodape(arquivo, 'Rodape alterado')
+    alterada = config.carregar(arquivo=arquivo)
+    assert alterada is not conf
+    assert alterada.rodape.esquerda == 'Rodape alterado'
+
+    with io.open(arquivo, 'r', encoding='utf-8') as fp:
+        assert config.carregar(arquivo=fp) == alterada
+
+
+def test_carregar_sem_verificar(tmp_path):
+    arquivo = str(tmp_path / 'satextrato.ini')
+    conf = config.carregar(arquivo=arquivo)
+    _alterar_rodape(arquivo, 'Nao verificado')
+    assert config.carregar(arquivo=arquivo, verificar=False) is conf
+
+    config.invalidar()
+    conf = config.carregar(arquivo=arquivo, verificar=False)
+    assert conf.rodape.esquerda == 'Nao verificado'
+
+
+def test_carregar_segue_variaveis_de_ambiente(tmp_path, monkeypatch):
+    diretorios = []
+    for nome in ('a', 'b'):
+        diretorio = tmp_path / nome
+        diretorio.mkdir()
+        arquivo = str(diretorio / config.DEFAULT_FILENAME)
+        config.carregar(arquivo=arquivo)
+        _alterar_rodape(arquivo, 'Rodape {}'.format(nome))
+        diretorios.append(str(diretorio))
+
+    monkeypatch.setenv(str(config.SATEXTRATO_CONFIG_DIR), diretorios[0])
+    assert config.carregar().rodape.esquerda == 'Rodape a'
+
+    monkeypatch.setenv(str(config.SATEXTRATO_CONFIG_DIR), diretorios[1])
+    assert config.carregar().rodape.esquerda == 'Rodape b'
+
+    # a seção indicada pela variável de ambiente não existe no arquivo
+    monkeypatch.setenv(str(config.SATEXTRATO_SECAO_RODAPE), str('outra'))
+    with pytest.raises(Exception, match='outra'):  # NoSectionError
+        config.carregar()
+
+
+@pytest.mark.skipif(
+        not hasattr(signal, 'SIGHUP'),
+        reason='SIGHUP indisponivel')
+def test_recarregar_com_sinal(tmp_path):
+    arquivo = str(tmp_path / 'satextrato.ini')
+    conf = config.carregar(arquivo=arquivo, verificar=False)
+    anterior = config.recarregar_com_sinal()
+    try:
+        _alterar_rodape(arquivo, 'Recarregado')
+        os.kill(os.getpid(), signal.SIGHUP)
+        conf = config.carregar(arquivo=arquivo, verificar=False)
+        assert conf.rodape.esquerda == 'Recarregado'
+    finally:
+        signal.signal(signal.SIGHUP, anterior)
+
+
+def test_observador(tmp_path):
+    arquivo = str(tmp_path / 'satextrato.ini')
+    config.carregar(arquivo=arquivo, verificar=False)
+    observador = config.Observador(arquivo, intervalo=0.01)
+    observador.iniciar()
+    try:
+        geracao = config._geracao
+        _alterar_rodape(arquivo, 'Observado')
+        for tentativa in range(200):
+            if config._geracao != geracao:
+                break
+            time.sleep(0.01)
+        conf = config.carregar(arquivo=arquivo, verificar=False)
+        assert conf.rodape.esquerda == 'Observado'
+    finally:
+        observador.parar()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_consumo.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+from builtins import str as text
+
+import pytest
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import consumo
+from satextrato.venda import ExtratoCFeVenda
+
+
+def test_modulos_qrcode():
+    margens = 2 * consumo.MARGEM_QRCODE
+    assert consumo.modulos_qrcode('x' * 17, 'L') == 21 + margens
+    assert consumo.modulos_qrcode('x' * 18, b'L') == 25 + margens
+    assert consumo.modulos_qrcode('x' * 7, 'h') == 21 + margens
+    assert consumo.modulos_qrcode('x' * 2953, 'L') == 177 + margens
+    with pytest.raises(ValueError):
+        consumo.modulos_qrcode('x' * 2954, 'L')
+    with pytest.raises(ValueError):
+        consumo.modulos_qrcode('x', 'X')
+
+
+def test_estimar():
+    modelo = consumo.ModeloVelocidade(
+            velocidade=100.0,
+            altura_linha=4.0,
+            altura_ponto=0.125,
+            tempo_corte=0.5
+        )
+    contagem = consumo.Contagem(
+            linhas=10,
+            linhas_expandidas=1,
+            avancos=3,
+            pontos_qrcodes=80,
+            cortes=1
+        )
+    estimativa = consumo.estimar(contagem, modelo)
+    assert estimativa.comprimento == pytest.approx((10 + 2 + 3) * 4 + 10)
+    assert estimativa.duracao == pytest.approx(0.7 + 0.5)
+
+
+def test_contagem_da_impressao(datadir):
+    modelo = consumo.ModeloVelocidade(
+            velocidade=250.0,
+            altura_linha=3.75,
+            altura_ponto=0.125,
+            tempo_corte=0.3
+        )
+    impressora = GenericESCPOS(
+            DummyConnection(),
+            features={consumo.MODELO_VELOCIDADE: modelo}
+        )
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    with io.open(cfe_venda, 'r', encoding='utf-8') as fp:
+        extrato = ExtratoCFeVenda(fp, impressora)
+
+    programa = extrato.renderizar(otimizar=False)
+    estimativa = extrato.estimar()
+    assert impressora.device.output == b''
+
+    contagem = extrato.contagem
+    assert contagem.linhas + contagem.linhas_expandidas == sum(
+            1 for nome, _, _ in programa if nome == 'text')
+    assert contagem.avancos == sum(
+            kwargs.get('lines', 1) for nome, _, kwargs in programa
+            if nome == 'lf')
+    assert contagem.qrcodes == 1
+    assert contagem.codigos_barras == 2  # Code128 quebrado em duas partes
+    assert estimativa == consumo.estimar(contagem, modelo)
+
+    # as seções emitidas a partir de fragmentos em cache são contadas
+    extrato.imprimir()
+    extrato.imprimir()
+    assert extrato.contagem == contagem
+
+
+def test_estimar_preserva_contagem_da_impressao(datadir):
+    impressora = GenericESCPOS(DummyConnection())
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    with io.open(cfe_venda, 'r', encoding='utf-8') as fp:
+        extrato = ExtratoCFeVenda(fp, impressora)
+
+    extrato.imprimir()
+    contagem = extrato.contagem
+    estimativa = extrato.estimar()
+    assert extrato.contagem is contagem
+    assert estimativa == consumo.estimar(
+            contagem, consumo.modelo(impressora))
+
+
+def test_qrcode_nao_contabilizado_nao_interrompe_impressao(
+        datadir, monkeypatch):
+    def falhar(conteudo, nivel_correcao):
+        raise ValueError('nivel de correcao desconhecido')
+
+    monkeypatch.setattr(consumo, 'modulos_qrcode', falhar)
+    impressora = GenericESCPOS(DummyConnection())
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    with io.open(cfe_venda, 'r', encoding='utf-8') as fp:
+        extrato = ExtratoCFeVenda(fp, impressora)
+
+    extrato.imprimir()
+    assert extrato.contagem.qrcodes == 1
+    assert extrato.contagem.modulos_qrcodes == 0
+    assert b'\x1d(k' in impressora.device.output  # comando do QRCode
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_estado.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+from builtins import str as text
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato.estado import ImpressoraComEstado
+from satextrato.venda import ExtratoCFeVenda
+
+
+def test_suprime_comandos_redundantes():
+    impressora = GenericESCPOS(DummyConnection())
+    estado = ImpressoraComEstado(impressora)
+
+    estado.justify_center()
+    estado.set_emphasized(True)
+    estado.text('A')
+    estado.set_emphasized(False)
+    estado.set_emphasized(True)  # anula a alternância anterior
+    estado.justify_center()
+    estado.text('B')
+    estado.justify_left()
+    estado.set_condensed(False)
+    estado.descarregar()
+
+    assert impressora.device.output == (
+            b'\x1ba\x01'  # centro
+            b'\x1bE\x01'  # negrito
+            b'A\n'
+            b'B\n'
+            b'\x1ba\x00'  # esquerda
+            b'\x1bM\x00'  # condensado desligado
+        )
+
+
+def test_impressao_direta_equivale_ao_programa_otimizado(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+
+    direta = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as stream:
+        ExtratoCFeVenda(stream, direta).imprimir()
+
+    programa = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as stream:
+        ExtratoCFeVenda(stream, programa).renderizar().executar(programa)
+
+    assert direta.device.output == programa.device.output
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_exportacao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import zipfile
+
+from builtins import str as text
+
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+from satextrato import exportacao  # noqa: E402
+from satextrato.imagem import VisualizacaoImagem  # noqa: E402
+from satextrato.venda import ExtratoCFeVenda  # noqa: E402
+
+
+def _documentos(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    cfe_canc = text(datadir.join('data', 'cfe_cancelamento.xml'))
+    return [cfe_venda, (cfe_venda, cfe_canc)]
+
+
+def _objetos_pdf(dados):
+    # verifica se a tabela de referências aponta para cada objeto
+    inicio = int(dados.rsplit(b'startxref\n', 1)[1].split(b'\n')[0])
+    referencias = dados[inicio:].split(b'\n')
+    total = int(referencias[1].split()[1])
+    for numero in range(1, total):
+        posicao = int(referencias[2 + numero][:10])
+        assert dados[posicao:].startswith(
+                '{} 0 obj'.format(numero).encode('ascii'))
+    return total - 1
+
+
+def test_visualizacao_imagem(datadir):
+    visualizacao = VisualizacaoImagem(features={'cutter': True})
+    with io.open(_documentos(datadir)[0], 'r', encoding='utf-8') as fp:
+        ExtratoCFeVenda(fp, visualizacao).imprimir()
+
+    imagens = visualizacao.imagens()
+    assert len(imagens) == 1  # o corte final não inicia outra página
+    assert imagens[0].width == 48 * 12
+    assert imagens[0].getextrema()[0] == 0  # há pontos impressos
+
+    imagem = Image.open(io.BytesIO(visualizacao.resultado()))
+    assert imagem.size == imagens[0].size
+
+    pdf = visualizacao.resultado(formato='PDF')
+    assert pdf.startswith(b'%PDF-')
+    assert _objetos_pdf(pdf) == 5  # imagem, conteúdo, página e raízes
+
+    with pytest.raises(ValueError):
+        visualizacao.resultado(formato='GIF')
+
+
+def test_code128_como_impresso():
+    # conjunto A, como enviado pela PyESCPOS: início, 22 símbolos,
+    # verificador e fim, com dois pontos por módulo
+    visualizacao = VisualizacaoImagem()
+    visualizacao.code128('3515080872321800018659', barcode_height=20)
+    imagem = visualizacao.imagens()[0]
+    pretos = [
+            x for x in range(imagem.width)
+            if imagem.getpixel((x, imagem.height // 2)) == 0
+        ]
+    assert max(pretos) - min(pretos) + 1 == (24 * 11 + 13) * 2
+
+
+def test_exportar_pdf(datadir):
+    saida = io.BytesIO()
+    documentos = _documentos(datadir) * 2
+    assert exportacao.exportar(documentos, saida, processos=2) == 4
+    pdf = saida.getvalue()
+    assert pdf.count(b'/Type /Page ') == 4
+    assert _objetos_pdf(pdf) == 4 * 3 + 2
+
+
+def test_exportar_png(datadir):
+    saida = io.BytesIO()
+    documentos = _documentos(datadir)
+    assert exportacao.exportar(
+            documentos, saida, formato='PNG', processos=0) == 2
+    with zipfile.ZipFile(io.BytesIO(saida.getvalue())) as arquivo:
+        nomes = arquivo.namelist()
+        assert nomes == [
+                'CFe35150808723218000186599000040190000241114257.png',
+                'CFe35150808723218000186599000040190000253347537.png',
+            ]
+        Image.open(io.BytesIO(arquivo.read(nomes[0]))).verify()
+
+
+def test_renderizar(datadir):
+    extratos = list(exportacao.renderizar(
+            _documentos(datadir), formato='PDF', processos=0))
+    assert [chave[:3] for chave, dados in extratos] == ['CFe', 'CFe']
+    assert all(dados.startswith(b'%PDF-') for chave, dados in extratos)
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_incremental.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+import pytest
+
+from builtins import str as text
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato.incremental import ExtratoCFeVendaIncremental
+from satextrato.venda import ExtratoCFeVenda
+
+
+@pytest.mark.parametrize('resumido', [False, True])
+def test_extrato_incremental_mesma_saida(datadir, resumido):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+
+    completo = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as stream:
+        ExtratoCFeVenda(stream, completo, resumido=resumido).imprimir()
+
+    incremental = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'rb') as stream:
+        extrato = ExtratoCFeVendaIncremental(
+                stream,
+                incremental,
+                resumido=resumido
+            )
+        extrato.imprimir()
+
+    assert incremental.device.output == completo.device.output
+
+    # os itens são descartados à medida em que são impressos
+    assert extrato.root.find('./infCFe/det') is None
+
+    with pytest.raises(RuntimeError):
+        extrato.imprimir()
+
+
+def test_extrato_incremental_nao_estima(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    impressora = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'rb') as stream:
+        extrato = ExtratoCFeVendaIncremental(stream, impressora)
+        with pytest.raises(NotImplementedError):
+            extrato.estimar()
+        # o documento continua disponível para a impressão
+        extrato.imprimir()
+    assert impressora.device.output
+    assert extrato.contagem.linhas
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_instrumentacao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import threading
+
+from builtins import str as text
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import instrumentacao
+from satextrato.venda import ExtratoCFeVenda
+
+
+def _imprimir(datadir, destino=None):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    impressora = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r', encoding='utf-8') as fp:
+        extrato = ExtratoCFeVenda(fp, impressora)
+    extrato.instrumentacao = destino
+    extrato.imprimir()
+    return extrato, impressora.device.output
+
+
+def test_mede_secoes_do_extrato(datadir):
+    medicoes = []
+    registro = instrumentacao.Registro()
+
+    def destino(medicao):
+        medicoes.append(medicao)
+        registro(medicao)
+
+    extrato, instrumentado = _imprimir(datadir, destino)
+    _, esperado = _imprimir(datadir)
+
+    assert instrumentado == esperado
+    assert 'corpo_I_titulo' not in vars(extrato)
+
+    secoes = dict((m.secao, m) for m in medicoes)
+    assert set(secoes) == set(instrumentacao.secoes(extrato))
+    assert all(m.documento == 'ExtratoCFeVenda' for m in medicoes)
+    assert sum(
+            secoes[nome].bytes
+            for nome in ('cabecalho', 'corpo', 'rodape', 'fim_documento')
+        ) <= len(esperado)
+    assert secoes['corpo'].bytes >= secoes['corpo_IV_itens'].bytes > 0
+
+    texto = registro.prometheus()
+    assert (
+            'satextrato_secao_duracao_segundos_count{'
+            'documento="ExtratoCFeVenda",secao="rodape"} 1'
+        ) in texto
+    assert (
+            'satextrato_secao_bytes_total{{'
+            'documento="ExtratoCFeVenda",secao="corpo_IV_itens"}} {}'
+        ).format(secoes['corpo_IV_itens'].bytes) in texto
+
+
+def test_destino_atribuido_a_classe(datadir):
+    medicoes = []
+
+    def destino(medicao):
+        medicoes.append(medicao)
+
+    class Extrato(ExtratoCFeVenda):
+        pass
+
+    Extrato.instrumentacao = destino
+
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    impressora = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r', encoding='utf-8') as fp:
+        extrato = Extrato(fp, impressora)
+    extrato.imprimir()
+
+    assert medicoes
+    assert all(m.documento == 'Extrato' for m in medicoes)
+    assert ExtratoCFeVenda.instrumentacao is None
+
+
+def test_falha_no_destino_nao_interrompe_impressao(datadir):
+
+    def destino(medicao):
+        raise ValueError(medicao.secao)
+
+    _, instrumentado = _imprimir(datadir, destino)
+    _, esperado = _imprimir(datadir)
+    assert instrumentado == esperado
+
+
+def test_gravacoes_simultaneas_do_registro(tmp_path):
+    registro = instrumentacao.Registro()
+    for n in range(200):
+        registro(instrumentacao.Medicao(
+                'ExtratoCFeVenda', 'secao_{}'.format(n), 0.001, 1, 10))
+    caminho = str(tmp_path / 'satextrato.prom')
+
+    tarefas = [
+            threading.Thread(target=registro.gravar, args=(caminho,))
+            for _ in range(8)
+        ]
+    for tarefa in tarefas:
+        tarefa.start()
+    for tarefa in tarefas:
+        tarefa.join()
+
+    assert [p.name for p in tmp_path.iterdir()] == ['satextrato.prom']
+    with io.open(caminho, 'r', encoding='utf-8') as fp:
+        assert fp.read() == registro.prometheus()
+
+
+def test_impressora_instrumentada(datadir):
+    registro = instrumentacao.Registro()
+    impressora = instrumentacao.ImpressoraInstrumentada(
+            GenericESCPOS(DummyConnection()),
+            registro,
+            nome='caixa-1',
+            limite_escrita=0  # todas as escritas são lentas
+        )
+
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    with io.open(cfe_venda, 'r', encoding='utf-8') as fp:
+        ExtratoCFeVenda(fp, impressora).imprimir()
+    _, esperado = _imprimir(datadir)
+
+    assert impressora.device.output == esperado
+
+    series = registro.series('comando')
+    assert series[('caixa-1', 'qrcode')]['execucoes'] == 1
+    assert sum(s['bytes'] for s in series.values()) == len(esperado)
+
+    lentas = registro.escritas_lentas()
+    assert lentas[('caixa-1', 'qrcode')] >= 1
+    assert sum(lentas.values()) == sum(
+            s['escritas'] for s in series.values())
+
+    assert (
+            'satextrato_comando_duracao_segundos_count{'
+            'impressora="caixa-1",comando="qrcode"} 1'
+        ) in registro.prometheus()
+
+
+def test_impressora_instrumentada_restaura_dispositivo():
+    medicoes = []
+    original = GenericESCPOS(DummyConnection())
+    device = original.device
+    with instrumentacao.ImpressoraInstrumentada(
+            original, medicoes.append) as impressora:
+        assert original.device is not device
+        impressora.text('ABC')
+    assert original.device is device
+    assert device.output == b'ABC\n'
+
+    # sem a instrumentação, as escritas deixam de ser medidas
+    quantidade = len(medicoes)
+    original.text('DEF')
+    assert len(medicoes) == quantidade
+    impressora.encerrar()  # nada a restaurar
+    assert original.device is device
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_layout.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import textwrap
+
+from six.moves import range
+
+from satextrato import layout
+
+
+def test_quebrar_identico_a_textwrap():
+    aleatorio = random.Random(1984)
+
+    def palavra():
+        return ''.join(
+                aleatorio.choice('abcXYZ019.,/')
+                for _ in range(aleatorio.randint(1, 30))
+            )
+
+    for _ in range(5000):
+        if aleatorio.random() < 0.8:
+            # palavras separadas por um único espaço (caso mais comum)
+            palavras = [palavra() for _ in range(aleatorio.randint(1, 12))]
+            texto = ' '.join(palavras)
+        else:
+            texto = ''.join(
+                    aleatorio.choice('abc019 -\t\xa0')
+                    for _ in range(aleatorio.randint(0, 80))
+                )
+        largura = aleatorio.randint(1, 50)
+        assert list(layout.quebrar(texto, largura)) == \
+            textwrap.wrap(texto, largura), (texto, largura)
+
+
+def test_quebrar_espacos_unicode():
+    # textwrap descarta, no início das linhas, qualquer pedaço formado apenas
+    # por espaços, inclusive os espaços não separáveis (NBSP)
+    for texto in ('abcd \xa0 efgh', 'ab \xa0\xa0 cd \u2003 ef gh',
+                  'CAFE\xa0EXPRESSO 250ML'):
+        for largura in range(1, 12):
+            assert list(layout.quebrar(texto, largura)) == \
+                textwrap.wrap(texto, largura), (texto, largura)
+
+
+def test_quebrar_palavra_longa():
+    texto = 'ab cdefghijklmnop q'
+    assert list(layout.quebrar(texto, 5)) == textwrap.wrap(texto, 5)
+    assert layout._simples(texto, 5)
+
+
+def test_bordas():
+    assert layout.bordas('a', 'b', largura=10) == 'a        b'
+    assert layout.bordas('a' * 30, 'b' * 30) == '{}    {}'.format(
+            'a' * 22,
+            'b' * 22
+        )
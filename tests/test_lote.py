@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_lote.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+from timeit import default_timer
+
+from builtins import str as text
+
+import pytest
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import lote
+from satextrato import parser
+from satextrato.cancelamento import ExtratoCFeCancelamento
+from satextrato.venda import ExtratoCFeVenda
+
+
+def test_imprimir_lote_na_ordem(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    cfe_canc = text(datadir.join('data', 'cfe_cancelamento.xml'))
+
+    esperado = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as stream:
+        ExtratoCFeVenda(stream, esperado).renderizar().executar(esperado)
+    with io.open(cfe_venda, 'r') as fp_venda:
+        with io.open(cfe_canc, 'r') as fp_canc:
+            extrato = ExtratoCFeCancelamento(fp_venda, fp_canc, esperado)
+            extrato.renderizar().executar(esperado)
+    with io.open(cfe_venda, 'rb') as stream:
+        ExtratoCFeVenda(stream, esperado).renderizar().executar(esperado)
+
+    with io.open(cfe_venda, 'rb') as stream:
+        conteudo = stream.read()
+
+    impressora = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as stream:
+        documentos = [cfe_venda, (stream, cfe_canc), conteudo]
+        assert lote.imprimir(documentos, impressora, processos=2) == 3
+
+    assert impressora.device.output == esperado.device.output
+
+
+def test_documentos_consumidos_sob_demanda(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    consumidos = []
+
+    def documentos():
+        for n in range(10):
+            consumidos.append(n)
+            yield cfe_venda
+
+    impressora = GenericESCPOS(DummyConnection())
+    extratos = lote.renderizar(documentos(), impressora, processos=1)
+    next(extratos)
+    assert len(consumidos) <= 3  # dois blocos pendentes e o seguinte
+    assert len(list(extratos)) == 9
+
+
+def test_renderizar_sem_pausas(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    cfe_canc = text(datadir.join('data', 'cfe_cancelamento.xml'))
+    documentos = [cfe_venda, (cfe_venda, cfe_canc)] * 3
+
+    # a PyESCPOS pausa 1s após cada QRCode e 0,25s após cada Code128, o que
+    # não faz sentido quando as escritas são apenas capturadas
+    inicio = default_timer()
+    resultados = list(lote.renderizar(
+            documentos,
+            GenericESCPOS(DummyConnection()),
+            processos=0
+        ))
+    assert default_timer() - inicio < 1
+    assert len(resultados) == len(documentos)
+
+
+@pytest.fixture(params=[parser.ETREE, parser.LXML])
+def implementacao(request):
+    if request.param == parser.LXML:
+        pytest.importorskip('lxml')
+    anterior = parser.ativa().nome
+    parser.selecionar(request.param)
+    yield request.param
+    parser.selecionar(anterior)
+
+
+def test_conteudo_texto_com_declaracao_encoding(datadir, implementacao):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    with io.open(cfe_venda, 'r', encoding='utf-8') as stream:
+        conteudo = stream.read().replace(
+                '<?xml version="1.0"?>',
+                '<?xml version="1.0" encoding="ISO-8859-1"?>'
+            )
+
+    impressora = GenericESCPOS(DummyConnection())
+    extrato = lote.carregar(conteudo, impressora)
+    assert extrato.cfe.chave
+
+
+def test_falha_nao_interrompe_lote(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    inexistente = text(datadir.join('data', 'inexistente.xml'))
+
+    resultados = list(lote.renderizar(
+            [cfe_venda, inexistente, b'<CFe/>', cfe_venda],
+            GenericESCPOS(DummyConnection()),
+            processos=1
+        ))
+
+    assert isinstance(resultados[0], bytes)
+    assert isinstance(resultados[1], lote.Falha)
+    assert resultados[1].indice == 1
+    assert 'inexistente.xml' in resultados[1].erro
+    assert resultados[2].indice == 2
+    assert resultados[3] == resultados[0]
+
+    impressora = GenericESCPOS(DummyConnection())
+    assert lote.imprimir([inexistente, cfe_venda], impressora) == 1
+
+
+@pytest.mark.parametrize('processos', [0, 1])
+def test_falha_ao_ler_documento_nao_interrompe_lote(datadir, processos):
+
+    class Ilegivel(object):
+        def read(self):
+            raise IOError('dispositivo removido')
+
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+
+    resultados = list(lote.renderizar(
+            [cfe_venda, Ilegivel(), (cfe_venda,), cfe_venda],
+            GenericESCPOS(DummyConnection()),
+            processos=processos
+        ))
+
+    assert isinstance(resultados[0], bytes)
+    assert resultados[1].indice == 1
+    assert 'dispositivo removido' in resultados[1].erro
+    assert resultados[2].indice == 2  # tupla sem o cancelamento
+    assert resultados[3] == resultados[0]
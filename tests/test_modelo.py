@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_modelo.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import xml.etree.ElementTree as ET
+
+from decimal import Decimal
+
+import pytest
+
+from builtins import str as text
+from satcomum import ersat
+
+from satextrato import modelo
+
+
+def test_extrair_cfe_venda(datadir):
+    tree = ET.parse(text(datadir.join('data', 'cfe_venda.xml')))
+    cfe = modelo.extrair(tree)
+
+    assert cfe.chave == 'CFe35150808723218000186599000040190000241114257'
+    assert cfe.ambiente_testes
+    assert len(cfe.itens) == 31
+    assert all(isinstance(item.vProd, Decimal) for item in cfe.itens)
+    assert isinstance(cfe.totais.vCFe, Decimal)
+    assert cfe.dados_qrcode == ersat.dados_qrcode(tree)
+
+    # o elemento XML não é mantido no modelo
+    assert not hasattr(cfe.itens[0], '__dict__')
+
+    # os objetos são mutáveis: comparáveis pelos valores, mas não hasheáveis
+    emitente = modelo.Emitente(**dict(
+            zip(modelo.Emitente.__slots__, cfe.emitente.valores())))
+    assert emitente == cfe.emitente
+    with pytest.raises(TypeError):
+        hash(cfe.emitente)
+
+
+def test_extrair_documento_que_nao_e_cfe():
+    tree = ET.ElementTree(ET.fromstring('<NFe><infNFe/></NFe>'))
+    with pytest.raises(ValueError) as excinfo:
+        modelo.extrair(tree)
+    assert 'Documento nao parece ser um CF-e-SAT' in text(excinfo.value)
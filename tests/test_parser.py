@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_parser.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+import pytest
+
+from builtins import str as text
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import parser
+from satextrato.cancelamento import ExtratoCFeCancelamento
+from satextrato.incremental import ExtratoCFeVendaIncremental
+from satextrato.venda import ExtratoCFeVenda
+
+
+@pytest.fixture
+def implementacao(request):
+    try:
+        yield parser.selecionar(request.param)
+    except ImportError:
+        pytest.skip('{} nao esta instalada'.format(request.param))
+    finally:
+        parser.selecionar(parser.ETREE)
+
+
+def _imprimir(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    cfe_canc = text(datadir.join('data', 'cfe_cancelamento.xml'))
+    impressora = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as stream:
+        ExtratoCFeVenda(stream, impressora).imprimir()
+    with io.open(cfe_venda, 'rb') as stream:
+        ExtratoCFeVendaIncremental(stream, impressora).imprimir()
+    with io.open(cfe_venda, 'r') as fp_venda:
+        with io.open(cfe_canc, 'r') as fp_canc:
+            ExtratoCFeCancelamento(fp_venda, fp_canc, impressora).imprimir()
+    return impressora.device.output
+
+
+@pytest.mark.parametrize(
+        'implementacao',
+        [parser.ETREE, parser.LXML],
+        indirect=True
+    )
+def test_implementacoes_produzem_mesma_saida(datadir, implementacao):
+    saida = _imprimir(datadir)
+    parser.selecionar(parser.ETREE)
+    assert saida == _imprimir(datadir)
+
+
+def test_selecionar_implementacao_desconhecida():
+    with pytest.raises(ValueError):
+        parser.selecionar('sax')
+
+
+def test_selecionar_auto():
+    assert parser.selecionar(parser.AUTO).nome in (parser.LXML, parser.ETREE)
+
+
+@pytest.mark.parametrize('implementacao', [parser.LXML], indirect=True)
+def test_lxml_mantem_limites_de_seguranca(implementacao):
+    from lxml import etree
+
+    # nós de texto com mais de 10MB são recusados pela libxml2, a menos que
+    # o parser seja criado com huge_tree=True
+    documento = b'<CFe><infCFe>' + b'x' * 10000001 + b'</infCFe></CFe>'
+    with pytest.raises(etree.XMLSyntaxError):
+        parser.parse(io.BytesIO(documento))
+    with pytest.raises(etree.XMLSyntaxError):
+        for _ in parser.iterparse(io.BytesIO(documento)):
+            pass
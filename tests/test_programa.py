@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_programa.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import time
+
+from builtins import str as text
+
+from escpos import DummyConnection
+from escpos.impl import epson
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato.programa import dobrar_justificacao
+from satextrato.programa import descartar_alternancias
+from satextrato.programa import juntar_linhas
+from satextrato.programa import sem_pausas
+from satextrato.venda import ExtratoCFeVenda
+
+
+def test_dobrar_justificacao():
+    operacoes = [
+            ('justify_center', (), {}),
+            ('justify_left', (), {}),
+            ('text', ('a',), {}),
+            ('justify_left', (), {}),
+            ('text', ('b',), {}),
+        ]
+    assert dobrar_justificacao(operacoes) == [
+            ('justify_left', (), {}),
+            ('text', ('a',), {}),
+            ('text', ('b',), {}),
+        ]
+
+
+def test_descartar_alternancias():
+    operacoes = [
+            ('set_emphasized', (True,), {}),
+            ('text', ('a',), {}),
+            ('set_emphasized', (False,), {}),
+            ('set_condensed', (True,), {}),
+            ('set_emphasized', (True,), {}),
+            ('set_condensed', (False,), {}),
+            ('text', ('b',), {}),
+        ]
+    assert descartar_alternancias(operacoes) == [
+            ('set_emphasized', (True,), {}),
+            ('text', ('a',), {}),
+            ('set_condensed', (False,), {}),
+            ('text', ('b',), {}),
+        ]
+
+
+def test_juntar_linhas():
+    operacoes = [
+            ('text', ('a',), {}),
+            ('lf', (), {'lines': 2}),
+            ('text', ('b',), {}),
+            ('cut', (), {}),
+            ('text', ('c',), {}),
+        ]
+    assert juntar_linhas(operacoes) == [
+            ('textout', ('a\n\n\nb\n',), {}),
+            ('cut', (), {}),
+            ('text', ('c',), {}),
+        ]
+
+
+def test_renderizar_sem_otimizar_produz_mesma_saida(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+
+    direto = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as stream:
+        ExtratoCFeVenda(stream, direto).imprimir()
+
+    programado = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as stream:
+        extrato = ExtratoCFeVenda(stream, programado)
+        extrato.renderizar(otimizar=False).executar(programado)
+
+    assert programado.device.output == direto.device.output
+    assert len(programado.device._output_list) < \
+        len(direto.device._output_list)
+
+
+def test_renderizar_otimizado(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    impressora = GenericESCPOS(DummyConnection())
+    with io.open(cfe_venda, 'r') as stream:
+        extrato = ExtratoCFeVenda(stream, impressora)
+        original = extrato.renderizar(otimizar=False)
+        otimizado = extrato.renderizar()
+
+    assert len(otimizado) < len(original)
+
+    otimizado.executar(impressora)
+
+    # uma escrita para cada código de barras (que precisam ler o dispositivo)
+    # e uma última escrita com o restante do extrato
+    assert len(impressora.device._output_list) <= 4
+    assert b'TOTAL R$' in impressora.device.output
+
+
+def test_sem_pausas_restaura_modulos_da_pyescpos():
+    impressora = GenericESCPOS(DummyConnection())
+    with sem_pausas(impressora):
+        with sem_pausas(impressora):
+            assert epson.time is not time
+        assert epson.time is not time
+    # nada permanece alterado fora do contexto
+    assert epson.time is time
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_qr.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+import struct
+
+import pytest
+
+from builtins import str as text
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import qr
+from satextrato.venda import ExtratoCFeVenda
+
+
+def test_raster_qrcode():
+    pytest.importorskip('qrcode')
+    qr.preparar('satextrato', 4, b'M')
+    comando = qr.raster('satextrato', 4, 'M')
+    assert comando is qr.raster('satextrato', 4, b'M')  # cache
+
+    assert comando.startswith(b'\x1dv0\x00')
+    bytes_linha, altura = struct.unpack('<HH', comando[4:8])
+    # versão 1 (21 módulos) mais as margens de 4 módulos, 4 pontos cada
+    assert altura == (21 + 8) * 4
+    assert bytes_linha == (altura + 7) // 8
+    assert len(comando) == 8 + bytes_linha * altura
+
+
+def test_extrato_com_qrcode_raster(datadir):
+    pytest.importorskip('qrcode')
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    impressora = GenericESCPOS(
+            DummyConnection(),
+            features={qr.QRCODE_RASTER: True}
+        )
+    with io.open(cfe_venda, 'r') as stream:
+        extrato = ExtratoCFeVenda(stream, impressora)
+        extrato.imprimir()
+
+    saida = impressora.device.output
+    assert b'\x1dv0\x00' in saida
+    assert b'\x1d(k' not in saida  # comando nativo de QRCode
+
+
+def test_extrato_com_qrcode_raster_sem_biblioteca(datadir, monkeypatch):
+    from satextrato import renderizacao
+
+    monkeypatch.setattr(qr, 'disponivel', lambda: False)
+    renderizacao._PERFIS.limpar()
+    try:
+        cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+        impressora = GenericESCPOS(
+                DummyConnection(),
+                features={qr.QRCODE_RASTER: True}
+            )
+        with io.open(cfe_venda, 'r') as stream:
+            ExtratoCFeVenda(stream, impressora).imprimir()
+    finally:
+        renderizacao._PERFIS.limpar()
+
+    saida = impressora.device.output
+    assert b'\x1d(k' in saida  # comando nativo de QRCode
+    assert b'\x1dv0\x00' not in saida
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_renderizacao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from escpos import DummyConnection
+from escpos.feature import Columns
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import config
+from satextrato import renderizacao
+
+
+def test_perfil_compartilhado():
+    conf = config.padrao()
+    perfil = renderizacao.obter(GenericESCPOS(DummyConnection()), conf, None)
+    assert renderizacao.obter(
+            GenericESCPOS(DummyConnection()),
+            config.padrao(),
+            None
+        ) is perfil
+
+    assert perfil.escpos
+    assert perfil.colunas == Columns(normal=48, expanded=24, condensed=64)
+    assert not perfil.cortar  # a impressora não possui guilhotina
+    assert perfil.code128['barcode_height'] == conf.code128.altura
+    assert sorted(perfil.rodape) == [24, 48, 64]
+    assert len(perfil.rodape[64]) == 64
+    assert all(
+            len(linha) <= largura
+            for largura, linhas in perfil.mensagem_qrcode.items()
+            for linha in linhas
+        )
+
+    outra = GenericESCPOS(DummyConnection(), features={'cutter': True})
+    assert renderizacao.obter(outra, conf, None).cortar
+
+
+def test_perfil_com_configuracoes_mutaveis():
+    conf = config.padrao()
+    conf = conf._replace(code128=conf.code128._replace(quebrar_partes=[44]))
+    impressora = GenericESCPOS(DummyConnection())
+    perfil = renderizacao.obter(impressora, conf, None)
+    assert perfil.colunas.normal == 48
+    assert renderizacao.obter(impressora, conf, None) is not perfil
@@ -68,3 +68,88 @@ def test_extrato_cancelamento(
                 config=configuracao
             )
         extrato.imprimir()
+
+
+def test_extrato_venda_reaproveita_fragmentos(datadir):
+    from escpos import DummyConnection
+    from escpos.impl.epson import GenericESCPOS
+    from satextrato import base
+
+    base._FRAGMENTOS.limpar()
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+
+    saidas = []
+    for i in range(2):
+        impressora = GenericESCPOS(DummyConnection())
+        with io.open(cfe_venda, 'r') as stream:
+            ExtratoCFeVenda(stream, impressora).imprimir()
+        saidas.append(impressora.device.output)
+
+    assert saidas[0] == saidas[1]
+    assert len(base._FRAGMENTOS) == 3  # emitente, QRCode e fim do documento
+
+
+def test_fragmentos_de_subclasses(datadir):
+    from escpos import DummyConnection
+    from escpos.impl.epson import GenericESCPOS
+
+    class ExtratoPersonalizado(ExtratoCFeVenda):
+
+        def _emitente(self, emitente, codigo_uf):
+            self.texto('EMITENTE PERSONALIZADO')
+
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    saidas = []
+    for classe in (ExtratoCFeVenda, ExtratoPersonalizado):
+        impressora = GenericESCPOS(DummyConnection())
+        with io.open(cfe_venda, 'r') as stream:
+            classe(stream, impressora).imprimir()
+        saidas.append(impressora.device.output)
+
+    assert b'EMITENTE PERSONALIZADO' not in saidas[0]
+    assert b'EMITENTE PERSONALIZADO' in saidas[1]
+
+
+def test_importacao_adiada():
+    import subprocess
+    import sys
+
+    import satextrato
+
+    assert satextrato.ExtratoCFeVenda is ExtratoCFeVenda
+    assert satextrato.ExtratoCFeCancelamento is ExtratoCFeCancelamento
+    assert 'ExtratoCFeVenda' in dir(satextrato)
+
+    exportados = {}
+    exec('from satextrato import *', exportados)
+    assert exportados['ExtratoCFeVenda'] is ExtratoCFeVenda
+    assert exportados['ExtratoCFeCancelamento'] is ExtratoCFeCancelamento
+
+    if sys.version_info >= (3, 7):
+        saida = subprocess.check_output([
+                sys.executable,
+                '-c',
+                'import sys, satextrato; '
+                'print("satextrato.venda" in sys.modules, '
+                '"escpos" in sys.modules)',
+            ])
+        assert saida.split() == [b'False', b'False']
+
+
+def test_fragmento_do_emitente_pelos_valores(datadir):
+    from escpos import DummyConnection
+    from escpos.impl.epson import GenericESCPOS
+
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    saidas = []
+    for fantasia in (None, 'OUTRO NOME FANTASIA'):
+        impressora = GenericESCPOS(DummyConnection())
+        with io.open(cfe_venda, 'r') as stream:
+            extrato = ExtratoCFeVenda(stream, impressora)
+        if fantasia:
+            extrato.cfe.emitente.xFant = fantasia
+        extrato.imprimir()
+        saidas.append(impressora.device.output)
+
+    assert b'OUTRO NOME FANTASIA' not in saidas[0]
+    assert b'OUTRO NOME FANTASIA' in saidas[1]
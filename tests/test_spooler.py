@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_spooler.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+from builtins import str as text
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import spooler
+from satextrato.venda import ExtratoCFeVenda
+
+
+def test_spooler_prioridades(datadir):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+
+    esperado = GenericESCPOS(DummyConnection())
+    for resumido in (True, False):
+        with io.open(cfe_venda, 'r') as fp:
+            extrato = ExtratoCFeVenda(fp, esperado, resumido=resumido)
+            extrato.renderizar().executar(esperado)
+
+    impressora = GenericESCPOS(DummyConnection())
+    s = spooler.Spooler()
+    s.registrar('caixa', impressora)
+    s.pausar('caixa')
+
+    reimpressao = s.enviar(
+            'caixa',
+            cfe_venda,
+            prioridade=spooler.PRIORIDADE_REIMPRESSAO
+        )
+    cancelado = s.enviar('caixa', cfe_venda)
+    cupom = s.enviar('caixa', cfe_venda, resumido=True)
+
+    assert s.profundidade('caixa') == 3
+    assert s.cancelar(cancelado.id)
+    assert cancelado.estado == spooler.CANCELADO
+
+    s.retomar('caixa')
+    assert reimpressao.aguardar(timeout=30)
+    s.encerrar()
+
+    assert cupom.estado == spooler.CONCLUIDO
+    assert reimpressao.estado == spooler.CONCLUIDO
+    assert s.trabalho(cupom.id) is cupom
+    assert impressora.device.output == esperado.device.output
+
+
+def test_spooler_trabalho_com_falha():
+    s = spooler.Spooler()
+    s.registrar('caixa', GenericESCPOS(DummyConnection()))
+    trabalho = s.enviar('caixa', b'<CFe><infCFe/></CFe>')
+    assert trabalho.aguardar(timeout=30)
+    s.encerrar()
+    assert trabalho.estado == spooler.FALHOU
+    assert trabalho.erro is not None
+
+
+def test_spooler_historico_nao_descarta_trabalhos_pendentes():
+    s = spooler.Spooler(historico=2)
+    s.registrar('caixa', GenericESCPOS(DummyConnection()))
+    s.pausar('caixa')
+
+    trabalhos = [s.enviar('caixa', b'<CFe/>') for _ in range(5)]
+    for trabalho in trabalhos:
+        assert s.trabalho(trabalho.id) is trabalho
+    assert s.cancelar(trabalhos[0].id)
+
+    s.retomar('caixa')
+    assert trabalhos[-1].aguardar(timeout=30)
+    s.encerrar()
+
+    # apenas os últimos trabalhos finalizados permanecem no histórico
+    assert s.trabalho(trabalhos[0].id) is None
+    assert s.trabalho(trabalhos[-1].id) is trabalhos[-1]
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_transliteracao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import transliteracao
+from satextrato.config import SATEXTRATO_PRESERVAR_ACENTOS
+
+
+def test_transliterar():
+    assert transliteracao.transliterar('TOTAL R$') == 'TOTAL R$'
+    assert transliteracao.transliterar('CUPOM FISCAL ELETRÔNICO') == \
+        'CUPOM FISCAL ELETRONICO'
+    assert transliteracao.transliterar('AÇÃO €', codificacao='cp860') == \
+        'AÇÃO EUR'
+
+
+def test_codificacao(monkeypatch):
+    cp850 = GenericESCPOS(DummyConnection(), encoding='cp850')
+    utf8 = GenericESCPOS(DummyConnection(), encoding='utf-8')
+    assert transliteracao.codificacao(cp850) is None
+
+    monkeypatch.setenv(SATEXTRATO_PRESERVAR_ACENTOS, 'true')
+    assert transliteracao.codificacao(cp850) == 'cp850'
+    assert transliteracao.codificacao(utf8) is None
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# tests/test_visualizacao.py
+#
+# Copyright 2026 Base4 Sistemas
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from __future__ import absolute_import
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import io
+
+from builtins import str as text
+
+import pytest
+
+from escpos import DummyConnection
+from escpos.impl.epson import GenericESCPOS
+
+from satextrato import barras
+from satextrato import qr
+from satextrato.venda import ExtratoCFeVenda
+from satextrato.visualizacao import CodigoBarras
+from satextrato.visualizacao import Corte
+from satextrato.visualizacao import Linha
+from satextrato.visualizacao import VisualizacaoHTML
+from satextrato.visualizacao import VisualizacaoTexto
+
+
+def _imprimir(datadir, visualizacao):
+    cfe_venda = text(datadir.join('data', 'cfe_venda.xml'))
+    with io.open(cfe_venda, 'r', encoding='utf-8') as fp:
+        extrato = ExtratoCFeVenda(fp, visualizacao)
+    extrato.imprimir()
+    return extrato
+
+
+def test_larguras_code128():
+    larguras = barras.larguras('3515', barras.CONJUNTO_C)
+    # início C, dois símbolos, verificador e fim (que possui 7 elementos)
+    assert len(larguras) == 4 * 6 + 7
+    assert sum(larguras) == 4 * 11 + 13
+    # o conjunto A (o padrão) codifica um símbolo por caractere
+    assert sum(barras.larguras('3515')) == 6 * 11 + 13
+    assert barras.larguras('3515', b'A') == barras.larguras('3515')
+    assert barras.modulos('3515') == sum(barras.larguras('3515')) + (
+            2 * barras.MARGEM)
+    with pytest.raises(ValueError):
+        barras.larguras('ç')
+    with pytest.raises(ValueError):
+        barras.larguras('a')  # minúsculas não existem no conjunto A
+    with pytest.raises(ValueError):
+        barras.larguras('351', barras.CONJUNTO_C)
+
+
+def test_code128_como_impresso(datadir):
+    # as barras desenhadas devem ter tantos módulos quanto as impressas a
+    # partir do comando enviado pela PyESCPOS
+    visualizacao = VisualizacaoTexto()
+    extrato = _imprimir(datadir, visualizacao)
+    codigos = [
+            e for e in visualizacao.elementos
+            if isinstance(e, CodigoBarras)
+        ]
+    assert codigos
+    for codigo in codigos:
+        impressora = GenericESCPOS(DummyConnection())
+        impressora.code128(codigo.dados, **extrato._renderizacao.code128)
+        # GS k 73 n {<conjunto><dados>
+        comando = bytearray(impressora.device.output)
+        inicio = comando.index(b'\x1dkI') + 3
+        argumento = comando[inicio + 1:inicio + 1 + comando[inicio]]
+        conjunto = bytes(argumento[1:2])
+        dados = bytes(argumento[2:]).decode('ascii')
+        assert dados == codigo.dados
+        assert conjunto == codigo.conjunto.encode('ascii')
+        # início, um símbolo por caractere, verificador e fim
+        assert sum(barras.larguras(codigo.dados, codigo.conjunto)) == (
+                (len(dados) + 2) * 11 + 13)
+
+
+def test_elementos():
+    visualizacao = VisualizacaoTexto()
+    visualizacao.justify_center()
+    visualizacao.set_expanded(True)
+    visualizacao.textout('A')
+    visualizacao.textout('B\nC')
+    visualizacao.set_expanded(False)
+    visualizacao.lf(2)
+    visualizacao.code128('1234', barcode_height=56)
+    visualizacao.cut(partial=False)
+    assert visualizacao.elementos == [
+            Linha('AB', 'center', False, True, False),
+            Linha('C', 'center', False, True, False),
+            Linha('', 'center', False, False, False),
+            CodigoBarras('1234', 56, 'center', 'A'),
+            Corte(parcial=False),
+        ]
+    assert visualizacao.resultado().splitlines()[:2] == [
+            ' ' * 22 + 'A B',
+            ' ' * 22 + 'C',
+        ]
+
+
+def test_visualizacao_texto(datadir):
+    visualizacao = VisualizacaoTexto(features={'cutter': True})
+    extrato = _imprimir(datadir, visualizacao)
+    linhas = visualizacao.resultado().splitlines()
+    assert linhas[0].strip() == 'TANCA'
+    assert 'CNPJ: 08.723.218/0001-86' in linhas
+    assert linhas[-1].startswith('8<')
+    assert sum(1 for linha in linhas if '[Code128: ' in linha) == 2
+    assert len(linhas) == (
+            extrato.contagem.linhas
+            + extrato.contagem.linhas_expandidas
+            + extrato.contagem.avancos
+            + extrato.contagem.codigos_barras
+            + extrato.contagem.qrcodes
+            + extrato.contagem.cortes
+        )
+
+
+def test_visualizacao_html(datadir):
+    visualizacao = VisualizacaoHTML(estilo=False)
+    _imprimir(datadir, visualizacao)
+    html = visualizacao.resultado()
+    assert html.startswith('<div class="satextrato">')
+    assert '<div class="c n">TANCA</div>' in html
+    assert html.count('<svg ') == (3 if qr.disponivel() else 2)
+    assert 'data-code128="3515080872321800018659"' in html
+
+    # a visualização pode ser reutilizada
+    visualizacao.limpar()
+    assert visualizacao.resultado() == '<div class="satextrato">\n</div>\n'